@@ -0,0 +1,142 @@
+"""
+On-disk JSON cache shared by the agent tools.
+
+Entries live under AGENT_CACHE_DIR (default: backend/.cache/agents), one
+file per key, grouped by namespace. Writes go through a temp file and
+os.replace so concurrent workers never read a half-written entry.
+
+A cache may expire entries after ttl_seconds and keep at most max_entries
+files, evicting the least recently used ones (reads refresh the file mtime).
+
+Set AGENT_CACHE_DISABLED=1 to bypass every cache (reads miss, writes no-op).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_ROOT = Path(__file__).resolve().parent.parent / '.cache' / 'agents'
+
+
+def cache_root() -> Path:
+    return Path(os.environ.get('AGENT_CACHE_DIR') or _DEFAULT_ROOT)
+
+
+def cache_disabled() -> bool:
+    return os.environ.get('AGENT_CACHE_DISABLED', '').lower() in ('1', 'true', 'yes')
+
+
+class FileCache:
+    """A namespaced key → JSON-serializable dict store on local disk."""
+
+    # Eviction scans the namespace directory, so only do it every N writes.
+    _PRUNE_EVERY = 50
+
+    def __init__(self, namespace: str, ttl_seconds: float | None = None,
+                 max_entries: int | None = None):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return cache_root() / self.namespace / digest[:2] / f'{digest}.json'
+
+    def get(self, key: str) -> dict | None:
+        if cache_disabled():
+            return None
+        value = self._read(self._path(key))
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def _read(self, path: Path) -> dict | None:
+        try:
+            with open(path, encoding='utf-8') as fh:
+                entry = json.load(fh)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning('FileCache[%s]: unreadable entry %s — %s', self.namespace, path, exc)
+            return None
+
+        if not isinstance(entry, dict) or 'value' not in entry:
+            return None
+
+        if self.ttl_seconds is not None and time.time() - entry.get('stored_at', 0) > self.ttl_seconds:
+            self._unlink(path)
+            return None
+
+        if self.max_entries is not None:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return entry['value']
+
+    def set(self, key: str, value: dict) -> None:
+        if cache_disabled():
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+                json.dump({'stored_at': time.time(), 'value': value}, fh, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.warning('FileCache[%s]: could not write %s — %s', self.namespace, path, exc)
+            return
+
+        if self.max_entries is not None:
+            with self._lock:
+                self._writes += 1
+                due = self._writes % self._PRUNE_EVERY == 0
+            if due:
+                self.prune()
+
+    def delete(self, key: str) -> None:
+        self._unlink(self._path(key))
+
+    def prune(self) -> int:
+        """Evicts least recently used entries beyond max_entries. Returns the number removed."""
+        if self.max_entries is None:
+            return 0
+        entries = []
+        for path in (cache_root() / self.namespace).glob('*/*.json'):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return 0
+        entries.sort()
+        for _, path in entries[:excess]:
+            self._unlink(path)
+        return excess
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,358 @@
+"""
+HTML extraction for scrape_tool: visible text, the event image and links.
+
+Two interchangeable extractors produce the same Extraction:
+
+    bs4    BeautifulSoup with html.parser. The reference implementation: it
+           builds a tree, decomposes chrome (script/style/nav/footer/header)
+           and walks the tree once per output.
+    lxml   A parser target fed by libxml2's HTML parser. No tree is built;
+           text, image candidates and links are collected in a single pass
+           over the parse events. Several times faster on large pages.
+
+SCRAPE_EXTRACTOR selects one: 'auto' (default: lxml when installed, else
+bs4), 'bs4' or 'lxml'. Both are checked against the hand-written pages in
+guana_know/agents/tests/fixtures/pages, which mimic the layouts of our
+sources (og:image, content divs, pages without <main>); they are not
+captures of real source pages.
+
+json_ld_events() pulls schema.org Event objects out of a page's JSON-LD
+blocks for the json_ld scrape strategy.
+"""
+
+import json
+import logging
+import os
+import re
+from typing import NamedTuple
+from urllib.parse import urljoin, urlparse
+
+logger = logging.getLogger(__name__)
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover - optional dependency
+    etree = None
+
+# Page chrome whose text, images and links are ignored.
+_SKIPPED_TAGS = frozenset({'script', 'style', 'nav', 'footer', 'header'})
+# Elements whose text bs4's get_text() leaves out (their markup still counts).
+_TEXTLESS_TAGS = frozenset({'template', 'rt', 'rp'})
+
+_EXCLUDE_IMAGE_KEYWORDS = ('logo', 'icon', 'avatar', 'banner', '/ads/', 'adtech', 'adserver', 'pixel', 'tracker', 'sprite')
+_IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif')
+_CONTENT_CLASS_KEYWORDS = ('content', 'event', 'body')
+_SKIPPED_LINK_PARTS = ('#', '.css', '.js', '.png', '.jpg', '/admin', '/login', '/static')
+
+
+class Extraction(NamedTuple):
+    text: str
+    image_url: str | None
+    # Candidate event links as (absolute url, anchor text), in page order.
+    # link_ranking orders them for the crawl.
+    links: list[tuple[str, str]]
+
+
+def extract(html: str, base_url: str) -> Extraction:
+    """Extracts text, image and event links with the configured extractor."""
+    return get_extractor()(html, base_url)
+
+
+def get_extractor():
+    setting = os.environ.get('SCRAPE_EXTRACTOR', 'auto').lower()
+    if setting == 'bs4':
+        return extract_with_bs4
+    if etree is None:
+        if setting == 'lxml':
+            logger.warning('SCRAPE_EXTRACTOR=lxml but lxml is not installed; using bs4.')
+        return extract_with_bs4
+    return extract_with_lxml
+
+
+def _is_excluded_image(src: str) -> bool:
+    return any(keyword in src.lower() for keyword in _EXCLUDE_IMAGE_KEYWORDS)
+
+
+def _filter_event_links(anchors, base_url: str) -> list[tuple[str, str]]:
+    """
+    Keeps the (href, text) anchors that may be event detail pages, as
+    absolute URLs de-duplicated in page order. Filters out external,
+    fragment, static and admin links and the page itself. The texts of all
+    anchors pointing at the same URL are joined (a card often links its
+    image, its title and a "Ver más" button to the same page).
+    """
+    base_domain = urlparse(base_url).netloc
+    # Insertion-ordered dict as an ordered set: O(1) membership checks.
+    links: dict[str, list[str]] = {}
+
+    for href, text in anchors:
+        full_url = urljoin(base_url, href)
+        parsed = urlparse(full_url)
+
+        # Only same-domain links
+        if parsed.netloc != base_domain:
+            continue
+
+        # Skip fragments (#main-content, etc.)
+        if parsed.fragment:
+            continue
+
+        # Skip anchors, static files, admin, auth
+        if any(skip in parsed.path for skip in _SKIPPED_LINK_PARTS):
+            continue
+
+        # Skip the index page itself
+        if full_url.rstrip('/') == base_url.rstrip('/'):
+            continue
+
+        texts = links.setdefault(full_url, [])
+        if text and text not in texts:
+            texts.append(text)
+
+    return [(url, ' '.join(texts)) for url, texts in links.items()]
+
+
+# ── bs4 ──────────────────────────────────────────────────────────────────────
+
+def extract_with_bs4(html: str, base_url: str) -> Extraction:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    for tag in soup(list(_SKIPPED_TAGS)):
+        tag.decompose()
+    return Extraction(
+        text=soup.get_text(separator='\n', strip=True),
+        image_url=_soup_image_url(soup, base_url),
+        links=_filter_event_links(
+            ((a['href'], a.get_text(' ', strip=True)) for a in soup.find_all('a', href=True)),
+            base_url,
+        ),
+    )
+
+
+def _soup_image_url(soup, base_url: str) -> str | None:
+    """Returns the most relevant event image URL from a parsed page."""
+    # Priority 1: og:image
+    og = soup.find('meta', property='og:image')
+    if og and og.get('content'):
+        return og['content']
+
+    # Priority 2: twitter:image
+    tw = soup.find('meta', attrs={'name': 'twitter:image'})
+    if tw and tw.get('content'):
+        return tw['content']
+
+    # Priority 3: first content image — search semantic containers first,
+    # then content-like divs. Both sets are checked; using 'or' here would
+    # silently skip the div search if <main>/<article> tags exist but carry
+    # no images (e.g. Drupal sites that wrap content in custom divs).
+    semantic_areas = soup.find_all(['main', 'article'])
+    content_divs = soup.find_all(
+        'div',
+        class_=lambda c: c and any(k in c.lower() for k in _CONTENT_CLASS_KEYWORDS),
+    )
+    for area in [*semantic_areas, *content_divs]:
+        for img in area.find_all('img', src=True):
+            src = img['src']
+            if not _is_excluded_image(src):
+                return urljoin(base_url, src)
+
+    # Priority 4: any img tag on the page that looks like a content image
+    for img in soup.find_all('img', src=True):
+        src = img['src']
+        if _is_excluded_image(src):
+            continue
+        if src.lower().endswith(_IMAGE_EXTENSIONS):
+            return urljoin(base_url, src)
+
+    return None
+
+
+# ── lxml ─────────────────────────────────────────────────────────────────────
+
+class _SinglePassTarget:
+    """
+    lxml parser target that applies the bs4 extractor's rules while the
+    document is being parsed, so no tree is built or walked afterwards.
+
+    Image priorities mirror _soup_image_url: the first og:image /
+    twitter:image meta; else the first image inside the earliest <main> or
+    <article> that has one; else the same for content-like divs; else any
+    image with an image file extension.
+    """
+
+    def __init__(self):
+        self.texts: list[str] = []
+        self.anchors: list[tuple[str, list[str]]] = []
+        self._anchor_texts: list[str] | None = None
+        self.og_image: str | None = None
+        self.twitter_image: str | None = None
+        self.seen_og = False
+        self.seen_twitter = False
+        self.fallback_image: str | None = None
+        # Open <main>/<article> and content <div> elements as
+        # (tag, [start order, is_semantic, first image inside or None]).
+        self._open_areas: list[tuple[str, list]] = []
+        # (0 for semantic / 1 for div, start order) → first image inside.
+        self.area_images: dict[tuple[int, int], str] = {}
+        self._area_count = 0
+        self._skip_depth = 0
+        self._textless_depth = 0
+        self._pending: list[str] = []
+
+    def _flush_text(self):
+        if self._pending:
+            text = ''.join(self._pending).strip()
+            if text:
+                self.texts.append(text)
+                if self._anchor_texts is not None:
+                    self._anchor_texts.append(text)
+            self._pending = []
+
+    def start(self, tag, attrib):
+        self._flush_text()
+        tag = tag.lower()
+        if self._skip_depth or tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+            return
+        if tag in _TEXTLESS_TAGS:
+            self._textless_depth += 1
+
+        if tag == 'meta':
+            if attrib.get('property') == 'og:image' and not self.seen_og:
+                self.seen_og = True
+                self.og_image = attrib.get('content')
+            if attrib.get('name') == 'twitter:image' and not self.seen_twitter:
+                self.seen_twitter = True
+                self.twitter_image = attrib.get('content')
+        elif tag == 'a':
+            href = attrib.get('href')
+            self._anchor_texts = [] if href is not None else None
+            if href is not None:
+                self.anchors.append((href, self._anchor_texts))
+        elif tag == 'img':
+            src = attrib.get('src')
+            if src is not None and not _is_excluded_image(src):
+                for _, area in self._open_areas:
+                    if area[2] is None:
+                        area[2] = src
+                if self.fallback_image is None and src.lower().endswith(_IMAGE_EXTENSIONS):
+                    self.fallback_image = src
+        elif tag in ('main', 'article'):
+            self._open_areas.append((tag, [self._area_count, True, None]))
+            self._area_count += 1
+        elif tag == 'div':
+            classes = attrib.get('class')
+            if classes and any(k in classes.lower() for k in _CONTENT_CLASS_KEYWORDS):
+                self._open_areas.append((tag, [self._area_count, False, None]))
+                self._area_count += 1
+
+    def end(self, tag):
+        self._flush_text()
+        tag = tag.lower()
+        if self._skip_depth:
+            self._skip_depth -= 1
+            return
+        if tag in _TEXTLESS_TAGS and self._textless_depth:
+            self._textless_depth -= 1
+        if tag == 'a':
+            self._anchor_texts = None
+        elif tag in ('main', 'article', 'div'):
+            for index in range(len(self._open_areas) - 1, -1, -1):
+                if self._open_areas[index][0] == tag:
+                    order, semantic, image = self._open_areas.pop(index)[1]
+                    if image is not None:
+                        self.area_images[(0 if semantic else 1, order)] = image
+                    break
+
+    def data(self, text):
+        if not self._skip_depth and not self._textless_depth:
+            self._pending.append(text)
+
+    def comment(self, text):
+        self._flush_text()
+
+    def pi(self, target, data=None):
+        self._flush_text()
+
+    def doctype(self, *args):
+        self._flush_text()
+
+    def close(self):
+        self._flush_text()
+        # Areas left open by a truncated page still count.
+        while self._open_areas:
+            order, semantic, image = self._open_areas.pop()[1]
+            if image is not None:
+                self.area_images[(0 if semantic else 1, order)] = image
+        return self
+
+    def image_url(self, base_url: str) -> str | None:
+        if self.og_image:
+            return self.og_image
+        if self.twitter_image:
+            return self.twitter_image
+        if self.area_images:
+            return urljoin(base_url, self.area_images[min(self.area_images)])
+        if self.fallback_image is not None:
+            return urljoin(base_url, self.fallback_image)
+        return None
+
+
+def extract_with_lxml(html: str, base_url: str) -> Extraction:
+    target = _SinglePassTarget()
+    parser = etree.HTMLParser(target=target, remove_comments=False, recover=True)
+    parser.feed(html)
+    parser.close()
+    return Extraction(
+        text='\n'.join(target.texts),
+        image_url=target.image_url(base_url),
+        links=_filter_event_links(
+            ((href, ' '.join(texts)) for href, texts in target.anchors), base_url,
+        ),
+    )
+
+
+# ── JSON-LD ──────────────────────────────────────────────────────────────────
+
+_JSON_LD_RE = re.compile(
+    r'<script\b[^>]*\btype\s*=\s*["\']?application/ld\+json["\']?[^>]*>(.*?)</script\s*>',
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def json_ld_events(html: str) -> list[dict]:
+    """
+    Returns the schema.org Event objects (Event, MusicEvent, TheaterEvent,
+    ...) found in the page's JSON-LD blocks, in page order. Looks inside
+    arrays, @graph and ItemList elements; malformed blocks are skipped.
+    """
+    events: list[dict] = []
+    for block in _JSON_LD_RE.findall(html or ''):
+        try:
+            data = json.loads(block.strip(), strict=False)
+        except ValueError:
+            logger.debug('json_ld_events: skipping malformed JSON-LD block')
+            continue
+        _collect_events(data, events)
+    return events
+
+
+def _collect_events(node, events: list[dict]) -> None:
+    if isinstance(node, list):
+        for item in node:
+            _collect_events(item, events)
+        return
+    if not isinstance(node, dict):
+        return
+
+    types = node.get('@type') or []
+    if isinstance(types, str):
+        types = [types]
+    if any(isinstance(t, str) and t.endswith('Event') for t in types):
+        events.append(node)
+        return
+
+    for key in ('@graph', 'itemListElement', 'item'):
+        if key in node:
+            _collect_events(node[key], events)
@@ -0,0 +1,141 @@
+"""
+Process-wide pooled HTTP client for the agent tools.
+
+Scraping, Apify polling, image verification and image downloads all go
+through one lazily created httpx.Client, so connections (and TLS sessions)
+are kept alive and reused across pages, images and sources. The async
+crawler cannot share a sync client, but builds its AsyncClient from the same
+client_options() so limits, timeouts and headers stay consistent, and takes
+its per-host slots from the same semaphores (async_host_slot), so the cap
+holds across worker threads and crawls together.
+
+Configuration (environment variables):
+    AGENT_HTTP_TIMEOUT           default timeout in seconds (15)
+    AGENT_HTTP_MAX_CONNECTIONS   total pooled connections (50)
+    AGENT_HTTP_MAX_KEEPALIVE     idle keep-alive connections (20)
+    AGENT_HTTP_MAX_PER_HOST      concurrent requests per host (6)
+    AGENT_HTTP2                  'auto' (default: on when h2 is installed), '1' or '0'
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager, contextmanager
+from urllib.parse import urlparse
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (compatible; GuanaKnowBot/1.0; +https://guanaknow.mx/bot)'
+
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+
+# How often async_host_slot() retries a busy host.
+_SLOT_POLL_INTERVAL = 0.05
+
+
+def max_per_host() -> int:
+    """Concurrent requests allowed per host (AGENT_HTTP_MAX_PER_HOST)."""
+    return int(os.environ.get('AGENT_HTTP_MAX_PER_HOST', '6'))
+
+
+_host_slots: dict[str, threading.BoundedSemaphore] = defaultdict(
+    lambda: threading.BoundedSemaphore(max_per_host())
+)
+_host_slots_lock = threading.Lock()
+
+
+def _http2_enabled() -> bool:
+    setting = os.environ.get('AGENT_HTTP2', 'auto').lower()
+    if setting in ('0', 'false', 'no'):
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        if setting != 'auto':
+            logger.warning('AGENT_HTTP2 is enabled but the h2 package is not installed; using HTTP/1.1.')
+        return False
+    return True
+
+
+def client_options() -> dict:
+    """Keyword arguments shared by the sync client and per-crawl async clients."""
+    return {
+        'follow_redirects': True,
+        'timeout': httpx.Timeout(float(os.environ.get('AGENT_HTTP_TIMEOUT', '15'))),
+        'limits': httpx.Limits(
+            max_connections=int(os.environ.get('AGENT_HTTP_MAX_CONNECTIONS', '50')),
+            max_keepalive_connections=int(os.environ.get('AGENT_HTTP_MAX_KEEPALIVE', '20')),
+        ),
+        'headers': {'User-Agent': USER_AGENT},
+        'http2': _http2_enabled(),
+    }
+
+
+def get_client() -> httpx.Client:
+    """Returns the shared client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(**client_options())
+    return _client
+
+
+def close() -> None:
+    """Closes the shared client. The next get_client() call opens a new one."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def _slot_for(url: str) -> threading.BoundedSemaphore:
+    host = urlparse(url).netloc.lower()
+    with _host_slots_lock:
+        return _host_slots[host]
+
+
+@contextmanager
+def host_slot(url: str):
+    """Caps concurrent requests to a single host across all worker threads."""
+    with _slot_for(url):
+        yield
+
+
+@asynccontextmanager
+async def async_host_slot(url: str):
+    """
+    host_slot() for coroutines. Takes the same per-host semaphore without
+    blocking the event loop: a busy host is retried every
+    _SLOT_POLL_INTERVAL seconds, and a cancelled wait holds no slot.
+    """
+    slot = _slot_for(url)
+    while not slot.acquire(blocking=False):
+        await asyncio.sleep(_SLOT_POLL_INTERVAL)
+    try:
+        yield
+    finally:
+        slot.release()
+
+
+def request(method: str, url: str, **kwargs) -> httpx.Response:
+    """Sends a request through the shared client, respecting the per-host cap."""
+    with host_slot(url):
+        return get_client().request(method, url, **kwargs)
+
+
+@contextmanager
+def stream(method: str, url: str, **kwargs):
+    """
+    Like request(), but yields the response before its body is read, so
+    the caller can inspect headers and read (or abandon) the body in chunks.
+    """
+    with host_slot(url):
+        with get_client().stream(method, url, **kwargs) as response:
+            yield response
@@ -0,0 +1,114 @@
+"""
+Ranks a listing's links by how likely they are to be event detail pages.
+
+Crawl mode only fetches the first _CRAWL_MAX_PAGES event_links, and in
+agent mode the model is told to do the same, so the order decides what
+gets parsed. Links are scored on:
+
+    path      event-like segments (/eventos/, /agenda/, /cartelera/, ...)
+              and dates in the path raise the score; about/contact/legal
+              pages, pagination, taxonomies and documents lower it
+    anchor    a date or time in the link text ("Sáb 24 de octubre, 19:00")
+    learned   path patterns of detail pages that yielded events for this
+              source in earlier runs (EventSource.link_patterns)
+
+Sorting is stable, so links with equal scores keep their page order.
+"""
+
+import re
+from urllib.parse import urlparse
+
+_EVENT_SEGMENTS = frozenset({
+    'evento', 'eventos', 'event', 'events', 'agenda', 'cartelera', 'programa',
+    'programacion', 'actividad', 'actividades', 'calendario', 'calendar',
+    'funcion', 'funciones', 'concierto', 'conciertos', 'exposicion',
+    'exposiciones', 'taller', 'talleres', 'festival', 'show', 'shows',
+})
+
+_NEGATIVE_PATH_RE = re.compile(
+    r'(^|/)(about|acerca|nosotros|quienes-somos|historia|contact[oa]?|contact-us|'
+    r'aviso|aviso-de-privacidad|privacidad|privacy|terminos|terms|faq|preguntas-frecuentes|'
+    r'tag|tags|etiqueta|categoria|category|author|autor|page|search|buscar|'
+    r'login|registro|cart|carrito|tienda|shop|donaciones|donate|prensa|press|'
+    r'transparencia|directorio|empleo|bolsa-de-trabajo|mapa-del-sitio|sitemap)(/|$)'
+)
+_DOCUMENT_RE = re.compile(r'\.(pdf|docx?|xlsx?|pptx?|zip|rar|mp3|mp4)$')
+_PAGINATION_QUERY_RE = re.compile(r'(^|&)(page|pagina|p|paged|offset)=\d+')
+_PATH_DATE_RE = re.compile(r'(^|/)20\d\d([/-](0?[1-9]|1[0-2]))([/-]\d{1,2})?(/|$|-)')
+
+_MONTHS = (
+    'enero|febrero|marzo|abril|mayo|junio|julio|agosto|septiembre|setiembre|octubre|'
+    'noviembre|diciembre|ene|feb|mar|abr|may|jun|jul|ago|sep|sept|oct|nov|dic|'
+    'january|february|march|april|june|july|august|september|october|november|december'
+)
+_TEXT_DATE_RE = re.compile(
+    r'\b\d{1,2}[/.-]\d{1,2}([/.-]\d{2,4})?\b'              # 24/10, 24-10-2026
+    rf'|\b\d{{1,2}}\s+(de\s+)?({_MONTHS})\b'               # 24 de octubre, 24 oct
+    rf'|\b({_MONTHS})\s+\d{{1,2}}\b'                       # October 24
+    r'|\b\d{1,2}:\d{2}\s*(h|hrs|am|pm)?\b',                # 19:00, 8:00 pm
+    re.IGNORECASE,
+)
+
+_DIGITS_RE = re.compile(r'\d+')
+
+
+def path_pattern(url: str) -> str | None:
+    """
+    Generalizes a detail page URL into a pattern shared by its siblings:
+    numbers become {n} and the last segment (the slug) becomes *, e.g.
+    /eventos/2026/concierto-de-jazz → /eventos/{n}/*. Returns None when
+    nothing but the slug would remain.
+    """
+    segments = [segment for segment in urlparse(url).path.lower().split('/') if segment]
+    if len(segments) < 2:
+        return None
+    prefix = [_DIGITS_RE.sub('{n}', segment) for segment in segments[:-1]]
+    return '/' + '/'.join(prefix) + '/*'
+
+
+def score_link(url: str, text: str = '') -> int:
+    """Higher is more likely an event detail page; negative is unlikely."""
+    parsed = urlparse(url)
+    path = parsed.path.lower()
+    segments = [segment for segment in path.split('/') if segment]
+    score = 0
+
+    if _NEGATIVE_PATH_RE.search(path) or _DOCUMENT_RE.search(path):
+        score -= 5
+    if _PAGINATION_QUERY_RE.search(parsed.query.lower()):
+        score -= 3
+
+    # An event-like section with something after it (/eventos/<slug>).
+    if any(segment in _EVENT_SEGMENTS for segment in segments[:-1]):
+        score += 3
+    elif segments and any(word in _EVENT_SEGMENTS for word in re.split(r'[-_.]', segments[-1])):
+        score += 1
+
+    if _PATH_DATE_RE.search(path):
+        score += 2
+    if segments and segments[-1].count('-') >= 2:
+        score += 1  # a descriptive slug rather than a section page
+
+    if text and _TEXT_DATE_RE.search(text):
+        score += 2
+
+    return score
+
+
+def rank_links(links: list[tuple[str, str]]) -> list[str]:
+    """Orders (url, anchor text) pairs by score and returns the URLs."""
+    scored = [(score_link(url, text), index, url) for index, (url, text) in enumerate(links)]
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [url for _, _, url in scored]
+
+
+def prefer_learned(urls: list[str], patterns: dict[str, int] | None) -> list[str]:
+    """
+    Moves URLs matching a learned pattern to the front, most proven
+    pattern first; the relative order is otherwise kept.
+    """
+    if not patterns:
+        return list(urls)
+    keyed = [(-patterns.get(path_pattern(url), 0), index, url) for index, url in enumerate(urls)]
+    keyed.sort(key=lambda item: (item[0], item[1]))
+    return [url for _, _, url in keyed]
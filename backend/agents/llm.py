@@ -0,0 +1,106 @@
+"""
+Shared Azure OpenAI client for the discovery agent.
+
+The orchestrator loop and parse_tool both use get_client(), so every chat
+completion in the process goes through one client and one HTTP connection
+pool instead of renegotiating TLS per call. The client is created lazily
+and is safe to share between worker threads. complete() wraps a chat
+completion and records its latency and token usage on the current AgentRun.
+
+Configuration (environment variables):
+    AZURE_OPENAI_API_KEY, AZURE_OPENAI_ENDPOINT   required
+    AZURE_OPENAI_API_VERSION   default 2025-01-01-preview
+    AZURE_OPENAI_DEPLOYMENT    default gpt-4o-mini
+    AZURE_OPENAI_MAX_CONNECTIONS   pooled connections (20)
+    AZURE_OPENAI_TIMEOUT       request timeout in seconds (120)
+    AZURE_OPENAI_MAX_RETRIES   SDK retries on 429/5xx/connection errors (3)
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import httpx
+from openai import AzureOpenAI
+
+from agents.run_context import record_step
+
+_client: AzureOpenAI | None = None
+_lock = threading.Lock()
+
+
+def deployment() -> str:
+    return os.environ.get('AZURE_OPENAI_DEPLOYMENT', 'gpt-4o-mini')
+
+
+def get_client() -> AzureOpenAI:
+    """Returns the shared AzureOpenAI client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = _build_client()
+    return _client
+
+
+def complete(purpose: str, **kwargs):
+    """
+    Creates a chat completion on the configured deployment.
+
+    purpose labels the call in the run's step log (e.g. 'orchestrator',
+    'parse_tool'). Usage is recorded whether or not the call succeeds.
+    """
+    started_at = datetime.now(timezone.utc)
+    start = time.monotonic()
+    try:
+        response = get_client().chat.completions.create(model=deployment(), **kwargs)
+    except Exception as exc:
+        record_step('llm', purpose, started_at=started_at,
+                    duration_ms=(time.monotonic() - start) * 1000, error=str(exc))
+        raise
+
+    usage = getattr(response, 'usage', None)
+    record_step(
+        'llm', purpose, started_at=started_at,
+        duration_ms=(time.monotonic() - start) * 1000,
+        prompt_tokens=_token_count(usage, 'prompt_tokens'),
+        completion_tokens=_token_count(usage, 'completion_tokens'),
+    )
+    return response
+
+
+def _token_count(usage, field: str) -> int:
+    value = getattr(usage, field, 0)
+    return value if isinstance(value, int) else 0
+
+
+def _build_client() -> AzureOpenAI:
+    max_connections = int(os.environ.get('AZURE_OPENAI_MAX_CONNECTIONS', '20'))
+    timeout = float(os.environ.get('AZURE_OPENAI_TIMEOUT', '120'))
+
+    http = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        ),
+        timeout=httpx.Timeout(timeout, connect=10),
+    )
+
+    return AzureOpenAI(
+        api_key=os.environ['AZURE_OPENAI_API_KEY'],
+        azure_endpoint=os.environ['AZURE_OPENAI_ENDPOINT'],
+        api_version=os.environ.get('AZURE_OPENAI_API_VERSION', '2025-01-01-preview'),
+        max_retries=int(os.environ.get('AZURE_OPENAI_MAX_RETRIES', '3')),
+        timeout=timeout,
+        http_client=http,
+    )
+
+
+def reset() -> None:
+    """Closes and drops the shared client (e.g. after changing credentials)."""
+    global _client
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
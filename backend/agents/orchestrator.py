@@ -10,28 +10,91 @@ The orchestrator:
 3. Calls dedup_tool for each candidate to check for duplicates.
 4. Writes eligible candidates to the database.
 
+Two modes drive steps 1–3:
+  crawl (default) → code-driven: the listing's event_links are fetched
+                    concurrently and each detail page goes straight to
+                    parse_tool. No orchestrator LLM round trips.
+  agent           → the LLM decides which tool to call next (function calling).
+
 Confidence threshold:
   >= CONFIDENCE_AUTO_DRAFT  → Event(status=draft, source=agent)
   <  CONFIDENCE_AUTO_DRAFT  → EventDraft(status=pending_review)
 """
 
+import asyncio
+import contextvars
+import html
 import json
 import logging
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
-from openai import AzureOpenAI
+import httpx
 
+from agents import http_client, llm
+from agents.run_context import RunContext, activate, timed_step
 from agents.tools import dedup_tool, parse_tool, scrape_tool
 
 logger = logging.getLogger(__name__)
 
 CONFIDENCE_AUTO_DRAFT = 0.80
 
+# Strategies whose scrape_tool results carry structured_events, mapped
+# straight to event_data by _run_structured_source.
+STRUCTURED_STRATEGIES = ('apify_facebook', 'apify_instagram', 'json_ld')
+
+RUN_MODES = ('crawl', 'agent')
+
+# Detail pages fetched per listing in crawl mode, and how many of those
+# requests may be in flight at once.
+_CRAWL_MAX_PAGES = 10
+_CRAWL_CONCURRENCY = int(os.environ.get('AGENT_CRAWL_CONCURRENCY', '5'))
+
+# Tool calls from a single assistant turn that may run at the same time.
+_TOOL_CONCURRENCY = int(os.environ.get('AGENT_TOOL_CONCURRENCY', '4'))
+
+# Event images downloaded at the same time once a run's rows are written.
+_IMAGE_CONCURRENCY = int(os.environ.get('AGENT_IMAGE_CONCURRENCY', '4'))
+
+# Characters of page text the model sees for each scrape; the full text
+# stays in the RunContext and is handed to parse_tool by content_handle.
+_PREVIEW_CHARS = 300
+
+# In agent mode page text never travels through the conversation: parse_tool
+# takes the content_handle returned by scrape_tool instead of the content.
+_PARSE_TOOL_DEFINITION = {
+    'type': 'function',
+    'function': {
+        'name': 'parse_tool',
+        'description': parse_tool.TOOL_DEFINITION['function']['description'],
+        'parameters': {
+            'type': 'object',
+            'properties': {
+                'content_handle': {
+                    'type': 'string',
+                    'description': 'The content_handle returned by scrape_tool for the page to parse.',
+                },
+                'source_url': {
+                    'type': 'string',
+                    'description': 'The URL of the page. Defaults to the scraped URL.',
+                },
+                'source_type': {
+                    'type': 'string',
+                    'description': 'Type of source: instagram, facebook, website, or twitter.',
+                },
+            },
+            'required': ['content_handle', 'source_type'],
+        },
+    }
+}
+
+# dedup_tool is not offered: parsed events are deduplicated server-side as
+# they are added to the run's candidate ledger.
 _TOOLS = [
     scrape_tool.TOOL_DEFINITION,
-    parse_tool.TOOL_DEFINITION,
-    dedup_tool.TOOL_DEFINITION,
+    _PARSE_TOOL_DEFINITION,
 ]
 
 _SYSTEM_PROMPT = """\
@@ -41,152 +104,109 @@ Your goal: discover upcoming cultural events from a given event source URL.
 
 Workflow:
 1. Call scrape_tool with the source URL to fetch the listing page.
-   The result contains: content (page text), image_url, and event_links
-   (a list of URLs for individual event detail pages).
+   The result contains: content_handle (a reference to the stored page text),
+   preview (the first few hundred characters), content_chars, image_url, and
+   event_links (URLs of likely event detail pages, most likely first).
+   The full page text is kept server-side; you never need to copy it.
 
-2. If event_links are present, call scrape_tool on EACH event detail URL (up to 10)
+2. If event_links are present, call scrape_tool on EACH event detail URL (the first 10 at most)
    to fetch the full event data: description, venue, schedule, and price.
    These detail pages are the authoritative source — the listing page only has titles and dates.
+   Independent scrape_tool calls can be issued together in one turn.
 
 3. For each event detail page scraped in step 2, call parse_tool with:
-   - content: the text from that individual detail page
-   - source_url: the detail page URL
+   - content_handle: the content_handle returned by scrape_tool for that page
    - source_type: same as the original source_type
-   - image_url: the image_url returned by scrape_tool for that page
+   The page's source_url and image_url are filled in server-side from the scrape.
    Call parse_tool once per event detail page to extract one event at a time.
    If NO event_links were returned in step 1, fall back to calling parse_tool
-   on the listing page content instead.
+   with the listing page's content_handle instead.
 
-4. For each candidate event returned by any parse_tool call, call dedup_tool
-   to check if it already exists in the database.
+4. Every event parse_tool finds is deduplicated and recorded server-side.
+   parse_tool only returns a short summary (events_found, duplicates, titles);
+   you never need to copy event data or call any other tool for it.
 
-5. Return a final JSON summary of ALL candidates found across all parse_tool calls.
+5. When every page has been parsed, finish with ONLY this JSON, no extra text:
+   {"done": true}
+   If the source could not be scraped at all, finish with:
+   {"done": true, "error": "reason"}
    Do NOT write to the database directly — the caller handles persistence.
-
-Final response format (return ONLY this JSON, no extra text):
-{{
-  "candidates": [
-    {{
-      "event_data": {{
-        "title": "string",
-        "description": "string or null",
-        "start_datetime": "ISO8601 or null",
-        "end_datetime": "ISO8601 or null",
-        "venue_name": "string or null",
-        "category": "string",
-        "price": 0,
-        "is_free": true,
-        "registration_url": "string or null",
-        "image_url": "MUST copy this exactly from the parse_tool result for this event — never null if parse_tool returned a value"
-      }},
-      "confidence": 0.85,
-      "issues": [],
-      "is_duplicate": false
-    }}
-  ],
-  "scrape_status": 200,
-  "total_found": 3,
-  "total_duplicates": 1
-}}
-
-CRITICAL: Copy event_data fields verbatim from parse_tool results. Never drop image_url — if parse_tool returned an image_url for an event, it MUST appear in event_data.image_url. If parse_tool returned null or no image_url, then event_data.image_url MUST be null — NEVER substitute the source_url, page URL, or any non-image URL as image_url.
-
-If scraping fails, return {{"candidates": [], "scrape_status": <code>, "total_found": 0, "total_duplicates": 0, "error": "reason"}}.
 """
 
 
-def _dispatch_tool(tool_name: str, tool_input: dict) -> str:
+def _dispatch_tool(tool_name: str, tool_input: dict, ctx: RunContext | None = None) -> str:
     """Executes the requested tool and returns its result as a JSON string."""
-    if tool_name == 'scrape_tool':
-        result = scrape_tool.run(**tool_input)
-    elif tool_name == 'parse_tool':
-        result = parse_tool.run(**tool_input)
-    elif tool_name == 'dedup_tool':
-        result = dedup_tool.run(**tool_input)
-    else:
-        result = {'error': f'Unknown tool: {tool_name}'}
+    target = (tool_input.get('url') or tool_input.get('source_url')
+              or tool_input.get('content_handle') or tool_input.get('title') or '')
+    with timed_step('tool', tool_name, str(target)) as step:
+        if tool_name == 'scrape_tool':
+            result = scrape_tool.run(**tool_input)
+            if ctx is not None:
+                if tool_input.get('url') == ctx.source_url:
+                    ctx.listing_status = result.get('status_code', 0)
+                    ctx.listing_error = result.get('error')
+                if result.get('event_links'):
+                    result['event_links'] = ctx.rank_links(result['event_links'])
+                result = _page_reference(result, ctx.store_page(result))
+        elif tool_name == 'parse_tool':
+            result = _parse_unless_unchanged(tool_input, ctx)
+            if ctx is not None and not result.get('error'):
+                result = _record_parsed_events(result, ctx)
+        elif tool_name == 'dedup_tool':
+            result = dedup_tool.run(**tool_input)
+        else:
+            result = {'error': f'Unknown tool: {tool_name}'}
+        if isinstance(result, dict) and result.get('error'):
+            step['error'] = str(result['error'])
     return json.dumps(result)
 
 
-def run_for_source(source_url: str, source_type: str, strategy: str = 'generic', dry_run: bool = False) -> dict:
+def run_for_source(source_url: str, source_type: str, strategy: str = 'generic',
+                   dry_run: bool = False, mode: str = 'crawl') -> dict:
     from guana_know.agents.models import AgentRun
 
-    if not os.environ.get('AZURE_OPENAI_API_KEY'):
+    # Structured sources are mapped without the LLM and need no key.
+    if strategy not in STRUCTURED_STRATEGIES and not os.environ.get('AZURE_OPENAI_API_KEY'):
         raise EnvironmentError('AZURE_OPENAI_API_KEY environment variable is not set.')
 
+    if mode not in RUN_MODES:
+        raise ValueError(f'Unknown run mode "{mode}". Use one of: {", ".join(RUN_MODES)}.')
+
     run_record = None
     if not dry_run:
-        run_record = AgentRun.objects.create(status='running')
+        run_record = AgentRun.objects.create(status='running', source_url=source_url)
 
-    # Structured sources bypass the LLM pipeline entirely.
-    if strategy in ('apify_facebook', 'apify_instagram'):
-        return _run_structured_source(source_url, strategy, dry_run, run_record)
-
-    try:
-        client = AzureOpenAI(
-            api_key=os.environ['AZURE_OPENAI_API_KEY'],
-            azure_endpoint=os.environ['AZURE_OPENAI_ENDPOINT'],
-            api_version=os.environ.get('AZURE_OPENAI_API_VERSION', '2025-01-01-preview'),
-        )
-
-        messages = [
-            {
-                'role': 'user',
-                'content': (
-                    f'Discover events from this source:\n'
-                    f'URL: {source_url}\n'
-                    f'Source type: {source_type}'
-                ),
-            }
-        ]
-
-        for _ in range(25):
-            response = client.chat.completions.create(
-                model=os.environ.get('AZURE_OPENAI_DEPLOYMENT', 'gpt-4o-mini'),
-                max_tokens=16000,
-                tools=_TOOLS,
-                messages=[{'role': 'system', 'content': _SYSTEM_PROMPT}] + messages,
-            )
-
-            message = response.choices[0].message
-            messages.append({'role': 'assistant', 'content': message.content,
-                             'tool_calls': [tc.model_dump() for tc in (message.tool_calls or [])]})
-
-            if response.choices[0].finish_reason == 'stop':
-                break
-
-            if response.choices[0].finish_reason == 'tool_calls':
-                tool_results = []
-                for tc in (message.tool_calls or []):
-                    logger.info('Calling tool: %s with input: %s', tc.function.name, tc.function.arguments)
-                    result_str = _dispatch_tool(tc.function.name, json.loads(tc.function.arguments))
-                    tool_results.append({
-                        'role': 'tool',
-                        'tool_call_id': tc.id,
-                        'content': result_str,
-                    })
-                messages.extend(tool_results)
+    # LLM calls, tool calls and fetches made while the context is active are
+    # recorded against it and stored as AgentRunSteps when the run ends.
+    ctx = RunContext.for_source(source_url, dry_run=dry_run)
+    with activate(ctx):
+        try:
+            # Structured sources bypass the LLM pipeline entirely.
+            if strategy in STRUCTURED_STRATEGIES:
+                summary = _run_structured_source(source_url, strategy, dry_run, run_record, ctx)
             else:
-                logger.warning('Unexpected finish_reason: %s', response.choices[0].finish_reason)
-                break
+                summary = _run_pipeline(source_url, source_type, mode, ctx, run_record)
+        finally:
+            if run_record:
+                ctx.save_metrics(run_record)
 
-        final_text = (response.choices[0].message.content or '').strip()
+    usage = ctx.usage()
+    summary['usage'] = {**usage, 'estimated_cost': float(usage['estimated_cost'])}
+    return summary
 
-        try:
-            summary = json.loads(final_text)
-        except (json.JSONDecodeError, ValueError):
-            logger.error(
-                'Orchestrator: could not parse final response as JSON.\nRaw: %s',
-                final_text[:500]
-            )
-            summary = {
-                'candidates': [],
-                'error': 'invalid_final_response',
-                'raw': final_text[:500],
-            }
+
+def _run_pipeline(source_url: str, source_type: str, mode: str, ctx: RunContext, run_record) -> dict:
+    """Runs the crawl or agent pipeline for an HTML source and handles its candidates."""
+    dry_run = ctx.dry_run
+    try:
+        if mode == 'crawl':
+            summary = _run_crawl(source_url, source_type, ctx)
+        else:
+            summary = _run_agent_loop(source_url, source_type, ctx)
+        summary['pages_skipped'] = ctx.pages_skipped
 
         if not dry_run:
-            summary = _persist_candidates(summary, source_url)
+            summary = _persist_candidates(summary, source_url, ctx.venues)
         else:
             from django.utils.dateparse import parse_datetime
             from django.utils import timezone as tz
@@ -219,8 +239,15 @@ def run_for_source(source_url: str, source_type: str, strategy: str = 'generic',
             run_record.sources_processed = 1
             run_record.events_created = summary.get('written_events', 0)
             run_record.events_deduped = summary.get('total_duplicates', 0)
+            run_record.pages_skipped = ctx.pages_skipped
             run_record.save()
 
+        # Only remember fingerprints once the candidates were actually
+        # handled; otherwise the next run would skip pages we never used.
+        if not summary.get('error'):
+            ctx.save_fingerprints()
+            ctx.save_link_patterns()
+
         return summary
 
     except Exception as exc:
@@ -233,6 +260,295 @@ def run_for_source(source_url: str, source_type: str, strategy: str = 'generic',
         raise
 
 
+def _run_agent_loop(source_url: str, source_type: str, ctx: RunContext) -> dict:
+    """
+    LLM-driven pipeline: the model chooses which tools to call and signals
+    completion. Candidates are collected in the RunContext ledger as
+    parse_tool results come in, so the summary is built server-side rather
+    than regenerated by the model.
+    """
+    messages = [
+        {
+            'role': 'user',
+            'content': (
+                f'Discover events from this source:\n'
+                f'URL: {source_url}\n'
+                f'Source type: {source_type}'
+            ),
+        }
+    ]
+
+    response = None
+    with ThreadPoolExecutor(max_workers=max(1, _TOOL_CONCURRENCY),
+                            thread_name_prefix='agent-tool') as executor:
+        for _ in range(25):
+            response = llm.complete(
+                'orchestrator',
+                max_tokens=1024,
+                tools=_TOOLS,
+                messages=[{'role': 'system', 'content': _SYSTEM_PROMPT}] + messages,
+            )
+
+            message = response.choices[0].message
+            messages.append({'role': 'assistant', 'content': message.content,
+                             'tool_calls': [tc.model_dump() for tc in (message.tool_calls or [])]})
+
+            if response.choices[0].finish_reason == 'stop':
+                break
+
+            if response.choices[0].finish_reason == 'tool_calls':
+                messages.extend(_run_tool_calls(message.tool_calls or [], ctx, executor))
+            else:
+                logger.warning('Unexpected finish_reason: %s', response.choices[0].finish_reason)
+                break
+        else:
+            logger.warning('Orchestrator: iteration limit reached for %s; using the ledger so far', source_url)
+
+    summary = ctx.ledger_summary()
+
+    final_text = (response.choices[0].message.content or '').strip() if response else ''
+    try:
+        final = json.loads(final_text) if final_text else {}
+    except (json.JSONDecodeError, ValueError):
+        logger.info('Orchestrator: final message is not JSON, ignoring: %s', final_text[:200])
+        final = {}
+    if isinstance(final, dict) and final.get('error') and not summary['candidates']:
+        summary['error'] = final['error']
+
+    return summary
+
+
+def _run_tool_calls(tool_calls: list, ctx: RunContext, executor: ThreadPoolExecutor) -> list[dict]:
+    """
+    Executes one assistant turn's tool calls and returns the 'tool' messages.
+
+    Independent calls (several scrapes or parses) run concurrently on the
+    executor, so the turn takes as long as its slowest call. Messages are
+    returned in the order of tool_calls, as the API expects.
+    """
+    if len(tool_calls) <= 1:
+        results = [_execute_tool_call(tc, ctx) for tc in tool_calls]
+    else:
+        results = list(executor.map(lambda tc: _execute_tool_call_in_thread(tc, ctx), tool_calls))
+
+    return [
+        {'role': 'tool', 'tool_call_id': tc.id, 'content': result}
+        for tc, result in zip(tool_calls, results)
+    ]
+
+
+def _execute_tool_call(tc, ctx: RunContext) -> str:
+    logger.info('Calling tool: %s with input: %s', tc.function.name, tc.function.arguments)
+    try:
+        tool_input = json.loads(tc.function.arguments or '{}')
+    except json.JSONDecodeError as exc:
+        return json.dumps({'error': f'Invalid tool arguments: {exc}'})
+    return _dispatch_tool(tc.function.name, tool_input, ctx)
+
+
+def _execute_tool_call_in_thread(tc, ctx: RunContext) -> str:
+    from django.db import connection
+
+    try:
+        # Worker threads do not inherit the caller's context variables.
+        with activate(ctx):
+            return _execute_tool_call(tc, ctx)
+    finally:
+        # dedup_tool opens a DB connection per worker thread; release it.
+        connection.close()
+
+
+def _run_crawl(source_url: str, source_type: str, ctx: RunContext) -> dict:
+    """
+    Code-driven pipeline for HTML sources.
+
+    Scrapes the listing, fetches up to _CRAWL_MAX_PAGES event detail pages
+    concurrently, and hands the pages to parse_tool in token-budgeted
+    batches. Falls back to
+    parsing the listing itself when it has no event links (or none of them
+    could be fetched). Pages whose content is unchanged since the last run
+    are skipped. Candidates go into the same RunContext ledger as in agent
+    mode, so both pipelines return the same summary shape.
+    """
+    listing = scrape_tool.run(url=source_url)
+    ctx.listing_status = listing.get('status_code', 0)
+    ctx.listing_error = listing.get('error')
+    if listing.get('error'):
+        return ctx.ledger_summary()
+
+    pages = []
+    event_links = ctx.rank_links(listing.get('event_links', []))[:_CRAWL_MAX_PAGES]
+    if event_links:
+        for page in _fetch_pages(event_links):
+            if page.get('error') or not page.get('content'):
+                logger.info('_run_crawl: skipping %s — %s', page.get('url'), page.get('error', 'empty page'))
+                continue
+            pages.append(page)
+        logger.info('_run_crawl: fetched %d/%d detail pages for %s',
+                    len(pages), len(event_links), source_url)
+
+    if not pages:
+        pages = [listing]
+
+    to_parse = []
+    fingerprints = []
+    for page in pages:
+        page_url = page.get('url') or source_url
+        fingerprint, unchanged = ctx.page_unchanged(page_url, page['content'])
+        if unchanged:
+            logger.info('Skipping parse for %s — content unchanged since last run', page_url)
+            continue
+        to_parse.append({
+            'content': page['content'],
+            'source_url': page_url,
+            'image_url': page.get('image_url'),
+        })
+        fingerprints.append(fingerprint)
+
+    parsed_pages = []
+    if to_parse:
+        with timed_step('tool', 'parse_tool', f'{len(to_parse)} pages'):
+            parsed_pages = parse_tool.run_batch(to_parse, source_type)
+    for page, fingerprint, parsed in zip(to_parse, fingerprints, parsed_pages):
+        if parsed.get('error'):
+            logger.warning('_run_crawl: parse_tool failed for %s — %s', page['source_url'], parsed['error'])
+            continue
+        ctx.remember(page['source_url'], fingerprint)
+        if parsed.get('events'):
+            ctx.learn_event_page(page['source_url'])
+        ctx.add_candidates(_candidates_from_parsed(parsed.get('events', [])))
+
+    return ctx.ledger_summary()
+
+
+def _parse_unless_unchanged(tool_input: dict, ctx: RunContext | None) -> dict:
+    """
+    Runs parse_tool unless the page's content fingerprint matches the
+    previous run, in which case its events were already parsed, deduped
+    and persisted — no LLM call is made.
+
+    A content_handle from scrape_tool is resolved to the stored page text,
+    URL and image here, so the model never has to echo page content back.
+    """
+    if ctx is None:
+        return parse_tool.run(**tool_input)
+
+    tool_input = dict(tool_input)
+    handle = tool_input.pop('content_handle', None)
+    if handle:
+        page = ctx.page(handle)
+        if page is None:
+            return {'events': [], 'error': f'Unknown content_handle: {handle}'}
+        tool_input['content'] = page.get('content') or ''
+        tool_input.setdefault('source_url', page.get('url') or ctx.source_url)
+        tool_input.setdefault('image_url', page.get('image_url'))
+    elif 'content' not in tool_input:
+        return {'events': [], 'error': 'parse_tool needs a content_handle from scrape_tool.'}
+
+    url = tool_input.get('source_url') or ctx.source_url
+    fingerprint, unchanged = ctx.page_unchanged(url, tool_input.get('content') or '')
+    if unchanged:
+        logger.info('Skipping parse for %s — content unchanged since last run', url)
+        return {
+            'events': [],
+            'unchanged': True,
+            'note': 'Content unchanged since the last run; its events were already processed.',
+        }
+
+    result = parse_tool.run(**tool_input)
+    if not result.get('error'):
+        ctx.remember(url, fingerprint)
+        if result.get('events'):
+            ctx.learn_event_page(url)
+    return result
+
+
+def _record_parsed_events(result: dict, ctx: RunContext) -> dict:
+    """
+    Deduplicates a parse_tool result's events into the run's candidate
+    ledger and returns the short summary the model sees instead.
+    """
+    candidates = _candidates_from_parsed(result.get('events', []))
+    ctx.add_candidates(candidates)
+
+    summary = {
+        'events_found': len(candidates),
+        'duplicates': sum(1 for candidate in candidates if candidate['is_duplicate']),
+        'titles': [candidate['event_data'].get('title') for candidate in candidates],
+    }
+    if result.get('unchanged'):
+        summary['unchanged'] = True
+        summary['note'] = result.get('note')
+    return summary
+
+
+def _page_reference(result: dict, handle: str) -> dict:
+    """
+    The compact view of a scrape result shown to the model: everything but
+    the page text, which is replaced by its handle, length and a preview.
+    """
+    content = result.get('content') or ''
+    reference = {key: value for key, value in result.items() if key != 'content'}
+    reference['content_handle'] = handle
+    reference['content_chars'] = len(content)
+    reference['preview'] = content[:_PREVIEW_CHARS]
+    return reference
+
+
+def _candidates_from_parsed(events: list[dict]) -> list[dict]:
+    """Splits parse_tool events into the candidate shape and dedups them in one batch."""
+    candidates = []
+    for event in events:
+        event_data = {k: v for k, v in event.items() if k not in ('confidence', 'issues')}
+        event_data['image_url'] = _sanitize_image_url(event_data.get('image_url'))
+        candidates.append({
+            'event_data': event_data,
+            'confidence': event.get('confidence', 0.0),
+            'issues': event.get('issues') or [],
+        })
+    _mark_duplicates(candidates)
+    return candidates
+
+
+def _mark_duplicates(candidates: list[dict]) -> None:
+    """Sets is_duplicate on each candidate with a single dedup_many query."""
+    if not candidates:
+        return
+    with timed_step('tool', 'dedup_many', f'{len(candidates)} candidates'):
+        results = dedup_tool.dedup_many([
+            {
+                'title': candidate['event_data'].get('title') or '',
+                'venue_name': candidate['event_data'].get('venue_name'),
+                'start_datetime': candidate['event_data'].get('start_datetime'),
+            }
+            for candidate in candidates
+        ])
+    for candidate, result in zip(candidates, results):
+        candidate['is_duplicate'] = result['is_duplicate']
+
+
+def _fetch_pages(urls: list[str]) -> list[dict]:
+    """Fetches detail pages concurrently. Results are returned in the order of urls."""
+    return asyncio.run(_fetch_pages_async(urls))
+
+
+async def _fetch_pages_async(urls: list[str]) -> list[dict]:
+    semaphore = asyncio.Semaphore(_CRAWL_CONCURRENCY)
+
+    options = http_client.client_options()
+    options['headers'] = scrape_tool._HEADERS
+
+    async with httpx.AsyncClient(**options) as client:
+
+        async def fetch(url: str) -> dict:
+            # Per-host slots are shared with the sync client and other workers' crawls.
+            # Host slot first, so a task waiting on a busy host holds no crawl slot.
+            async with http_client.async_host_slot(url), semaphore:
+                return await scrape_tool.scrape_async(client, url)
+
+        return await asyncio.gather(*(fetch(url) for url in urls))
+
+
 _CATEGORY_KEYWORDS: list[tuple[str, list[str]]] = [
     ('music',       ['música', 'musica', 'concierto', 'jazz', 'orquesta', 'banda', 'recital',
                      'sinfonía', 'sinfonia', 'ópera', 'opera', 'coro', 'cantata', 'tocada']),
@@ -304,14 +620,142 @@ def _map_apify_facebook_event(item: dict) -> dict:
     }
 
 
+_JSON_LD_TAG_RE = re.compile(r'<[^>]+>')
+_JSON_LD_SKIPPED_STATUSES = ('EventCancelled', 'EventPostponed')
+
+
+def _json_ld_text(value) -> str:
+    """Plain text of a JSON-LD string property (may be a list, HTML or escaped)."""
+    if isinstance(value, list):
+        value = next((item for item in value if isinstance(item, str)), '')
+    if not isinstance(value, str):
+        return ''
+    return html.unescape(_JSON_LD_TAG_RE.sub(' ', value)).strip()
+
+
+def _json_ld_first(value):
+    return value[0] if isinstance(value, list) and value else value
+
+
+def _json_ld_datetime(value) -> str | None:
+    """schema.org dates may be date-only; those start at local midnight."""
+    value = _json_ld_text(value)
+    if not value:
+        return None
+    return f'{value}T00:00:00' if len(value) == 10 else value
+
+
+def _map_json_ld_event(item: dict) -> dict | None:
+    """
+    Maps a schema.org Event JSON-LD object to our internal event_data format.
+    Returns None for cancelled or postponed events.
+    """
+    status = _json_ld_text(item.get('eventStatus'))
+    if status.rsplit('/', 1)[-1] in _JSON_LD_SKIPPED_STATUSES:
+        return None
+
+    name = _json_ld_text(item.get('name'))
+    description = _json_ld_text(item.get('description'))
+
+    location = _json_ld_first(item.get('location'))
+    if isinstance(location, dict):
+        if location.get('@type') == 'VirtualLocation':
+            venue_name = 'En línea'
+        else:
+            venue_name = _json_ld_text(location.get('name')) or None
+    else:
+        venue_name = _json_ld_text(location) or None
+
+    image = _json_ld_first(item.get('image'))
+    if isinstance(image, dict):
+        image = image.get('url') or image.get('contentUrl')
+    image_url = image if isinstance(image, str) and image else None
+
+    offers = item.get('offers') or []
+    if isinstance(offers, dict):
+        offers = [offers]
+    prices = []
+    offer_url = None
+    for offer in offers:
+        if not isinstance(offer, dict):
+            continue
+        offer_url = offer_url or _json_ld_text(offer.get('url')) or None
+        try:
+            prices.append(float(str(offer.get('price')).replace(',', '')))
+        except (TypeError, ValueError):
+            pass
+    price = min(prices) if prices else 0
+    is_free = item.get('isAccessibleForFree') in (True, 'true', 'True') or (bool(prices) and price == 0)
+
+    return {
+        'title': name,
+        'description': description,
+        'start_datetime': _json_ld_datetime(item.get('startDate')),
+        'end_datetime': _json_ld_datetime(item.get('endDate')),
+        'venue_name': venue_name,
+        'category': _infer_category(name, description),
+        'price': price,
+        'is_free': is_free,
+        'registration_url': offer_url or _json_ld_text(item.get('url')) or None,
+        'image_url': image_url,
+    }
+
+
+def _json_ld_detail_events(event_links: list[str], ctx: RunContext | None) -> list[dict]:
+    """
+    For listings whose CMS only marks up detail pages: fetches up to
+    _CRAWL_MAX_PAGES of the listing's ranked event links concurrently and
+    returns the Event JSON-LD objects found on them.
+    """
+    if ctx:
+        event_links = ctx.rank_links(event_links)
+    urls = event_links[:_CRAWL_MAX_PAGES]
+    if not urls:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(_CRAWL_CONCURRENCY, len(urls))),
+                            thread_name_prefix='agent-json-ld') as executor:
+        # Copies of this context, so fetch steps are recorded against the run.
+        futures = [
+            executor.submit(contextvars.copy_context().run, scrape_tool.run, url=url, strategy='json_ld')
+            for url in urls
+        ]
+        results = [future.result() for future in futures]
+
+    events = []
+    seen = set()
+    for url, result in zip(urls, results):
+        if result.get('error'):
+            logger.info('_json_ld_detail_events: skipping %s — %s', url, result['error'])
+            continue
+        found = result.get('structured_events') or []
+        if found and ctx:
+            ctx.learn_event_page(url)
+        # Detail pages often repeat related events (sidebars, "más eventos").
+        for item in found:
+            key = json.dumps([item.get('name'), item.get('startDate')], default=str)
+            if key not in seen:
+                seen.add(key)
+                events.append(item)
+    logger.info('_json_ld_detail_events: %d events on %d detail pages', len(events), len(urls))
+    return events
+
+
+_STRUCTURED_MAPPERS = {
+    'apify_facebook': _map_apify_facebook_event,
+    'json_ld': _map_json_ld_event,
+}
+
+
 def _run_structured_source(
-    source_url: str, strategy: str, dry_run: bool, run_record
+    source_url: str, strategy: str, dry_run: bool, run_record, ctx: RunContext | None = None
 ) -> dict:
     """
-    Direct pipeline for structured sources (e.g. Apify Facebook).
+    Direct pipeline for structured sources (Apify Facebook, schema.org
+    JSON-LD).
 
-    Calls scrape_tool, maps structured_events, deduplicates, and persists —
-    without invoking the LLM.
+    Calls scrape_tool, maps structured_events, deduplicates them in one
+    batch, and persists — without invoking the LLM.
     """
     from datetime import datetime, timezone as dt_timezone
 
@@ -336,49 +780,46 @@ def _run_structured_source(
             return summary
 
         raw_events = scrape_result.get('structured_events', [])
+        warning = None
+        if strategy == 'json_ld' and not raw_events:
+            raw_events = _json_ld_detail_events(scrape_result.get('event_links', []), ctx)
+            if not raw_events:
+                warning = ('No schema.org Event JSON-LD found on the listing or its event pages; '
+                           'this source may need the generic strategy.')
+                logger.warning('_run_structured_source: %s — %s', source_url, warning)
         candidates = []
-        total_duplicates = 0
 
+        mapper = _STRUCTURED_MAPPERS.get(strategy)
         for item in raw_events:
-            if strategy == 'apify_facebook':
-                event_data = _map_apify_facebook_event(item)
-            else:
-                event_data = item  # fallback: pass through as-is
+            # Without a mapper, items are passed through as-is.
+            event_data = mapper(item) if mapper else item
 
-            title = event_data.get('title', '')
-            if not title:
+            if not event_data or not event_data.get('title'):
                 continue
 
-            dedup_result = dedup_tool.run(
-                title=title,
-                venue_name=event_data.get('venue_name'),
-                start_datetime=event_data.get('start_datetime'),
-            )
-
-            is_dup = dedup_result.get('is_duplicate', False)
-            if is_dup:
-                total_duplicates += 1
-
-            image_url = _sanitize_image_url(event_data.get('image_url'))
-            event_data['image_url'] = image_url
-
+            event_data['image_url'] = _sanitize_image_url(event_data.get('image_url'))
             candidates.append({
                 'event_data': event_data,
                 'confidence': 0.85,  # structured data is reliable
                 'issues': [],
-                'is_duplicate': is_dup,
             })
 
+        _mark_duplicates(candidates)
+        total_duplicates = sum(1 for candidate in candidates if candidate['is_duplicate'])
+
         summary = {
             'candidates': candidates,
             'scrape_status': scrape_result.get('status_code', 200),
             'total_found': len(candidates),
             'total_duplicates': total_duplicates,
             'strategy': strategy,
+            'pages_skipped': 0,
         }
+        if warning:
+            summary['warning'] = warning
 
         if not dry_run:
-            summary = _persist_candidates(summary, source_url)
+            summary = _persist_candidates(summary, source_url, ctx.venues if ctx else None)
         else:
             from django.utils import timezone as tz
             from django.utils.dateparse import parse_datetime
@@ -401,8 +842,15 @@ def _run_structured_source(
             run_record.sources_processed = 1
             run_record.events_created = summary.get('written_events', 0)
             run_record.events_deduped = summary.get('total_duplicates', 0)
+            # Structured sources are not fingerprinted; nothing is skipped.
+            run_record.pages_skipped = 0
+            if warning:
+                run_record.errors = [warning]
             run_record.save()
 
+        if ctx:
+            ctx.save_link_patterns()
+
         return summary
 
     except Exception as exc:
@@ -415,20 +863,27 @@ def _run_structured_source(
         raise
 
 
-def _persist_candidates(summary: dict, source_url: str) -> dict:
+def _persist_candidates(summary: dict, source_url: str, venues=None) -> dict:
     """
     Writes eligible candidates to the database.
 
     High-confidence candidates become Event(status=draft, source=agent).
     Low-confidence candidates become EventDraft(status=pending_review).
+    venues is the run's VenueResolver; a fresh one is used when omitted.
+
+    The agent user, EventSource, venues and slugs are resolved once for the
+    whole batch, then new venues, events and drafts are bulk-inserted in one
+    transaction.
+    The new IDs are returned as created_event_ids / created_draft_ids.
+    Images are downloaded afterwards (see _attach_images), so slow image
+    hosts never hold up the rows themselves.
     """
+    from django.db import transaction
     from guana_know.agents.models import EventDraft, EventSource
-    from guana_know.events.models import Event
-
-    candidates = summary.get('candidates', [])
-    written_drafts = 0
-    written_events = 0
+    from guana_know.venues.services import VenueResolver
 
+    candidates = [c for c in summary.get('candidates', []) if not c.get('is_duplicate')]
+    venues = venues or VenueResolver()
     event_source = EventSource.objects.filter(url=source_url).first()
 
     if not event_source:
@@ -437,27 +892,30 @@ def _persist_candidates(summary: dict, source_url: str) -> dict:
             'low-confidence candidates will be skipped.', source_url
         )
 
+    agent_user = None
+    events = []
+    drafts = []
     for candidate in candidates:
-        if candidate.get('is_duplicate'):
-            continue
-
         event_data = candidate.get('event_data', {})
         confidence = candidate.get('confidence', 0.0)
         issues = candidate.get('issues', [])
 
         if confidence >= CONFIDENCE_AUTO_DRAFT and not issues:
-            _create_agent_event(event_data, source_url, image_url=candidate.get('image_url'))
-            written_events += 1
+            if agent_user is None:
+                agent_user = _get_or_create_agent_user()
+            event = _build_agent_event(event_data, source_url, agent_user, venues,
+                                       image_url=candidate.get('image_url'))
+            if event is not None:
+                events.append(event)
         elif event_source:
-            EventDraft.objects.create(
+            drafts.append(EventDraft(
                 source=event_source,
                 raw_text='',
                 parsed_data=event_data,
                 confidence=confidence,
                 issues=issues,
                 status='pending_review',
-            )
-            written_drafts += 1
+            ))
         else:
             logger.warning(
                 '_persist_candidates: skipping low-confidence candidate '
@@ -465,8 +923,16 @@ def _persist_candidates(summary: dict, source_url: str) -> dict:
                 event_data.get('title', 'untitled')
             )
 
-    summary['written_events'] = written_events
-    summary['written_drafts'] = written_drafts
+    with transaction.atomic():
+        venues.save_pending()
+        _save_agent_events(events)
+        EventDraft.objects.bulk_create(drafts, batch_size=500)
+
+    summary['written_events'] = len(events)
+    summary['written_drafts'] = len(drafts)
+    summary['created_event_ids'] = [str(event.id) for event in events]
+    summary['created_draft_ids'] = [str(draft.id) for draft in drafts]
+    summary['images_stored'] = _attach_images(events)
     return summary
 
 
@@ -500,14 +966,8 @@ def _verify_image_url(image_url: str | None) -> dict:
     if not image_url:
         return {'status': 'none', 'detail': 'no image URL found'}
 
-    import httpx
     try:
-        response = httpx.head(
-            image_url,
-            timeout=5,
-            follow_redirects=True,
-            headers={'User-Agent': 'Mozilla/5.0 (compatible; GuanaGoBot/1.0)'},
-        )
+        response = http_client.request('HEAD', image_url, timeout=5)
         content_type = response.headers.get('content-type', 'unknown')
         content_length = response.headers.get('content-length')
         size_kb = round(int(content_length) / 1024) if content_length else None
@@ -530,12 +990,11 @@ def _verify_image_url(image_url: str | None) -> dict:
 
 def _download_and_store_image(image_url: str | None, event_title: str):
     """
-    Downloads an image from image_url and saves it to Django's storage backend.
+    Downloads an image from image_url.
 
     Returns a ContentFile-wrapped image ready to assign to Event.image,
     or None if download fails or image_url is empty.
     """
-    import httpx
     from django.core.files.base import ContentFile
     from django.utils.text import slugify
 
@@ -543,12 +1002,9 @@ def _download_and_store_image(image_url: str | None, event_title: str):
         return None
 
     try:
-        response = httpx.get(
-            image_url,
-            timeout=10,
-            follow_redirects=True,
-            headers={'User-Agent': 'Mozilla/5.0 (compatible; GuanaGoBot/1.0)'},
-        )
+        with timed_step('fetch', 'image', image_url) as step:
+            response = http_client.request('GET', image_url, timeout=10)
+            step['bytes_fetched'] = len(response.content)
         if response.status_code != 200:
             logger.warning(
                 '_download_and_store_image: got %s for %s',
@@ -583,124 +1039,138 @@ def _download_and_store_image(image_url: str | None, event_title: str):
         return None
 
 
-def _get_or_create_venue(name: str, owner) -> 'Venue | None':
+def _attach_images(events: list) -> int:
     """
-    Returns an existing Venue matching name (case-insensitive),
-    or creates a new one with status='draft' so it appears in
-    the admin for review before being published.
+    Downloads and stores the images of already-saved events.
+
+    Each distinct image_source_url is fetched once (parse_tool copies a
+    page's image onto every event found on it), with up to
+    _IMAGE_CONCURRENCY downloads in flight; the bytes go to the
+    content-addressed media store, so an image already stored for another
+    event or venue is reused too. Resized variants are rendered once per
+    image as well. Returns the number of images stored.
     """
-    from django.utils.text import slugify
-    from guana_know.venues.models import Venue
+    from guana_know.common import images, media
+    from guana_know.events.models import Event
 
-    try:
-        existing = Venue.objects.filter(name__iexact=name).first()
-        if existing:
-            return existing
-
-        base_slug = slugify(name)[:200]
-        slug = base_slug
-        counter = 1
-        while Venue.objects.filter(slug=slug).exists():
-            slug = f'{base_slug}-{counter}'
-            counter += 1
-
-        venue = Venue.objects.create(
-            owner=owner,
-            name=name,
-            slug=slug,
-            description='',
-            category='other',
-            address='',
-            city='Guanajuato',
-            state='Guanajuato',
-            status='draft',
-        )
-        return venue
-    except Exception as exc:
-        logger.error('_get_or_create_venue: failed to create venue "%s" — %s', name, exc)
-        return None
+    by_url: dict[str, list] = {}
+    for event in events:
+        if event.image_source_url:
+            by_url.setdefault(event.image_source_url, []).append(event)
+    if not by_url:
+        return 0
+
+    with ThreadPoolExecutor(max_workers=max(1, min(_IMAGE_CONCURRENCY, len(by_url))),
+                            thread_name_prefix='agent-image') as executor:
+        # Each download runs in a copy of this context so its fetch step is
+        # recorded against the current run.
+        downloads = {
+            url: executor.submit(contextvars.copy_context().run,
+                                 _download_and_store_image, url, group[0].title)
+            for url, group in by_url.items()
+        }
+
+    stored = 0
+    updated = []
+    for url, group in by_url.items():
+        content = downloads[url].result()
+        if content is None:
+            continue
+        stored += 1
+        name = media.store(content, references=len(group))
+        variants = images.build_variants(name, references=len(group))
+        for event in group:
+            event.image = name
+            event.image_variants = variants
+        updated.extend(group)
+
+    Event.objects.bulk_update(updated, ['image', 'image_variants'], batch_size=500)
+    logger.info('_attach_images: stored %d image(s) for %d event(s)', stored, len(updated))
+    return stored
 
 
 def _create_agent_event(event_data: dict, source_url: str,
-                        image_url: str | None = None) -> None:
+                        image_url: str | None = None, venues=None) -> 'Event | None':
     """
-    Creates an Event(status=draft) from agent-parsed data.
+    Creates an Event(status=draft) from agent-parsed data and returns it,
+    or None when the data cannot become an event (see _build_agent_event).
+    """
+    from django.db import transaction
+    from guana_know.venues.services import VenueResolver
+
+    agent_user = _get_or_create_agent_user()
+    venues = venues or VenueResolver()
+    event = _build_agent_event(event_data, source_url, agent_user, venues, image_url=image_url)
+    if event is None:
+        return None
+    with transaction.atomic():
+        venues.save_pending()
+        _save_agent_events([event])
+    _attach_images([event])
+    return event
+
+
+def _build_agent_event(event_data: dict, source_url: str, agent_user, venues=None,
+                       image_url: str | None = None) -> 'Event | None':
+    """
+    Builds an unsaved Event(status=draft, source=agent) from agent-parsed data.
 
     Skips fields that don't map cleanly; missing required fields cause the
-    candidate to remain as EventDraft — this function is only called for
-    high-confidence, issue-free candidates.
+    candidate to remain as EventDraft — this is only used for
+    high-confidence, issue-free candidates. Venue names are resolved through
+    venues (a VenueResolver); unknown venues are built as unsaved drafts for
+    the caller to write with venues.save_pending().
     """
-    from django.utils.text import slugify
     from django.utils import timezone as tz
-    from guana_know.venues.models import Venue
+    from guana_know.common.text import normalize_name
+    from guana_know.events.models import Event
+    from guana_know.venues.services import VenueResolver
 
-    title = event_data.get('title', '').strip()
+    title = (event_data.get('title') or '').strip()
     if not title:
-        logger.warning('_create_agent_event: skipping event with no title')
-        return
-
-    start_raw = event_data.get('start_datetime')
-    end_raw = event_data.get('end_datetime')
+        logger.warning('_build_agent_event: skipping event with no title')
+        return None
 
-    start_dt = _parse_aware(start_raw)
+    start_dt = _parse_aware(event_data.get('start_datetime'))
     if not start_dt:
-        logger.warning('_create_agent_event: skipping "%s" — no valid start_datetime', title)
-        return
+        logger.warning('_build_agent_event: skipping "%s" — no valid start_datetime', title)
+        return None
 
     if start_dt < tz.now():
         logger.info(
-            '_create_agent_event: skipping past event "%s" (start: %s)',
+            '_build_agent_event: skipping past event "%s" (start: %s)',
             title, start_dt.isoformat()
         )
-        return
+        return None
 
-    end_dt = _parse_aware(end_raw) or start_dt
+    end_dt = _parse_aware(event_data.get('end_datetime')) or start_dt
 
-    agent_user = _get_or_create_agent_user()
     if not agent_user:
-        logger.warning('_create_agent_event: no agent user available, skipping "%s"', title)
-        return
+        logger.warning('_build_agent_event: no agent user available, skipping "%s"', title)
+        return None
 
-    venue_name = event_data.get('venue_name', '')
-    venue = None
-    if venue_name:
-        venue = Venue.objects.filter(name__iexact=venue_name.strip()).first()
+    venues = venues or VenueResolver()
+    venue_name = (event_data.get('venue_name') or '').strip()
+    if not venue_name:
+        logger.info('_build_agent_event: no venue name found, using "En línea" for "%s"', title)
+        venue_name = 'En línea'
 
-    if not venue:
-        if venue_name:
-            venue = _get_or_create_venue(venue_name.strip(), agent_user)
-            logger.info(
-                '_create_agent_event: auto-created venue "%s"', venue_name
-            )
-        else:
-            venue = _get_or_create_venue('En línea', agent_user)
-            logger.info(
-                '_create_agent_event: no venue name found, '
-                'using "En línea" for "%s"', title
-            )
+    try:
+        venue = venues.get_or_build(venue_name, agent_user)
+    except Exception as exc:
+        logger.error('_build_agent_event: failed to resolve venue "%s" — %s', venue_name, exc)
+        venue = None
 
     if not venue:
-        logger.warning('_create_agent_event: could not resolve venue for "%s", skipping', title)
-        return
-
-    agent_user = _get_or_create_agent_user()
-    if not agent_user:
-        logger.warning('_create_agent_event: no agent user available, skipping "%s"', title)
-        return
-
-    from guana_know.events.models import Event
-
-    base_slug = slugify(title)[:45]  # SlugField max_length=50; leave room for -N suffix
-    slug = _unique_slug(base_slug)
-
-    resolved_image_url = image_url or event_data.get('image_url') or ''
-    image_file = _download_and_store_image(resolved_image_url or None, title)
+        logger.warning('_build_agent_event: could not resolve venue for "%s", skipping', title)
+        return None
 
-    Event.objects.create(
+    return Event(
         owner=agent_user,
         venue=venue,
         title=title,
-        slug=slug,
+        # bulk_create bypasses Event.save(), which normally fills this in.
+        title_normalized=normalize_name(title),
         description=event_data.get('description') or '',
         category=event_data.get('category') or 'other',
         start_datetime=start_dt,
@@ -708,14 +1178,23 @@ def _create_agent_event(event_data: dict, source_url: str,
         price=event_data.get('price') or 0,
         is_free=event_data.get('is_free', True),
         registration_url=event_data.get('registration_url') or None,
-        image=image_file,
-        image_source_url=resolved_image_url,
+        # Downloaded by _attach_images once the row exists.
+        image_source_url=image_url or event_data.get('image_url') or '',
         status='draft',
         source='agent',
         source_url=source_url,
     )
 
 
+def _save_agent_events(events: list) -> list:
+    """Inserts built events in one bulk_create, giving each a unique slug."""
+    from guana_know.common.slugs import bulk_create_with_unique_slugs, slug_base
+    from guana_know.events.models import Event
+
+    bases = [slug_base(event.title, Event, fallback='evento') for event in events]
+    return bulk_create_with_unique_slugs(Event, events, bases)
+
+
 def _parse_aware(value: str | None):
     from django.utils.dateparse import parse_datetime
     from django.utils import timezone
@@ -743,13 +1222,3 @@ def _get_or_create_agent_user():
     )
     return user
 
-
-def _unique_slug(base: str) -> str:
-    from guana_know.events.models import Event
-
-    slug = base
-    counter = 1
-    while Event.objects.filter(slug=slug).exists():
-        slug = f'{base}-{counter}'
-        counter += 1
-    return slug
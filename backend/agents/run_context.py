@@ -0,0 +1,284 @@
+"""
+Run-scoped state for a single discovery run (one EventSource).
+
+RunContext is created by run_for_source and handed to the pipeline stages
+and tool dispatch, so per-run bookkeeping does not have to travel through
+tool arguments or the LLM conversation. All mutating methods are
+thread-safe: crawl and agent modes may touch the context from worker threads.
+
+While a run is active (see activate()), code deep inside the tools can call
+record_step() / timed_step() to account LLM tokens, tool wall time and bytes
+fetched against it without being passed the context explicitly.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+import unicodedata
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from decimal import Decimal
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Detail-page URL patterns remembered per source.
+_MAX_LINK_PATTERNS = 20
+
+
+def content_fingerprint(content: str) -> str:
+    """
+    Returns a stable hash of page text.
+
+    Normalizes Unicode, case and whitespace so cosmetic re-renders of the
+    same page (indentation, line wrapping) produce the same fingerprint.
+    """
+    normalized = unicodedata.normalize('NFC', content or '')
+    normalized = _WHITESPACE_RE.sub(' ', normalized).strip().lower()
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class RunContext:
+    """Per-source state shared by the orchestrator stages of one run."""
+
+    def __init__(self, source_url: str, dry_run: bool = False,
+                 previous_fingerprints: dict | None = None,
+                 link_patterns: dict | None = None):
+        self.source_url = source_url
+        self.dry_run = dry_run
+        self.previous_fingerprints = dict(previous_fingerprints or {})
+        self.fingerprints: dict[str, str] = {}
+        self.link_patterns: dict[str, int] = dict(link_patterns or {})
+        self.learned_patterns: dict[str, int] = {}
+        self.pages_skipped = 0
+        self.steps: list[dict] = []
+        self.pages: dict[str, dict] = {}
+        self.candidates: list[dict] = []
+        self.listing_status: int | None = None
+        self.listing_error: str | None = None
+        self._venues = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_source(cls, source_url: str, dry_run: bool = False) -> 'RunContext':
+        """Builds a context seeded with the EventSource's stored fingerprints and link patterns, if any."""
+        from guana_know.agents.models import EventSource
+
+        previous, link_patterns = (
+            EventSource.objects.filter(url=source_url)
+            .values_list('content_fingerprints', 'link_patterns')
+            .first()
+        ) or (None, None)
+        return cls(source_url, dry_run=dry_run, previous_fingerprints=previous,
+                   link_patterns=link_patterns)
+
+    def page_unchanged(self, url: str, content: str) -> tuple[str, bool]:
+        """
+        Fingerprints a page and compares it with the previous run.
+
+        Returns (fingerprint, unchanged). Unchanged pages are counted as
+        skipped and their fingerprint is carried forward immediately; changed
+        pages must be confirmed with remember() once they were processed, so
+        a failed parse is retried on the next run.
+        """
+        fingerprint = content_fingerprint(content)
+        with self._lock:
+            unchanged = self.previous_fingerprints.get(url) == fingerprint
+            if unchanged:
+                self.pages_skipped += 1
+                self.fingerprints[url] = fingerprint
+        return fingerprint, unchanged
+
+    def remember(self, url: str, fingerprint: str) -> None:
+        with self._lock:
+            self.fingerprints[url] = fingerprint
+
+    def save_fingerprints(self) -> None:
+        """Stores this run's fingerprints on the EventSource. No-op on dry runs."""
+        from guana_know.agents.models import EventSource
+
+        if self.dry_run:
+            return
+        with self._lock:
+            fingerprints = dict(self.fingerprints)
+        EventSource.objects.filter(url=self.source_url).update(content_fingerprints=fingerprints)
+
+    def rank_links(self, urls: list[str]) -> list[str]:
+        """Puts links matching this source's learned detail-page patterns first."""
+        from agents.link_ranking import prefer_learned
+
+        return prefer_learned(urls, self.link_patterns)
+
+    def learn_event_page(self, url: str) -> None:
+        """Records that url (a detail page, not the listing) yielded events."""
+        from agents.link_ranking import path_pattern
+
+        pattern = path_pattern(url) if url and url != self.source_url else None
+        if pattern:
+            with self._lock:
+                self.learned_patterns[pattern] = self.learned_patterns.get(pattern, 0) + 1
+
+    def save_link_patterns(self) -> None:
+        """
+        Adds this run's learned patterns to the EventSource, keeping the
+        _MAX_LINK_PATTERNS with the most hits. No-op on dry runs.
+        """
+        from guana_know.agents.models import EventSource
+
+        with self._lock:
+            learned = dict(self.learned_patterns)
+        if self.dry_run or not learned:
+            return
+        patterns = dict(self.link_patterns)
+        for pattern, hits in learned.items():
+            patterns[pattern] = patterns.get(pattern, 0) + hits
+        patterns = dict(sorted(patterns.items(), key=lambda item: -item[1])[:_MAX_LINK_PATTERNS])
+        EventSource.objects.filter(url=self.source_url).update(link_patterns=patterns)
+
+    @property
+    def venues(self):
+        """The run's VenueResolver: the alias map is loaded once per run."""
+        from guana_know.venues.services import VenueResolver
+
+        with self._lock:
+            if self._venues is None:
+                self._venues = VenueResolver()
+            return self._venues
+
+    def store_page(self, result: dict) -> str:
+        """
+        Keeps a scrape_tool result for the rest of the run and returns a
+        handle (e.g. 'page-3') that tools can use to refer to it.
+        """
+        with self._lock:
+            handle = f'page-{len(self.pages) + 1}'
+            self.pages[handle] = result
+        return handle
+
+    def page(self, handle: str) -> dict | None:
+        with self._lock:
+            return self.pages.get(handle)
+
+    def add_candidates(self, candidates: list[dict]) -> None:
+        """Appends deduplicated candidates to the run's ledger."""
+        with self._lock:
+            self.candidates.extend(candidates)
+
+    def ledger_summary(self) -> dict:
+        """Builds the run summary from the ledger, in the shape _persist_candidates expects."""
+        with self._lock:
+            candidates = list(self.candidates)
+        summary = {
+            'candidates': candidates,
+            'scrape_status': self.listing_status if self.listing_status is not None else 200,
+            'total_found': len(candidates),
+            'total_duplicates': sum(1 for candidate in candidates if candidate.get('is_duplicate')),
+        }
+        if self.listing_error and not candidates:
+            summary['error'] = self.listing_error
+        return summary
+
+    def add_step(self, step: dict) -> None:
+        with self._lock:
+            self.steps.append(step)
+
+    def usage(self) -> dict:
+        """Aggregated LLM and HTTP usage for the steps recorded so far."""
+        with self._lock:
+            steps = list(self.steps)
+
+        llm_steps = [step for step in steps if step['kind'] == 'llm']
+        prompt_tokens = sum(step['prompt_tokens'] for step in llm_steps)
+        completion_tokens = sum(step['completion_tokens'] for step in llm_steps)
+        return {
+            'llm_calls': len(llm_steps),
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'estimated_cost': estimate_cost(prompt_tokens, completion_tokens),
+            'bytes_fetched': sum(step['bytes_fetched'] for step in steps if step['kind'] == 'fetch'),
+        }
+
+    def save_metrics(self, run_record) -> None:
+        """Writes usage totals onto run_record and stores the individual steps."""
+        from guana_know.agents.models import AgentRunStep
+
+        usage = self.usage()
+        for field, value in usage.items():
+            setattr(run_record, field, value)
+        run_record.save(update_fields=[*usage.keys(), 'updated_at'])
+
+        with self._lock:
+            steps = list(self.steps)
+        AgentRunStep.objects.bulk_create(
+            [AgentRunStep(run=run_record, **step) for step in steps],
+            batch_size=500,
+        )
+
+
+_current: ContextVar[RunContext | None] = ContextVar('agent_run_context', default=None)
+
+
+def current() -> RunContext | None:
+    return _current.get()
+
+
+@contextmanager
+def activate(ctx: RunContext):
+    """Makes ctx the current run for this thread/task while the block executes."""
+    token = _current.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _current.reset(token)
+
+
+def record_step(kind: str, name: str, target: str = '', started_at: datetime | None = None,
+                duration_ms: int = 0, prompt_tokens: int = 0, completion_tokens: int = 0,
+                bytes_fetched: int = 0, error: str = '') -> None:
+    """Records a step against the current run. No-op outside a run."""
+    ctx = current()
+    if ctx is None:
+        return
+    ctx.add_step({
+        'kind': kind,
+        'name': name[:50],
+        'target': (target or '')[:500],
+        'started_at': started_at or datetime.now(timezone.utc),
+        'duration_ms': int(duration_ms),
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': completion_tokens,
+        'bytes_fetched': bytes_fetched,
+        'error': (error or '')[:500],
+    })
+
+
+@contextmanager
+def timed_step(kind: str, name: str, target: str = ''):
+    """
+    Times the enclosed block and records it as a step. The yielded dict may
+    be filled with extra step fields (e.g. bytes_fetched) by the caller.
+    """
+    started_at = datetime.now(timezone.utc)
+    start = time.monotonic()
+    extra: dict = {}
+    try:
+        yield extra
+    except Exception as exc:
+        extra.setdefault('error', str(exc))
+        raise
+    finally:
+        record_step(kind, name, target, started_at=started_at,
+                    duration_ms=(time.monotonic() - start) * 1000, **extra)
+
+
+def estimate_cost(prompt_tokens: int, completion_tokens: int) -> Decimal:
+    """
+    Estimated USD cost. Defaults are gpt-4o-mini list prices; override with
+    AZURE_OPENAI_PROMPT_COST_PER_1K / AZURE_OPENAI_COMPLETION_COST_PER_1K.
+    """
+    prompt_rate = Decimal(os.environ.get('AZURE_OPENAI_PROMPT_COST_PER_1K', '0.00015'))
+    completion_rate = Decimal(os.environ.get('AZURE_OPENAI_COMPLETION_COST_PER_1K', '0.0006'))
+    cost = (prompt_rate * prompt_tokens + completion_rate * completion_tokens) / 1000
+    return cost.quantize(Decimal('0.000001'))
@@ -2,13 +2,23 @@
 dedup_tool — checks if an event already exists in the database.
 
 Queries PostgreSQL (via Django ORM) to detect duplicate events based on
-title + venue name + start datetime proximity.
+title + venue name + start datetime proximity. Titles are compared on
+Event.title_normalized (unaccented, lowercased) with pg_trgm similarity,
+served by the event_title_trgm GIN index, so small spelling and accent
+differences still match. On other databases only exact normalized titles match.
+
+dedup_many() checks a whole run's candidates with a single query over the
+union of their time windows and compares titles in memory with the same
+trigram similarity pg_trgm uses.
 
 Must be called from within the Django environment (DJANGO_SETTINGS_MODULE set).
 """
 
 import logging
+import os
+import re
 from datetime import timedelta
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +53,9 @@ TOOL_DEFINITION = {
 
 _DATETIME_TOLERANCE_HOURS = 3
 
+# Minimum pg_trgm similarity (0–1) between normalized titles to count as the same event.
+_MIN_TITLE_SIMILARITY = float(os.environ.get('DEDUP_MIN_TITLE_SIMILARITY', '0.6'))
+
 
 def run(title: str, venue_name: str | None = None, start_datetime: str | None = None) -> dict:
     """
@@ -56,35 +69,190 @@ def run(title: str, venue_name: str | None = None, start_datetime: str | None =
     Returns:
         A dict with 'is_duplicate' (bool) and optionally 'existing_event_id' (str).
     """
+    from django.db import connection
     from django.db.models import Q
+    from guana_know.common.text import normalize_name
     from guana_know.events.models import Event
 
-    title_normalized = title.strip().lower()
+    title_normalized = normalize_name(title)
+    if not title_normalized:
+        return {'is_duplicate': False, 'existing_event_id': None}
 
-    qs = Event.objects.filter(title__iexact=title_normalized)
+    qs = Event.objects.all()
 
-    if not qs.exists():
-        qs = Event.objects.filter(title__icontains=title_normalized[:40])
+    venue_normalized = normalize_name(venue_name)
+    if venue_normalized:
+        # VenueAlias also knows merged/variant names of the venue. A venue
+        # whose normalized name is already another venue's alias has no alias
+        # of its own, so its name is matched directly as well.
+        qs = qs.filter(
+            Q(venue__aliases__normalized_name=venue_normalized)
+            | Q(venue__name__iexact=venue_name.strip())
+        )
 
-    if venue_name:
-        qs = qs.filter(venue__name__iexact=venue_name.strip())
+    dt = _parse_aware(start_datetime)
+    if dt:
+        tolerance = timedelta(hours=_DATETIME_TOLERANCE_HOURS)
+        qs = qs.filter(
+            start_datetime__gte=dt - tolerance,
+            start_datetime__lte=dt + tolerance,
+        )
 
-    if start_datetime:
-        from django.utils.dateparse import parse_datetime
-        from django.utils import timezone
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import TrigramSimilarity
 
-        dt = parse_datetime(start_datetime)
-        if dt:
-            if timezone.is_naive(dt):
-                dt = timezone.make_aware(dt)
-            tolerance = timedelta(hours=_DATETIME_TOLERANCE_HOURS)
-            qs = qs.filter(
-                start_datetime__gte=dt - tolerance,
-                start_datetime__lte=dt + tolerance,
-            )
+        # The % operator lets Postgres use the GIN index; the explicit
+        # threshold then applies our stricter cut-off and ranks matches.
+        qs = (
+            qs.filter(title_normalized__trigram_similar=title_normalized)
+            .annotate(similarity=TrigramSimilarity('title_normalized', title_normalized))
+            .filter(similarity__gte=_MIN_TITLE_SIMILARITY)
+            .order_by('-similarity')
+        )
+    else:
+        qs = qs.filter(title_normalized=title_normalized)
 
-    existing = qs.first()
+    existing = qs.only('id').first()
     if existing:
         return {'is_duplicate': True, 'existing_event_id': str(existing.id)}
 
     return {'is_duplicate': False, 'existing_event_id': None}
+
+
+def dedup_many(candidates: list[dict]) -> list[dict]:
+    """
+    Checks many candidates at once.
+
+    Args:
+        candidates: dicts with 'title' and optional 'venue_name' and
+            'start_datetime' (ISO 8601 string), as accepted by run().
+
+    Returns:
+        One {'is_duplicate', 'existing_event_id'} dict per candidate, in order.
+    """
+    from guana_know.common.text import normalize_name
+
+    prepared = []
+    for candidate in candidates:
+        title = normalize_name(candidate.get('title'))
+        venue = normalize_name(candidate.get('venue_name'))
+        prepared.append((title, venue, _parse_aware(candidate.get('start_datetime'))))
+
+    existing = _fetch_existing(prepared)
+    aliases = _venue_aliases({venue for _, venue, _ in prepared if venue})
+    tolerance = timedelta(hours=_DATETIME_TOLERANCE_HOURS)
+
+    results = []
+    for title, venue, start in prepared:
+        best_id, best_score = None, 0.0
+        if title:
+            for event in existing:
+                if venue and not _same_venue(venue, event, aliases):
+                    continue
+                if start and abs(event['start_datetime'] - start) > tolerance:
+                    continue
+                score = trigram_similarity(title, event['title_normalized'])
+                if score >= _MIN_TITLE_SIMILARITY and score > best_score:
+                    best_id, best_score = event['id'], score
+        results.append({
+            'is_duplicate': best_id is not None,
+            'existing_event_id': str(best_id) if best_id else None,
+        })
+    return results
+
+
+def _fetch_existing(prepared: list[tuple]) -> list[dict]:
+    """
+    Loads the events any candidate could match in one query: everything in
+    the (merged) tolerance windows around dated candidates, plus title
+    matches for undated ones.
+    """
+    from django.db import connection
+    from django.db.models import Q
+    from guana_know.common.text import normalize_name
+    from guana_know.events.models import Event
+
+    tolerance = timedelta(hours=_DATETIME_TOLERANCE_HOURS)
+    windows = sorted((start - tolerance, start + tolerance) for title, _, start in prepared if title and start)
+    merged: list[list] = []
+    for low, high in windows:
+        if merged and low <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], high)
+        else:
+            merged.append([low, high])
+
+    query = Q()
+    for low, high in merged:
+        query |= Q(start_datetime__gte=low, start_datetime__lte=high)
+
+    undated = {title for title, _, start in prepared if title and not start}
+    if undated:
+        query |= Q(title_normalized__in=undated)
+        if connection.vendor == 'postgresql':
+            for title in undated:
+                query |= Q(title_normalized__trigram_similar=title)
+
+    if not query:
+        return []
+    events = list(
+        Event.objects.filter(query)
+        .values('id', 'title_normalized', 'start_datetime', 'venue_id', 'venue__name')
+    )
+    for event in events:
+        event['venue_normalized'] = normalize_name(event['venue__name'])
+    return events
+
+
+def _venue_aliases(venues: set[str]) -> dict:
+    """Maps the candidates' normalized venue names to venue ids through VenueAlias."""
+    from guana_know.venues.models import VenueAlias
+
+    if not venues:
+        return {}
+    return dict(
+        VenueAlias.objects.filter(normalized_name__in=venues)
+        .values_list('normalized_name', 'venue_id')
+    )
+
+
+def _same_venue(venue: str, event: dict, aliases: dict) -> bool:
+    """
+    Whether the candidate's normalized venue name resolves to the event's
+    venue: through an alias, or by the venue's own name as run() does.
+    """
+    if event['venue_id'] is None:
+        return False
+    return aliases.get(venue) == event['venue_id'] or event['venue_normalized'] == venue
+
+
+def _parse_aware(value):
+    from django.utils import timezone
+    from django.utils.dateparse import parse_datetime
+
+    if not value:
+        return None
+    dt = parse_datetime(str(value))
+    if dt and timezone.is_naive(dt):
+        dt = timezone.make_aware(dt)
+    return dt
+
+
+_WORD_RE = re.compile(r'[^\W_]+')
+
+
+@lru_cache(maxsize=4096)
+def _trigrams(text: str) -> frozenset:
+    # Mirrors pg_trgm: each word is padded with two leading and one trailing space.
+    grams = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def trigram_similarity(a: str, b: str) -> float:
+    """Same result as pg_trgm's similarity(a, b)."""
+    grams_a, grams_b = _trigrams(a or ''), _trigrams(b or '')
+    if not grams_a or not grams_b:
+        return 0.0
+    return len(grams_a & grams_b) / len(grams_a | grams_b)
@@ -4,16 +4,63 @@ parse_tool — extracts structured event data from raw scraped text.
 Calls the Azure OpenAI API directly (not via the orchestrator loop) to extract
 a list of candidate events. Each candidate includes a confidence score and
 a list of issues (e.g. missing_date, venue_unresolved).
+
+run_batch() packs several pages into one completion (up to a token budget)
+to save requests against the Azure quota, falling back to one call per page
+when a batch fails.
+
+Successful results are memoized on disk, keyed by the content hash, source
+type, image URL, a hash of _SYSTEM_PROMPT and _BATCH_INSTRUCTIONS and the
+model deployment, so editing either prompt or switching deployments
+invalidates old entries.
+Because the model resolves dates relative to "today", the key also carries
+a date scope. Only text whose dates name their month or year ("24 de
+octubre", "24/10", "2026") is keyed by the current month, which fixes the
+year those dates resolve to. Text with relative expressions ("hoy", "este
+viernes", "próximo sábado") or with bare days ("viernes 24") is keyed by
+the current day.
 """
 
+import hashlib
 import json
 import logging
 import os
+import re
+from datetime import date
 
-from openai import AzureOpenAI
+from agents import llm
+from agents.cache import FileCache
 
 logger = logging.getLogger(__name__)
 
+_CACHE_TTL_SECONDS = float(os.environ.get('PARSE_CACHE_TTL_HOURS', '168')) * 3600
+_CACHE_MAX_ENTRIES = int(os.environ.get('PARSE_CACHE_MAX_ENTRIES', '5000'))
+
+_parse_cache = FileCache('parse', ttl_seconds=_CACHE_TTL_SECONDS, max_entries=_CACHE_MAX_ENTRIES)
+
+# Batch packing limits. Tokens are estimated at ~4 characters each.
+_BATCH_TOKEN_BUDGET = int(os.environ.get('PARSE_BATCH_TOKEN_BUDGET', '12000'))
+_BATCH_MAX_PAGES = int(os.environ.get('PARSE_BATCH_MAX_PAGES', '5'))
+_CHARS_PER_TOKEN = 4
+
+_RELATIVE_DATE_RE = re.compile(
+    # "mañana" also means "morning" ("10 de la mañana"), which is not relative.
+    r'\b(hoy|(?<!la )mañana|(?<!la )manana|esta noche|esta semana|fin de semana|'
+    r'(este|esta|próximo|proximo|próxima|proxima|siguiente)\s+'
+    r'(lunes|martes|miércoles|miercoles|jueves|viernes|sábado|sabado|domingo|semana|mes))\b',
+    re.IGNORECASE,
+)
+
+# Dates that carry their own month or year.
+_EXPLICIT_DATE_RE = re.compile(
+    r'\b(enero|febrero|marzo|abril|mayo|junio|julio|agosto|septiembre|setiembre|octubre|'
+    r'noviembre|diciembre|january|february|march|april|june|july|august|september|'
+    r'october|november|december)\b'
+    r'|\b\d{1,2}[/.-]\d{1,2}\b'
+    r'|\b(19|20)\d\d\b',
+    re.IGNORECASE,
+)
+
 TOOL_DEFINITION = {
     'type': 'function',
     'function': {
@@ -87,6 +134,47 @@ Return ONLY a JSON object with this exact structure:
 Do not include any text outside the JSON object.
 """
 
+_BATCH_INSTRUCTIONS = """
+BATCH MODE — this overrides the response structure above.
+The input contains several pages, each starting with a line "=== PAGE <n> ===".
+Apply every rule above to each page independently (a page's image URL only
+applies to events from that page) and return ONLY:
+{
+  "pages": [
+    {"page": 1, "source_url": "the page's Source URL", "events": [ ...event objects as above... ]}
+  ]
+}
+Include one entry per input page, in input order, even when its events list is empty.
+"""
+
+
+def _date_scope(content: str, today: date) -> str:
+    """Returns the part of "today" that the parse result of content depends on."""
+    content = content or ''
+    if _RELATIVE_DATE_RE.search(content) or not _EXPLICIT_DATE_RE.search(content):
+        return today.isoformat()
+    return today.strftime('%Y-%m')
+
+
+# Bump when the post-processing of cached results changes, so entries
+# written by an older version are not served.
+_RESULT_VERSION = '2'
+
+
+def _cache_key(content: str, source_type: str, image_url: str | None, today: date) -> str:
+    # Single and batch parses share entries, so both prompts are part of the key.
+    prompt_hash = hashlib.sha256((_SYSTEM_PROMPT + _BATCH_INSTRUCTIONS).encode('utf-8')).hexdigest()[:16]
+    content_hash = hashlib.sha256((content or '').encode('utf-8')).hexdigest()
+    return '|'.join([
+        _RESULT_VERSION, content_hash, source_type or '', image_url or '',
+        prompt_hash, llm.deployment(), _date_scope(content, today),
+    ])
+
+
+def cache_stats() -> dict:
+    """Process-wide parse cache counters: {'hits': int, 'misses': int}."""
+    return _parse_cache.stats()
+
 
 def run(content: str, source_url: str, source_type: str,
         image_url: str | None = None) -> dict:
@@ -104,27 +192,20 @@ def run(content: str, source_url: str, source_type: str,
     if not os.environ.get('AZURE_OPENAI_API_KEY'):
         return {'events': [], 'error': 'AZURE_OPENAI_API_KEY not set'}
 
-    client = AzureOpenAI(
-        api_key=os.environ['AZURE_OPENAI_API_KEY'],
-        azure_endpoint=os.environ['AZURE_OPENAI_ENDPOINT'],
-        api_version=os.environ.get('AZURE_OPENAI_API_VERSION', '2025-01-01-preview'),
-    )
-
-    from datetime import date
-    today = date.today().isoformat()
+    today = date.today()
+    cache_key = _cache_key(content, source_type, image_url, today)
+    cached = _parse_cache.get(cache_key)
+    if cached is not None:
+        logger.info('parse_tool: cache hit for %s', source_url)
+        return cached
 
-    user_message = (
-        f'Today is {today}.\n'
-        f'Source URL: {source_url}\n'
-        f'Source type: {source_type}\n'
+    user_message = f'Today is {today.isoformat()}.\n' + _page_message(
+        content, source_url, source_type, image_url,
     )
-    if image_url:
-        user_message += f'Page image URL: {image_url}\n'
-    user_message += f'\nContent:\n{content}'
 
     try:
-        response = client.chat.completions.create(
-            model=os.environ.get('AZURE_OPENAI_DEPLOYMENT', 'gpt-4o-mini'),
+        response = llm.complete(
+            'parse_tool',
             max_tokens=8192,
             messages=[
                 {'role': 'system', 'content': _SYSTEM_PROMPT},
@@ -146,12 +227,128 @@ def run(content: str, source_url: str, source_type: str,
     if 'events' not in data or not isinstance(data['events'], list):
         return {'events': [], 'error': 'unexpected response structure', 'raw': raw[:500]}
 
-    # Truncate descriptions so the orchestrator's final JSON stays within
-    # the model's output token limit when many events are found.
-    _MAX_DESCRIPTION_CHARS = 800
-    for event in data['events']:
-        desc = event.get('description')
-        if desc and len(desc) > _MAX_DESCRIPTION_CHARS:
-            event['description'] = desc[:_MAX_DESCRIPTION_CHARS].rstrip() + '…'
+    result = {'events': data['events']}
+    _parse_cache.set(cache_key, result)
+    return result
+
+
+def run_batch(pages: list[dict], source_type: str) -> list[dict]:
+    """
+    Parses several pages, packing them into as few LLM requests as possible.
+
+    Args:
+        pages: dicts with 'content', 'source_url' and optional 'image_url'.
+        source_type: Type of source shared by all pages.
 
-    return {'events': data['events']}
+    Returns:
+        One result per input page, in input order, each shaped like run().
+    """
+    if not os.environ.get('AZURE_OPENAI_API_KEY'):
+        return [{'events': [], 'error': 'AZURE_OPENAI_API_KEY not set'} for _ in pages]
+
+    today = date.today()
+    results: list[dict | None] = [None] * len(pages)
+    keys = [
+        _cache_key(page['content'], source_type, page.get('image_url'), today)
+        for page in pages
+    ]
+
+    pending = []
+    for index, key in enumerate(keys):
+        cached = _parse_cache.get(key)
+        if cached is not None:
+            results[index] = cached
+        else:
+            pending.append(index)
+
+    for batch in _pack_batches(pending, pages):
+        if len(batch) == 1:
+            index = batch[0]
+            page = pages[index]
+            results[index] = run(page['content'], page['source_url'], source_type, page.get('image_url'))
+            continue
+
+        batch_results = _run_batch_request([pages[i] for i in batch], source_type, today)
+        for index, result in zip(batch, batch_results):
+            page = pages[index]
+            if result is None:
+                logger.info('parse_tool: batch fallback to single call for %s', page['source_url'])
+                result = run(page['content'], page['source_url'], source_type, page.get('image_url'))
+            else:
+                _parse_cache.set(keys[index], result)
+            results[index] = result
+
+    return results
+
+
+def _pack_batches(indexes: list[int], pages: list[dict]) -> list[list[int]]:
+    """Groups page indexes into batches within the token budget and page cap."""
+    batches: list[list[int]] = []
+    current: list[int] = []
+    current_tokens = 0
+
+    for index in indexes:
+        tokens = len(pages[index]['content']) // _CHARS_PER_TOKEN + 50
+        if current and (current_tokens + tokens > _BATCH_TOKEN_BUDGET or len(current) >= _BATCH_MAX_PAGES):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _run_batch_request(pages: list[dict], source_type: str, today: date) -> list[dict | None]:
+    """
+    Sends one completion for a batch of pages. Returns one result per page,
+    or None for pages the response did not cover (the caller retries those
+    individually). A failed request returns None for every page.
+    """
+    user_message = f'Today is {today.isoformat()}.\n'
+    for number, page in enumerate(pages, 1):
+        user_message += f'\n=== PAGE {number} ===\n' + _page_message(
+            page['content'], page['source_url'], source_type, page.get('image_url'),
+        )
+
+    try:
+        response = llm.complete(
+            'parse_tool_batch',
+            max_tokens=8192,
+            messages=[
+                {'role': 'system', 'content': _SYSTEM_PROMPT + _BATCH_INSTRUCTIONS},
+                {'role': 'user', 'content': user_message},
+            ],
+        )
+        data = json.loads((response.choices[0].message.content or '').strip())
+        entries = data['pages']
+    except Exception as exc:
+        logger.warning('parse_tool: batch of %d pages failed (%s), falling back to single calls',
+                       len(pages), exc)
+        return [None] * len(pages)
+
+    by_number = {}
+    if isinstance(entries, list):
+        for entry in entries:
+            if isinstance(entry, dict) and isinstance(entry.get('events'), list):
+                by_number[entry.get('page')] = entry
+
+    results: list[dict | None] = []
+    for number, page in enumerate(pages, 1):
+        entry = by_number.get(number)
+        if entry is None or entry.get('source_url') not in (None, page['source_url']):
+            results.append(None)
+        else:
+            results.append({'events': entry['events']})
+    return results
+
+
+def _page_message(content: str, source_url: str, source_type: str, image_url: str | None) -> str:
+    message = (
+        f'Source URL: {source_url}\n'
+        f'Source type: {source_type}\n'
+    )
+    if image_url:
+        message += f'Page image URL: {image_url}\n'
+    return message + f'\nContent:\n{content}'
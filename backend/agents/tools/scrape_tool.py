@@ -3,14 +3,29 @@ scrape_tool — fetches raw HTML/text content from a URL.
 
 Returns the visible text extracted from the page, suitable for event parsing.
 Handles timeouts and HTTP errors gracefully.
+
+Generic fetches are revalidated with conditional GETs: the ETag/Last-Modified
+and the extracted result of each page are kept in an on-disk cache, and a
+304 Not Modified returns the cached extraction without re-parsing the HTML.
+Entries expire after SCRAPE_CACHE_TTL_HOURS (default 30 days) and at most
+SCRAPE_CACHE_MAX_ENTRIES (default 5000) are kept, least recently used first out.
+
+Bodies are streamed and decoded incrementally, and reading stops after
+SCRAPE_MAX_BYTES (default 2 MB), so memory per scrape stays bounded however
+large the page is. Responses that are not text (images, PDFs, archives) are
+abandoned as soon as their headers arrive.
 """
 
+import codecs
 import logging
+import os
 from datetime import datetime, timezone
 from urllib.parse import urlparse
 
 import httpx
-from bs4 import BeautifulSoup
+from agents import html_extract, http_client, link_ranking
+from agents.run_context import timed_step
+from agents.cache import FileCache
 
 logger = logging.getLogger(__name__)
 
@@ -46,18 +61,26 @@ TOOL_DEFINITION = {
 
 _TIMEOUT_SECONDS = 15
 _MAX_CONTENT_CHARS = 20_000
+_MAX_BYTES = int(os.environ.get('SCRAPE_MAX_BYTES', str(2 * 1024 * 1024)))
+
+# Content types whose body is worth reading. A missing Content-Type is read too.
+_TEXT_CONTENT_TYPES = ('text/', 'application/xhtml+xml', 'application/xml',
+                       'application/json', 'application/ld+json')
 _ALLOWED_SCHEMES = {'http', 'https'}
 
 _HEADERS = {
-    'User-Agent': (
-        'Mozilla/5.0 (compatible; GuanaKnowBot/1.0; '
-        '+https://guanaknow.mx/bot)'
-    ),
+    'User-Agent': http_client.USER_AGENT,
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
     'Accept-Language': 'es-MX,es;q=0.9,en;q=0.8',
 }
 
 
+_CACHE_TTL_SECONDS = float(os.environ.get('SCRAPE_CACHE_TTL_HOURS', '720')) * 3600
+_CACHE_MAX_ENTRIES = int(os.environ.get('SCRAPE_CACHE_MAX_ENTRIES', '5000'))
+
+_http_cache = FileCache('http', ttl_seconds=_CACHE_TTL_SECONDS, max_entries=_CACHE_MAX_ENTRIES)
+
+
 def _validate_url(url: str) -> None:
     parsed = urlparse(url)
     if parsed.scheme not in _ALLOWED_SCHEMES:
@@ -66,133 +89,201 @@ def _validate_url(url: str) -> None:
         raise ValueError('URL must include a host.')
 
 
-_EXCLUDE_IMAGE_KEYWORDS = ('logo', 'icon', 'avatar', 'banner', '/ads/', 'adtech', 'adserver', 'pixel', 'tracker', 'sprite')
+def _scrape_generic(url: str) -> dict:
+    """Fetches a URL using standard HTTP and returns its visible text content."""
+    try:
+        _validate_url(url)
+    except ValueError as exc:
+        return _error_result(str(exc), url=url)
 
-_EVENT_LINK_MAX = 10
+    cached = _http_cache.get(url)
+    fetched = _fetch(url, {**_HEADERS, **_conditional_headers(cached)})
+    if isinstance(fetched, dict):
+        return fetched
+    response, body = fetched
+    return _cached_page_result(url, response, body, cached)
 
 
-def _extract_event_links(soup, base_url: str) -> list[str]:
+def _fetch(url: str, headers: dict) -> 'tuple[httpx.Response, _BodyReader] | dict':
     """
-    Extracts all internal links that look like event detail pages.
-    Filters out navigation, external, and non-event links.
+    Streams a GET of url as a recorded fetch step. Returns (response, body),
+    or an error result when the request itself failed.
     """
-    from urllib.parse import urljoin, urlparse
-
-    base_domain = urlparse(base_url).netloc
-    links: list[str] = []
-
-    for a in soup.find_all('a', href=True):
-        href = a['href']
-        full_url = urljoin(base_url, href)
-        parsed = urlparse(full_url)
-
-        # Only same-domain links
-        if parsed.netloc != base_domain:
-            continue
+    with timed_step('fetch', 'scrape', url) as step:
+        try:
+            with http_client.stream('GET', url, headers=headers, timeout=_TIMEOUT_SECONDS) as response:
+                body = _BodyReader(response)
+                if body.wanted:
+                    for chunk in response.iter_bytes():
+                        if not body.feed(chunk):
+                            break
+        except httpx.TimeoutException:
+            logger.warning('scrape_tool: timeout fetching %s', url)
+            step['error'] = 'timeout'
+            return _error_result('timeout', url=url)
+        except httpx.RequestError as exc:
+            logger.warning('scrape_tool: request error for %s: %s', url, exc)
+            step['error'] = str(exc)
+            return _error_result(str(exc), url=url)
+        _account_response(step, response, body)
+    return response, body
+
+
+async def scrape_async(client: httpx.AsyncClient, url: str) -> dict:
+    """
+    Async counterpart of _scrape_generic for fan-out crawling.
 
-        # FIX 1: skip fragments (#main-content, etc)
-        # parsed.fragment captures what comes after #
-        if parsed.fragment:
-            continue
+    Uses the caller's AsyncClient so many detail pages share one connection
+    pool. Returns the same dict shape as run(url).
+    """
+    try:
+        _validate_url(url)
+    except ValueError as exc:
+        return _error_result(str(exc), url=url)
 
-        # Skip anchors, static files, admin, auth
-        if any(skip in parsed.path for skip in (
-            '#', '.css', '.js', '.png', '.jpg',
-            '/admin', '/login', '/static',
-        )):
-            continue
+    cached = _http_cache.get(url)
+    with timed_step('fetch', 'scrape', url) as step:
+        try:
+            async with client.stream('GET', url, headers=_conditional_headers(cached)) as response:
+                body = _BodyReader(response)
+                if body.wanted:
+                    async for chunk in response.aiter_bytes():
+                        if not body.feed(chunk):
+                            break
+        except httpx.TimeoutException:
+            logger.warning('scrape_tool: timeout fetching %s', url)
+            step['error'] = 'timeout'
+            return _error_result('timeout', url=url)
+        except httpx.RequestError as exc:
+            logger.warning('scrape_tool: request error for %s: %s', url, exc)
+            step['error'] = str(exc)
+            return _error_result(str(exc), url=url)
+        _account_response(step, response, body)
+
+    return _cached_page_result(url, response, body, cached)
+
+
+class _BodyReader:
+    """
+    Decodes a streamed response body incrementally, up to _MAX_BYTES.
 
-        # Skip the index page itself
-        if full_url.rstrip('/') == base_url.rstrip('/'):
-            continue
+    wanted is False when the body should not be read at all: error and 304
+    responses, and content types that are not text.
+    """
 
-        if full_url not in links:
-            links.append(full_url)
+    def __init__(self, response: httpx.Response):
+        self.content_type = response.headers.get('content-type', '')
+        self.unsupported = bool(self.content_type) and not any(
+            self.content_type.lower().startswith(prefix) for prefix in _TEXT_CONTENT_TYPES
+        )
+        self.wanted = response.status_code < 300 and not self.unsupported
+        self.bytes_read = 0
+        self.truncated = False
+        self._parts: list[str] = []
+        try:
+            decoder = codecs.getincrementaldecoder(response.charset_encoding or 'utf-8')
+        except LookupError:
+            decoder = codecs.getincrementaldecoder('utf-8')
+        self._decoder = decoder(errors='replace')
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Decodes chunk; returns False once data beyond the byte cap arrived.
+        A body of exactly _MAX_BYTES is read whole and not truncated.
+        """
+        remaining = _MAX_BYTES - self.bytes_read
+        if len(chunk) > remaining:
+            chunk = chunk[:remaining]
+            self.truncated = True
+        self.bytes_read += len(chunk)
+        self._parts.append(self._decoder.decode(chunk))
+        return not self.truncated
+
+    @property
+    def text(self) -> str:
+        return ''.join(self._parts) + self._decoder.decode(b'', final=True)
+
+
+def _account_response(step: dict, response: httpx.Response, body: '_BodyReader | None' = None) -> None:
+    """Fills a fetch step with the body size and any HTTP error status."""
+    step['bytes_fetched'] = body.bytes_read if body is not None else len(response.content)
+    if response.status_code >= 400:
+        step['error'] = f'HTTP {response.status_code}'
 
-    return links
 
+def _conditional_headers(cached: dict | None) -> dict:
+    """Builds If-None-Match / If-Modified-Since headers from a cache entry."""
+    headers = {}
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+    return headers
 
-def _extract_image_url(soup, base_url: str) -> str | None:
-    """Returns the most relevant event image URL from a parsed page."""
-    from urllib.parse import urljoin
 
-    # Priority 1: og:image
-    og = soup.find('meta', property='og:image')
-    if og and og.get('content'):
-        return og['content']
+def _cached_page_result(url: str, response: httpx.Response, body: _BodyReader, cached: dict | None) -> dict:
+    """
+    Returns the cached extraction on 304 Not Modified; otherwise builds a
+    fresh result and stores it when the server sent validators.
+    """
+    if response.status_code == 304 and cached:
+        logger.info('scrape_tool: 304 Not Modified for %s, using cached extraction', url)
+        result = dict(cached['result'])
+        result['fetched_at'] = _now_iso()
+        result['from_cache'] = True
+        return result
 
-    # Priority 2: twitter:image
-    tw = soup.find('meta', attrs={'name': 'twitter:image'})
-    if tw and tw.get('content'):
-        return tw['content']
+    result = _page_result(url, response, body)
 
-    # Priority 3: first content image — search semantic containers first,
-    # then content-like divs. Both sets are checked; using 'or' here would
-    # silently skip the div search if <main>/<article> tags exist but carry
-    # no images (e.g. Drupal sites that wrap content in custom divs).
-    semantic_areas = soup.find_all(['main', 'article'])
-    content_divs = soup.find_all(
-        'div',
-        class_=lambda c: c and any(k in c.lower() for k in ('content', 'event', 'body')),
-    )
-    for area in [*semantic_areas, *content_divs]:
-        for img in area.find_all('img', src=True):
-            src = img['src']
-            if not any(kw in src.lower() for kw in _EXCLUDE_IMAGE_KEYWORDS):
-                return urljoin(base_url, src)
-
-    # Priority 4: any img tag on the page that looks like a content image
-    for img in soup.find_all('img', src=True):
-        src = img['src']
-        if any(kw in src.lower() for kw in _EXCLUDE_IMAGE_KEYWORDS):
-            continue
-        # Must have an image-like extension or be under a known media path
-        lower_src = src.lower()
-        if any(lower_src.endswith(ext) for ext in ('.jpg', '.jpeg', '.png', '.webp', '.gif')):
-            return urljoin(base_url, src)
+    etag = response.headers.get('etag')
+    last_modified = response.headers.get('last-modified')
+    if not result.get('error') and (etag or last_modified):
+        _http_cache.set(url, {
+            'etag': etag,
+            'last_modified': last_modified,
+            'result': result,
+        })
 
-    return None
+    return result
 
 
-def _scrape_generic(url: str) -> dict:
-    """Fetches a URL using standard HTTP and returns its visible text content."""
-    try:
-        _validate_url(url)
-    except ValueError as exc:
-        return {'content': '', 'fetched_at': _now_iso(), 'status_code': 0, 'error': str(exc), 'event_links': []}
+def _error_result(error: str, status_code: int = 0, url: str | None = None) -> dict:
+    result = {
+        'content': '',
+        'fetched_at': _now_iso(),
+        'status_code': status_code,
+        'error': error,
+        'event_links': [],
+    }
+    if url:
+        result['url'] = url
+    return result
 
-    try:
-        with httpx.Client(follow_redirects=True, timeout=_TIMEOUT_SECONDS, headers=_HEADERS) as client:
-            response = client.get(url)
-    except httpx.TimeoutException:
-        logger.warning('scrape_tool: timeout fetching %s', url)
-        return {'content': '', 'fetched_at': _now_iso(), 'status_code': 0, 'error': 'timeout', 'event_links': []}
-    except httpx.RequestError as exc:
-        logger.warning('scrape_tool: request error for %s: %s', url, exc)
-        return {'content': '', 'fetched_at': _now_iso(), 'status_code': 0, 'error': str(exc), 'event_links': []}
 
+def _page_result(url: str, response: httpx.Response, body: _BodyReader) -> dict:
+    """Builds the scrape result (text, image, event links) from an HTTP response."""
     if response.status_code >= 400:
         logger.warning('scrape_tool: HTTP %d for %s', response.status_code, url)
-        return {
-            'content': '',
-            'fetched_at': _now_iso(),
-            'status_code': response.status_code,
-            'error': f'HTTP {response.status_code}',
-            'event_links': [],
-        }
+        return _error_result(f'HTTP {response.status_code}', response.status_code, url=url)
+
+    if body.unsupported:
+        logger.info('scrape_tool: skipping %s — unsupported content type %s', url, body.content_type)
+        return _error_result(
+            f'Unsupported content type: {body.content_type.split(";")[0].strip()}',
+            response.status_code, url=url,
+        )
+
+    if body.truncated:
+        logger.warning('scrape_tool: %s exceeded %d bytes, body truncated', url, _MAX_BYTES)
 
-    content_type = response.headers.get('content-type', '')
     image_url = None
     event_links: list[str] = []
-    if 'html' in content_type:
-        soup = BeautifulSoup(response.text, 'html.parser')
-        for tag in soup(['script', 'style', 'nav', 'footer', 'header']):
-            tag.decompose()
-        text = soup.get_text(separator='\n', strip=True)
-        image_url = _extract_image_url(soup, url)
-        event_links = _extract_event_links(soup, url)
+    if 'html' in body.content_type:
+        text, image_url, links = html_extract.extract(body.text, url)
+        event_links = link_ranking.rank_links(links)
     else:
-        text = response.text
+        text = body.text
 
     text = text[:_MAX_CONTENT_CHARS]
 
@@ -201,12 +292,64 @@ def _scrape_generic(url: str) -> dict:
         'fetched_at': _now_iso(),
         'status_code': response.status_code,
         'url': url,
-        'truncated': len(text) >= _MAX_CONTENT_CHARS,
+        'truncated': body.truncated or len(text) >= _MAX_CONTENT_CHARS,
+        'bytes_truncated': body.truncated,
+        'bytes_read': body.bytes_read,
         'image_url': image_url,
         'event_links': event_links,
     }
 
 
+def _scrape_json_ld(url: str) -> dict:
+    """
+    Fetches a page and returns its schema.org Event JSON-LD objects as
+    structured_events, for the orchestrator to map without an LLM call.
+    When the page has none, event_links holds its ranked candidate links.
+    """
+    try:
+        _validate_url(url)
+    except ValueError as exc:
+        return {**_error_result(str(exc), url=url), 'strategy': 'json_ld'}
+
+    fetched = _fetch(url, _HEADERS)
+    if isinstance(fetched, dict):
+        return {**fetched, 'strategy': 'json_ld'}
+    response, body = fetched
+
+    if response.status_code >= 400:
+        logger.warning('scrape_tool [json_ld]: HTTP %d for %s', response.status_code, url)
+        return {**_error_result(f'HTTP {response.status_code}', response.status_code, url=url),
+                'strategy': 'json_ld'}
+    if body.unsupported:
+        return {**_error_result(f'Unsupported content type: {body.content_type.split(";")[0].strip()}',
+                                response.status_code, url=url),
+                'strategy': 'json_ld'}
+    if body.truncated:
+        logger.warning('scrape_tool [json_ld]: %s exceeded %d bytes, body truncated', url, _MAX_BYTES)
+
+    html = body.text
+    structured_events = html_extract.json_ld_events(html)
+    logger.info('scrape_tool [json_ld]: found %d events on %s', len(structured_events), url)
+
+    # Listings whose CMS only marks up detail pages: hand back the ranked
+    # event links so the caller can look for the events there.
+    event_links: list[str] = []
+    if not structured_events and 'html' in body.content_type:
+        event_links = link_ranking.rank_links(html_extract.extract(html, url).links)
+
+    return {
+        'content': '',
+        'fetched_at': _now_iso(),
+        'structured_events': structured_events,
+        'event_links': event_links,
+        'status_code': response.status_code,
+        'url': url,
+        'bytes_truncated': body.truncated,
+        'bytes_read': body.bytes_read,
+        'strategy': 'json_ld',
+    }
+
+
 _APIFY_POLL_INTERVAL = 10  # seconds between status checks
 _APIFY_MAX_POLLS = 18      # 3 minutes max
 
@@ -235,12 +378,12 @@ def _scrape_apify_facebook(url: str) -> dict:
     logger.info('scrape_tool [apify_facebook]: starting actor %s for %s', actor_id, url)
 
     try:
-        with httpx.Client(timeout=30) as client:
-            run_resp = client.post(
-                f'https://api.apify.com/v2/acts/{actor_id}/runs',
-                params={'token': apify_token},
-                json={'startUrls': [url]},
-            )
+        run_resp = http_client.request(
+            'POST', f'https://api.apify.com/v2/acts/{actor_id}/runs',
+            params={'token': apify_token},
+            json={'startUrls': [url]},
+            timeout=30,
+        )
     except httpx.RequestError as exc:
         logger.warning('scrape_tool [apify_facebook]: request error starting run — %s', exc)
         return {
@@ -276,11 +419,11 @@ def _scrape_apify_facebook(url: str) -> dict:
     for _ in range(_APIFY_MAX_POLLS):
         time.sleep(_APIFY_POLL_INTERVAL)
         try:
-            with httpx.Client(timeout=15) as client:
-                status_resp = client.get(
-                    f'https://api.apify.com/v2/actor-runs/{run_id}',
-                    params={'token': apify_token},
-                )
+            status_resp = http_client.request(
+                'GET', f'https://api.apify.com/v2/actor-runs/{run_id}',
+                params={'token': apify_token},
+                timeout=15,
+            )
             final_status = status_resp.json().get('data', {}).get('status', '')
         except httpx.RequestError:
             continue
@@ -302,11 +445,13 @@ def _scrape_apify_facebook(url: str) -> dict:
 
     # Fetch dataset items
     try:
-        with httpx.Client(timeout=30) as client:
-            items_resp = client.get(
-                f'https://api.apify.com/v2/datasets/{dataset_id}/items',
+        with timed_step('fetch', 'apify_dataset', url) as step:
+            items_resp = http_client.request(
+                'GET', f'https://api.apify.com/v2/datasets/{dataset_id}/items',
                 params={'token': apify_token, 'format': 'json'},
+                timeout=30,
             )
+            _account_response(step, items_resp)
         structured_events = items_resp.json() if items_resp.status_code == 200 else []
     except httpx.RequestError as exc:
         logger.warning('scrape_tool [apify_facebook]: failed to fetch dataset — %s', exc)
@@ -341,13 +486,16 @@ def run(url: str, strategy: str = 'generic', **kwargs) -> dict:
 
     Args:
         url: The URL to fetch.
-        strategy: Scraping strategy — 'generic' (default), 'apify_facebook'.
+        strategy: Scraping strategy — 'generic' (default), 'json_ld',
+            'apify_facebook'.
 
     Returns:
         A dict with content, status_code, and strategy-specific fields.
     """
     if strategy == 'apify_facebook':
         return _scrape_apify_facebook(url)
+    if strategy == 'json_ld':
+        return _scrape_json_ld(url)
 
     return _scrape_generic(url)
 
@@ -54,6 +54,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     'rest_framework',
     'rest_framework_simplejwt',
@@ -166,6 +167,10 @@ else:
     MEDIA_URL = '/media/'
     MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Uploaded images wait here (local disk) until process_image_jobs moves them
+# to the media storage above. Must be shared by the web and worker processes.
+IMAGE_STAGING_ROOT = config('IMAGE_STAGING_ROOT', default=os.path.join(BASE_DIR, 'media_staging'))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'users.User'
@@ -1,12 +1,13 @@
 """
 Admin configuration for the agents app.
-Allows staff to review, approve, and reject EventDrafts.
+Allows staff to review, approve, and reject EventDrafts, and to inspect
+AgentRuns with their per-step token, latency and transfer breakdown.
 """
 
 from django.contrib import admin
 from django.utils.html import format_html
 
-from .models import EventDraft, EventSource
+from .models import AgentRun, AgentRunStep, EventDraft, EventSource
 
 
 @admin.action(description='Run discovery agent for selected sources')
@@ -24,7 +25,37 @@ class EventSourceAdmin(admin.ModelAdmin):
     list_filter = ('source_type', 'scrape_strategy', 'is_active')
     search_fields = ('url',)
     raw_id_fields = ()
-    readonly_fields = ('last_scraped_at', 'error_count', 'last_error', 'created_at', 'updated_at')
+    readonly_fields = ('last_scraped_at', 'error_count', 'last_error', 'content_fingerprints',
+                       'created_at', 'updated_at')
+
+
+class AgentRunStepInline(admin.TabularInline):
+    model = AgentRunStep
+    extra = 0
+    can_delete = False
+    fields = ('started_at', 'kind', 'name', 'target', 'duration_ms',
+              'prompt_tokens', 'completion_tokens', 'bytes_fetched', 'error')
+    readonly_fields = fields
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(AgentRun)
+class AgentRunAdmin(admin.ModelAdmin):
+    list_display = ('source_url', 'status', 'created_at', 'duration_display', 'events_created',
+                    'pages_skipped', 'llm_calls', 'prompt_tokens', 'completion_tokens',
+                    'estimated_cost')
+    list_filter = ('status',)
+    search_fields = ('source_url',)
+    readonly_fields = [field.name for field in AgentRun._meta.fields]
+    inlines = [AgentRunStepInline]
+
+    @admin.display(description='Duration')
+    def duration_display(self, obj):
+        if not obj.finished_at:
+            return '—'
+        return f'{(obj.finished_at - obj.created_at).total_seconds():.1f}s'
 
 
 @admin.register(EventDraft)
@@ -7,11 +7,18 @@ Usage:
     python manage.py run_discovery_agent
     python manage.py run_discovery_agent --url <url>
     python manage.py run_discovery_agent --dry-run
+    python manage.py run_discovery_agent --workers 8 --per-domain 2
+    python manage.py run_discovery_agent --mode agent
 """
 
 import logging
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
+from urllib.parse import urlparse
+
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +40,26 @@ class Command(BaseCommand):
             default=False,
             help='Run the full agent loop but do not write anything to the database.',
         )
+        parser.add_argument(
+            '--mode',
+            choices=['crawl', 'agent'],
+            default='crawl',
+            help='crawl (default): fetch event pages directly and parse each one. '
+                 'agent: let the LLM orchestrator decide which tools to call.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of sources to process concurrently. Defaults to 1 (sequential).',
+        )
+        parser.add_argument(
+            '--per-domain',
+            type=int,
+            default=1,
+            help='Maximum number of sources from the same domain processed at once '
+                 'when --workers is greater than 1.',
+        )
 
     def handle(self, *args, **options):
         from guana_know.agents.models import EventSource
@@ -55,28 +82,175 @@ class Command(BaseCommand):
                 self.stdout.write('No active EventSources registered.')
                 return
 
+        mode = options['mode']
+        workers = max(1, options['workers'])
+        if workers > 1 and len(sources) > 1:
+            self._run_concurrently(sources, dry_run, mode, workers, max(1, options['per_domain']))
+            return
+
         for source in sources:
             self.stdout.write(f'Processing: {source.url}')
             try:
-                result = run_for_source(source.url, source.source_type, strategy=source.scrape_strategy, dry_run=dry_run)
+                result = run_for_source(
+                    source.url, source.source_type,
+                    strategy=source.scrape_strategy, dry_run=dry_run, mode=mode,
+                )
             except EnvironmentError as exc:
                 raise CommandError(str(exc))
 
-            if dry_run:
-                self._print_dry_run_report(result, self.stdout)
-            else:
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"Done. Events created: {result.get('written_events', 0)}, "
-                        f"Drafts: {result.get('written_drafts', 0)}, "
-                        f"Duplicates skipped: {result.get('total_duplicates', 0)}"
-                    )
-                )
+            self._print_result(result, dry_run)
 
             if not dry_run:
                 source.last_scraped_at = datetime.now(timezone.utc)
                 source.save(update_fields=['last_scraped_at'])
 
+        self._print_cache_stats()
+
+    def _print_cache_stats(self) -> None:
+        from agents.tools import parse_tool
+
+        stats = parse_tool.cache_stats()
+        if stats['hits'] or stats['misses']:
+            self.stdout.write(f"Parse cache: {stats['hits']} hit(s), {stats['misses']} miss(es)")
+
+    def _print_result(self, result: dict, dry_run: bool) -> None:
+        if dry_run:
+            self._print_dry_run_report(result, self.stdout)
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Done. Events created: {result.get('written_events', 0)}, "
+                    f"Drafts: {result.get('written_drafts', 0)}, "
+                    f"Duplicates skipped: {result.get('total_duplicates', 0)}, "
+                    f"Unchanged pages skipped: {result.get('pages_skipped', 0)}"
+                )
+            )
+            if result.get('warning'):
+                self.stdout.write(self.style.WARNING(f"Warning: {result['warning']}"))
+        self._print_usage(result.get('usage'))
+
+    def _print_usage(self, usage: dict | None) -> None:
+        if not usage:
+            return
+        self.stdout.write(
+            f"LLM calls: {usage['llm_calls']}, "
+            f"tokens: {usage['prompt_tokens']} prompt / {usage['completion_tokens']} completion, "
+            f"est. cost: ${usage['estimated_cost']:.4f}, "
+            f"fetched: {usage['bytes_fetched'] / 1024:.0f} KiB"
+        )
+
+    def _run_concurrently(self, sources: list, dry_run: bool, mode: str,
+                          workers: int, per_domain: int) -> None:
+        """
+        Processes sources through a bounded thread pool.
+
+        Each source still gets its own AgentRun (created by run_for_source).
+        At most per_domain sources of one domain run at once, so we do not
+        hammer a single host — e.g. every apify_facebook source resolves to
+        facebook.com. The limit is applied when submitting: a source is only
+        handed to a worker once its domain has a free slot, so workers never
+        sit blocked on a busy domain while other hosts are waiting.
+        """
+        from agents.orchestrator import run_for_source
+
+        def process(source):
+            try:
+                result = run_for_source(
+                    source.url, source.source_type,
+                    strategy=source.scrape_strategy, dry_run=dry_run, mode=mode,
+                )
+                if not dry_run:
+                    source.last_scraped_at = datetime.now(timezone.utc)
+                    source.save(update_fields=['last_scraped_at'])
+                return result
+            finally:
+                # Worker threads open their own DB connection; release it
+                # instead of leaking one per thread until process exit.
+                connection.close()
+
+        self.stdout.write(
+            f'Processing {len(sources)} source(s) with {workers} worker(s), '
+            f'max {per_domain} per domain.'
+        )
+
+        totals = {'succeeded': 0, 'failed': 0, 'events': 0, 'drafts': 0, 'duplicates': 0, 'unchanged': 0}
+        usage_totals = {'llm_calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0,
+                        'estimated_cost': 0.0, 'bytes_fetched': 0}
+        failures: list[tuple[str, str]] = []
+
+        waiting = _group_by_domain(sources)
+        running: dict[str, int] = defaultdict(int)
+        in_flight: dict = {}
+
+        def submit_ready():
+            # Round-robin over domains with a free slot until every worker is busy.
+            while len(in_flight) < workers:
+                ready = [domain for domain, queue in waiting.items() if running[domain] < per_domain]
+                if not ready:
+                    return
+                for domain in ready:
+                    if len(in_flight) >= workers:
+                        return
+                    source = waiting[domain].popleft()
+                    if not waiting[domain]:
+                        del waiting[domain]
+                    running[domain] += 1
+                    in_flight[executor.submit(process, source)] = source
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='discovery')
+        try:
+            submit_ready()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    source = in_flight.pop(future)
+                    running[_domain(source.url)] -= 1
+                    self.stdout.write(f'Processed: {source.url}')
+                    try:
+                        result = future.result()
+                    except EnvironmentError as exc:
+                        raise CommandError(str(exc))
+                    except Exception as exc:
+                        # run_for_source already marked the AgentRun as failed.
+                        totals['failed'] += 1
+                        failures.append((source.url, str(exc)))
+                        self.stdout.write(self.style.ERROR(f'Failed: {exc}'))
+                        continue
+
+                    totals['succeeded'] += 1
+                    totals['events'] += result.get('written_events', 0)
+                    totals['drafts'] += result.get('written_drafts', 0)
+                    totals['duplicates'] += result.get('total_duplicates', 0)
+                    totals['unchanged'] += result.get('pages_skipped', 0)
+                    for key, value in (result.get('usage') or {}).items():
+                        usage_totals[key] += value
+                    self._print_result(result, dry_run)
+                submit_ready()
+        finally:
+            executor.shutdown(wait=True)
+
+        self.stdout.write('')
+        self.stdout.write('━' * 60)
+        self.stdout.write('  SUMMARY')
+        self.stdout.write(
+            f"  Sources: {totals['succeeded']} succeeded, {totals['failed']} failed  |  "
+            f"Unchanged pages skipped: {totals['unchanged']}"
+        )
+        if not dry_run:
+            self.stdout.write(
+                f"  Events created: {totals['events']}  |  Drafts: {totals['drafts']}  |  "
+                f"Duplicates skipped: {totals['duplicates']}"
+            )
+        self.stdout.write(
+            f"  LLM calls: {usage_totals['llm_calls']}  |  "
+            f"Tokens: {usage_totals['prompt_tokens'] + usage_totals['completion_tokens']}  |  "
+            f"Est. cost: ${usage_totals['estimated_cost']:.4f}"
+        )
+        for url, error in failures:
+            self.stdout.write(self.style.ERROR(f'  ✗ {url} — {error}'))
+        self.stdout.write('━' * 60)
+        self._print_cache_stats()
+
     def _print_dry_run_report(self, result: dict, stdout) -> None:
         candidates = result.get('candidates', [])
         total = result.get('total_found', 0)
@@ -85,7 +259,8 @@ class Command(BaseCommand):
         stdout.write('')
         stdout.write('━' * 60)
         stdout.write('  DRY RUN REPORT')
-        stdout.write(f'  Events found: {total}  |  Duplicates: {duplicates}')
+        stdout.write(f'  Events found: {total}  |  Duplicates: {duplicates}  |  '
+                     f'Unchanged pages skipped: {result.get("pages_skipped", 0)}')
         stdout.write('━' * 60)
 
         if not candidates:
@@ -93,6 +268,8 @@ class Command(BaseCommand):
             error = result.get('error')
             if error:
                 stdout.write(f'  Error: {error}')
+            if result.get('warning'):
+                stdout.write(self.style.WARNING(f"  Warning: {result['warning']}"))
             return
 
         for i, candidate in enumerate(candidates, 1):
@@ -155,3 +332,16 @@ class Command(BaseCommand):
         stdout.write('')
         stdout.write('━' * 60)
         stdout.write('')
+
+
+def _domain(url: str) -> str:
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def _group_by_domain(sources: list) -> dict[str, deque]:
+    """Queues sources per domain, in order, with domains in order of first appearance."""
+    by_domain: dict[str, deque] = {}
+    for source in sources:
+        by_domain.setdefault(_domain(source.url), deque()).append(source)
+    return by_domain
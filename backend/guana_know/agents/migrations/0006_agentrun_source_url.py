@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agents", "0005_eventsource_scrape_strategy"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="agentrun",
+            name="source_url",
+            field=models.URLField(
+                blank=True,
+                default="",
+                help_text="EventSource URL this run processed.",
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agents", "0006_agentrun_source_url"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eventsource",
+            name="content_fingerprints",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text=(
+                    "Normalized content hash per listing/detail URL from the last successful run. "
+                    "Pages whose hash is unchanged are not parsed again."
+                ),
+            ),
+        ),
+        migrations.AddField(
+            model_name="agentrun",
+            name="pages_skipped",
+            field=models.IntegerField(
+                default=0,
+                help_text="Pages not parsed because their content was unchanged since the previous run.",
+            ),
+        ),
+    ]
@@ -0,0 +1,115 @@
+# Generated by Django 4.2.10 on 2026-10-18 06:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agents", "0007_content_fingerprints"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="agentrun",
+            options={
+                "ordering": ["-created_at"],
+                "verbose_name": "Agent Run",
+                "verbose_name_plural": "Agent Runs",
+            },
+        ),
+        migrations.AddField(
+            model_name="agentrun",
+            name="bytes_fetched",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="agentrun",
+            name="completion_tokens",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="agentrun",
+            name="estimated_cost",
+            field=models.DecimalField(
+                decimal_places=6,
+                default=0,
+                help_text="Estimated LLM cost in USD, from AZURE_OPENAI_*_COST_PER_1K.",
+                max_digits=10,
+            ),
+        ),
+        migrations.AddField(
+            model_name="agentrun",
+            name="llm_calls",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="agentrun",
+            name="prompt_tokens",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name="AgentRunStep",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("llm", "LLM call"),
+                            ("tool", "Tool invocation"),
+                            ("fetch", "HTTP fetch"),
+                        ],
+                        db_index=True,
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Tool or purpose, e.g. parse_tool, orchestrator.",
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "target",
+                    models.TextField(
+                        blank=True,
+                        default="",
+                        help_text="URL or title the step worked on.",
+                    ),
+                ),
+                ("started_at", models.DateTimeField()),
+                ("duration_ms", models.IntegerField(default=0)),
+                ("prompt_tokens", models.IntegerField(default=0)),
+                ("completion_tokens", models.IntegerField(default=0)),
+                ("bytes_fetched", models.BigIntegerField(default=0)),
+                ("error", models.TextField(blank=True, default="")),
+                (
+                    "run",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="steps",
+                        to="agents.agentrun",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Agent Run Step",
+                "verbose_name_plural": "Agent Run Steps",
+                "ordering": ["started_at"],
+            },
+        ),
+    ]
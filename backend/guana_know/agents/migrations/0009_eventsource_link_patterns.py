@@ -0,0 +1,22 @@
+# Generated by Django 4.2.10 on 2026-10-18 07:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agents", "0008_agentrun_usage_and_steps"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eventsource",
+            name="link_patterns",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text='URL path patterns of detail pages that yielded events (e.g. "/eventos/*"), with hit counts. Matching links are crawled first.',
+            ),
+        ),
+    ]
@@ -3,6 +3,8 @@ Agent state models for Guana Know.
 
 EventSource: a URL the agent monitors for events.
 EventDraft: a candidate event discovered by the agent, pending human review.
+AgentRun: one discovery run for a source, with outcome counts and LLM/HTTP usage.
+AgentRunStep: a timed LLM call, tool invocation or page fetch within a run.
 """
 
 from django.db import models
@@ -48,6 +50,18 @@ class EventSource(BaseModel):
     )
     error_count = models.PositiveIntegerField(default=0)
     last_error = models.TextField(blank=True, default='')
+    content_fingerprints = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text='Normalized content hash per listing/detail URL from the last successful run. '
+                  'Pages whose hash is unchanged are not parsed again.',
+    )
+    link_patterns = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text='URL path patterns of detail pages that yielded events (e.g. "/eventos/*"), '
+                  'with hit counts. Matching links are crawled first.',
+    )
 
     class Meta:
         ordering = ['-created_at']
@@ -129,8 +143,64 @@ class AgentRun(BaseModel):
         ],
         default='running',
     )
+    source_url = models.URLField(
+        blank=True,
+        default='',
+        help_text='EventSource URL this run processed.',
+    )
     finished_at = models.DateTimeField(null=True, blank=True)
     sources_processed = models.IntegerField(default=0)
     events_created = models.IntegerField(default=0)
     events_deduped = models.IntegerField(default=0)
-    errors = models.JSONField(default=list)
\ No newline at end of file
+    pages_skipped = models.IntegerField(
+        default=0,
+        help_text='Pages not parsed because their content was unchanged since the previous run.',
+    )
+    llm_calls = models.IntegerField(default=0)
+    prompt_tokens = models.IntegerField(default=0)
+    completion_tokens = models.IntegerField(default=0)
+    estimated_cost = models.DecimalField(
+        max_digits=10,
+        decimal_places=6,
+        default=0,
+        help_text='Estimated LLM cost in USD, from AZURE_OPENAI_*_COST_PER_1K.',
+    )
+    bytes_fetched = models.BigIntegerField(default=0)
+    errors = models.JSONField(default=list)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Agent Run'
+        verbose_name_plural = 'Agent Runs'
+
+    def __str__(self):
+        return f'[{self.status}] {self.source_url or "run"} ({self.created_at:%Y-%m-%d %H:%M})'
+
+
+class AgentRunStep(BaseModel):
+    """A single LLM call, tool invocation or HTTP fetch recorded during an AgentRun."""
+
+    KIND_CHOICES = [
+        ('llm', 'LLM call'),
+        ('tool', 'Tool invocation'),
+        ('fetch', 'HTTP fetch'),
+    ]
+
+    run = models.ForeignKey(AgentRun, on_delete=models.CASCADE, related_name='steps')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, db_index=True)
+    name = models.CharField(max_length=50, help_text='Tool or purpose, e.g. parse_tool, orchestrator.')
+    target = models.TextField(blank=True, default='', help_text='URL or title the step worked on.')
+    started_at = models.DateTimeField()
+    duration_ms = models.IntegerField(default=0)
+    prompt_tokens = models.IntegerField(default=0)
+    completion_tokens = models.IntegerField(default=0)
+    bytes_fetched = models.BigIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+
+    class Meta:
+        ordering = ['started_at']
+        verbose_name = 'Agent Run Step'
+        verbose_name_plural = 'Agent Run Steps'
+
+    def __str__(self):
+        return f'{self.kind}:{self.name} {self.duration_ms}ms'
@@ -23,25 +23,12 @@ def promote_draft_to_event(draft):
     (e.g. missing required fields, venue not found).
     """
     from agents.orchestrator import _create_agent_event
-    from guana_know.events.models import Event
 
     source_url = draft.source.url if draft.source else ''
     event_data = draft.parsed_data or {}
 
-    # Count existing events before to detect the newly created one.
     # _create_agent_event only logs warnings and returns None on failure.
-    existing_ids = set(
-        Event.objects.filter(source='agent', source_url=source_url)
-        .values_list('id', flat=True)
-    )
-
-    _create_agent_event(event_data, source_url)
-
-    new_event = (
-        Event.objects.filter(source='agent', source_url=source_url)
-        .exclude(id__in=existing_ids)
-        .first()
-    )
+    new_event = _create_agent_event(event_data, source_url)
 
     if new_event:
         draft.resolved_event = new_event
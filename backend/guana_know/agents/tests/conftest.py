@@ -0,0 +1,30 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_agent_cache(tmp_path, monkeypatch):
+    """Points the on-disk agent caches at a per-test directory."""
+    monkeypatch.setenv('AGENT_CACHE_DIR', str(tmp_path / 'agent-cache'))
+
+
+@pytest.fixture(autouse=True)
+def fresh_host_slots(monkeypatch):
+    """Gives each test its own per-host semaphores, sized from its environment."""
+    import threading
+    from collections import defaultdict
+
+    from agents import http_client
+
+    monkeypatch.setattr(http_client, '_host_slots', defaultdict(
+        lambda: threading.BoundedSemaphore(http_client.max_per_host())
+    ))
+
+
+@pytest.fixture(autouse=True)
+def fresh_llm_client():
+    """Drops the shared AzureOpenAI client so each test can patch its constructor."""
+    from agents import llm
+
+    llm._client = None
+    yield
+    llm._client = None
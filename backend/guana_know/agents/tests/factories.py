@@ -0,0 +1,15 @@
+import factory
+from guana_know.agents.models import EventSource
+
+class EventSourceFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = EventSource
+
+    url = factory.Sequence(lambda n: f"https://venue{n}.example/agenda")
+    source_type = "website"
+
+    class Params:
+        facebook = factory.Trait(
+            source_type="facebook",
+            url=factory.Sequence(lambda n: f"https://www.facebook.com/venue{n}/events"),
+        )
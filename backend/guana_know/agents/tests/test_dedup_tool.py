@@ -5,6 +5,7 @@ Uses the Django test database — no external services required.
 """
 
 import pytest
+from django.db import connection
 from django.utils import timezone
 
 from agents.tools import dedup_tool
@@ -50,6 +51,16 @@ class TestDedupTool:
         result = dedup_tool.run(title="Concierto de Jazz", venue_name="Teatro Juárez")
         assert result["is_duplicate"] is True
 
+    def test_matches_venue_without_its_own_alias_by_name(self, db):
+        from guana_know.venues.tests.factories import VenueFactory
+
+        VenueFactory(name="Teatro Juárez")
+        second = VenueFactory(name="Teatro Juárez")
+        event = EventFactory(title="Concierto de Jazz", venue=second, status="published")
+
+        result = dedup_tool.run(title="Concierto de Jazz", venue_name="Teatro Juárez")
+        assert result["existing_event_id"] == str(event.id)
+
     def test_detects_duplicate_within_datetime_tolerance(self, db):
         dt = timezone.now() + timezone.timedelta(days=5)
         EventFactory(title="Festival de Cine", status="published", start_datetime=dt)
@@ -78,3 +89,101 @@ class TestDedupTool:
         event = EventFactory(title="Obra de Teatro", status="published")
         result = dedup_tool.run(title="Obra de Teatro")
         assert result["existing_event_id"] == str(event.id)
+
+    def test_ignores_accents_and_punctuation_in_titles(self, db):
+        EventFactory(title="Función de Títeres: ¡Don Quijote!", status="published")
+        result = dedup_tool.run(title="funcion de titeres don quijote")
+        assert result["is_duplicate"] is True
+
+    @pytest.mark.skipif(connection.vendor != "postgresql", reason="pg_trgm similarity needs PostgreSQL")
+    def test_detects_small_spelling_differences(self, db):
+        EventFactory(title="Festival Internacional Cervantino", status="published")
+        result = dedup_tool.run(title="Festival Internacional Cervantno")
+        assert result["is_duplicate"] is True
+
+
+@pytest.mark.django_db
+class TestDedupMany:
+    def test_matches_run_per_candidate(self):
+        from guana_know.venues.tests.factories import VenueFactory
+
+        dt = timezone.now() + timezone.timedelta(days=5)
+        teatro = VenueFactory(name="Teatro Juárez")
+        jazz = EventFactory(title="Concierto de Jazz", venue=teatro, status="published", start_datetime=dt)
+        cine = EventFactory(title="Festival de Cine", status="published")
+
+        candidates = [
+            {"title": "Concierto de Jazz", "venue_name": "Teatro Juárez",
+             "start_datetime": (dt + timezone.timedelta(hours=1)).isoformat()},
+            {"title": "Concierto de Jazz", "venue_name": "Museo Iconográfico",
+             "start_datetime": dt.isoformat()},
+            {"title": "Concierto de Jazz", "start_datetime": (dt + timezone.timedelta(hours=4)).isoformat()},
+            {"title": "FESTIVAL DE CINE", "start_datetime": None},
+            {"title": "Exposición de Arte"},
+        ]
+
+        results = dedup_tool.dedup_many(candidates)
+
+        assert results == [
+            {"is_duplicate": True, "existing_event_id": str(jazz.id)},
+            {"is_duplicate": False, "existing_event_id": None},
+            {"is_duplicate": False, "existing_event_id": None},
+            {"is_duplicate": True, "existing_event_id": str(cine.id)},
+            {"is_duplicate": False, "existing_event_id": None},
+        ]
+        assert [r["is_duplicate"] for r in results] == [
+            dedup_tool.run(**c)["is_duplicate"] for c in candidates
+        ]
+
+    def test_matches_venues_through_aliases_like_run(self):
+        from guana_know.venues.services import merge_venues
+        from guana_know.venues.tests.factories import VenueFactory
+
+        dt = timezone.now() + timezone.timedelta(days=5)
+        teatro = VenueFactory(name="Teatro Juárez")
+        merge_venues(teatro, [VenueFactory(name="Teatro Juarez (Centro)")])
+        jazz = EventFactory(title="Concierto de Jazz", venue=teatro, status="published", start_datetime=dt)
+        VenueFactory(name="Museo Iconográfico")
+        second = VenueFactory(name="Museo Iconografico")  # owns no alias: the first one took it
+        danza = EventFactory(title="Danza", venue=second, status="published", start_datetime=dt)
+
+        candidates = [
+            {"title": "Concierto de Jazz", "venue_name": "Teatro Juárez (Centro)",
+             "start_datetime": dt.isoformat()},
+            {"title": "Danza", "venue_name": "Museo Iconografico", "start_datetime": dt.isoformat()},
+        ]
+
+        results = dedup_tool.dedup_many(candidates)
+
+        assert [r["existing_event_id"] for r in results] == [str(jazz.id), str(danza.id)]
+        assert [r["existing_event_id"] for r in results] == [
+            dedup_tool.run(**c)["existing_event_id"] for c in candidates
+        ]
+
+    def test_uses_a_single_query(self, django_assert_num_queries):
+        dt = timezone.now() + timezone.timedelta(days=5)
+        EventFactory(title="Concierto de Jazz", status="published", start_datetime=dt)
+        candidates = [
+            {"title": f"Evento {i}", "start_datetime": (dt + timezone.timedelta(days=i)).isoformat()}
+            for i in range(20)
+        ]
+
+        with django_assert_num_queries(1):
+            dedup_tool.dedup_many(candidates)
+
+    def test_fuzzy_titles_match_in_memory(self):
+        dt = timezone.now() + timezone.timedelta(days=5)
+        event = EventFactory(title="Festival Internacional Cervantino", status="published", start_datetime=dt)
+
+        [result] = dedup_tool.dedup_many([
+            {"title": "Festival Internacional Cervantno", "start_datetime": dt.isoformat()},
+        ])
+
+        assert result["existing_event_id"] == str(event.id)
+
+
+def test_trigram_similarity_matches_pg_trgm():
+    # Values from PostgreSQL: SELECT similarity('word', 'two words');
+    assert dedup_tool.trigram_similarity("word", "two words") == pytest.approx(4 / 11)
+    assert dedup_tool.trigram_similarity("abc", "abc") == 1.0
+    assert dedup_tool.trigram_similarity("", "abc") == 0.0
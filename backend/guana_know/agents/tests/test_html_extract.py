@@ -0,0 +1,92 @@
+"""
+Tests for agents/html_extract.py
+
+Each page in fixtures/pages is a small hand-written page modeled on a
+layout our sources use, with a .json holding the text, image and candidate
+event links (with anchor text) the BeautifulSoup extraction produced for it.
+Every extractor must reproduce them exactly, and the JSON-LD events read
+by json_ld_events() must match the script blocks bs4 and lxml find. No
+captured pages from real sources are included yet; they can be added the
+same way.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from agents import html_extract
+
+PAGES = Path(__file__).parent / "fixtures" / "pages"
+
+EXTRACTORS = [
+    pytest.param(html_extract.extract_with_bs4, id="bs4"),
+    pytest.param(
+        html_extract.extract_with_lxml, id="lxml",
+        marks=pytest.mark.skipif(html_extract.etree is None, reason="lxml is not installed"),
+    ),
+]
+
+
+def _bs4_json_ld_blocks(html):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    return [script.string or "" for script in soup.find_all("script", type="application/ld+json")]
+
+
+def _lxml_json_ld_blocks(html):
+    from lxml import html as lxml_html
+
+    root = lxml_html.fromstring(html)
+    return [script.text or "" for script in root.iter("script") if script.get("type") == "application/ld+json"]
+
+
+JSON_LD_PARSERS = [
+    pytest.param(_bs4_json_ld_blocks, id="bs4"),
+    pytest.param(
+        _lxml_json_ld_blocks, id="lxml",
+        marks=pytest.mark.skipif(html_extract.etree is None, reason="lxml is not installed"),
+    ),
+]
+
+
+def _pages():
+    return sorted(path.stem for path in PAGES.glob("*.html"))
+
+
+@pytest.mark.parametrize("extractor", EXTRACTORS)
+@pytest.mark.parametrize("page", _pages())
+def test_matches_saved_extraction(extractor, page):
+    expected = json.loads((PAGES / f"{page}.json").read_text(encoding="utf-8"))
+    html = (PAGES / f"{page}.html").read_text(encoding="utf-8")
+
+    result = extractor(html, expected["url"])
+
+    assert result.text == expected["text"]
+    assert result.image_url == expected["image_url"]
+    assert result.links == [tuple(link) for link in expected["links"]]
+
+
+@pytest.mark.parametrize("find_blocks", JSON_LD_PARSERS)
+@pytest.mark.parametrize("page", _pages())
+def test_json_ld_matches_parsed_script_blocks(find_blocks, page):
+    html = (PAGES / f"{page}.html").read_text(encoding="utf-8")
+    parsed = []
+    for block in find_blocks(html):
+        html_extract._collect_events(json.loads(block.strip(), strict=False), parsed)
+
+    assert html_extract.json_ld_events(html) == parsed
+
+
+class TestGetExtractor:
+    def test_bs4_can_be_forced(self, monkeypatch):
+        monkeypatch.setenv("SCRAPE_EXTRACTOR", "bs4")
+
+        assert html_extract.get_extractor() is html_extract.extract_with_bs4
+
+    def test_falls_back_to_bs4_without_lxml(self, monkeypatch):
+        monkeypatch.setenv("SCRAPE_EXTRACTOR", "lxml")
+        monkeypatch.setattr(html_extract, "etree", None)
+
+        assert html_extract.get_extractor() is html_extract.extract_with_bs4
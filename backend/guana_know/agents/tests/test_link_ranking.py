@@ -0,0 +1,87 @@
+"""
+Tests for agents/link_ranking.py and link learning in RunContext.
+"""
+
+import pytest
+
+from agents import link_ranking
+from agents.html_extract import _filter_event_links
+from agents.run_context import RunContext
+
+
+BASE = "https://museo.example/agenda"
+
+
+class TestRankLinks:
+    def test_event_pages_come_before_site_pages(self):
+        links = [
+            ("https://museo.example/nosotros", "Nosotros"),
+            ("https://museo.example/contacto/", "Contacto"),
+            ("https://museo.example/aviso-de-privacidad", "Aviso de privacidad"),
+            ("https://museo.example/agenda?page=2", "Siguiente"),
+            ("https://museo.example/eventos/concierto-de-jazz", "Concierto de jazz"),
+            ("https://museo.example/visita", "Visita"),
+        ]
+
+        ranked = link_ranking.rank_links(links)
+
+        assert ranked[0] == "https://museo.example/eventos/concierto-de-jazz"
+        assert set(ranked[-3:]) == {
+            "https://museo.example/nosotros",
+            "https://museo.example/contacto/",
+            "https://museo.example/aviso-de-privacidad",
+        }
+
+    def test_dates_in_anchor_text_or_path_raise_the_score(self):
+        assert link_ranking.score_link(BASE + "/lectura", "Sáb 24 de octubre, 19:00") > \
+            link_ranking.score_link(BASE + "/lectura", "Lectura")
+        assert link_ranking.score_link("https://museo.example/2026/10/lectura-en-voz-alta") > \
+            link_ranking.score_link("https://museo.example/lectura-en-voz-alta")
+
+    def test_equal_scores_keep_page_order(self):
+        links = [(f"https://museo.example/eventos/evento-{n}", "") for n in range(5)]
+
+        assert link_ranking.rank_links(links) == [url for url, _ in links]
+
+
+class TestLearnedPatterns:
+    def test_path_pattern_generalizes_slug_and_numbers(self):
+        assert link_ranking.path_pattern("https://m.example/eventos/2026/concierto-de-jazz/") == "/eventos/{n}/*"
+        assert link_ranking.path_pattern("https://m.example/concierto-de-jazz") is None
+
+    def test_learned_patterns_are_preferred(self):
+        urls = ["https://m.example/noticias/nueva-sala", "https://m.example/cartel/obra-de-teatro"]
+
+        assert link_ranking.prefer_learned(urls, {"/cartel/*": 3}) == list(reversed(urls))
+        assert link_ranking.prefer_learned(urls, {}) == urls
+
+    @pytest.mark.django_db
+    def test_run_context_learns_and_saves_patterns(self):
+        from guana_know.agents.tests.factories import EventSourceFactory
+
+        source = EventSourceFactory(url=BASE, link_patterns={"/eventos/*": 2})
+        ctx = RunContext.for_source(BASE)
+        ctx.learn_event_page("https://museo.example/eventos/danza")
+        ctx.learn_event_page("https://museo.example/cartel/obra")
+        ctx.learn_event_page(BASE)
+
+        ctx.save_link_patterns()
+
+        source.refresh_from_db()
+        assert source.link_patterns == {"/eventos/*": 3, "/cartel/*": 1}
+
+
+class TestFilterEventLinks:
+    def test_dedups_thousands_of_anchors_in_page_order(self):
+        anchors = [(f"/eventos/evento-{n % 500}", f"Evento {n % 500}") for n in range(5000)]
+
+        links = _filter_event_links(anchors, BASE)
+
+        assert len(links) == 500
+        assert links[0] == ("https://museo.example/eventos/evento-0", "Evento 0")
+        assert links[-1][0] == "https://museo.example/eventos/evento-499"
+
+    def test_joins_texts_of_anchors_to_the_same_page(self):
+        anchors = [("/eventos/jazz", ""), ("/eventos/jazz", "Concierto de jazz"), ("/eventos/jazz", "24/10")]
+
+        assert _filter_event_links(anchors, BASE) == [("https://museo.example/eventos/jazz", "Concierto de jazz 24/10")]
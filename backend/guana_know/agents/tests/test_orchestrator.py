@@ -0,0 +1,547 @@
+"""
+Tests for agents/orchestrator.py
+
+Network and LLM calls are mocked — no external services required.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from datetime import timedelta
+from unittest.mock import patch
+
+import httpx
+import pytest
+from django.utils import timezone
+
+from agents import http_client, orchestrator
+from agents.run_context import RunContext, content_fingerprint, record_step
+from agents.tools import scrape_tool
+
+
+LISTING = {
+    "content": "Agenda del mes",
+    "status_code": 200,
+    "url": "https://museo.example/agenda",
+    "image_url": None,
+    "event_links": [
+        "https://museo.example/eventos/jazz",
+        "https://museo.example/eventos/danza",
+    ],
+}
+
+
+def _page(url: str, content: str) -> dict:
+    return {"content": content, "status_code": 200, "url": url, "image_url": None, "event_links": []}
+
+
+def _parsed(title: str) -> dict:
+    return {
+        "events": [
+            {
+                "title": title,
+                "description": None,
+                "start_datetime": None,
+                "end_datetime": None,
+                "venue_name": None,
+                "category": "music",
+                "price": 0,
+                "is_free": True,
+                "registration_url": None,
+                "image_url": None,
+                "confidence": 0.9,
+                "issues": [],
+            }
+        ]
+    }
+
+
+@pytest.mark.django_db
+class TestCrawlMode:
+    @patch("agents.orchestrator.parse_tool.run_batch")
+    @patch("agents.orchestrator._fetch_pages")
+    @patch("agents.orchestrator.scrape_tool.run", return_value=LISTING)
+    def test_parses_each_detail_page(self, mock_scrape, mock_fetch, mock_parse):
+        mock_fetch.return_value = [
+            _page("https://museo.example/eventos/jazz", "Concierto de jazz"),
+            _page("https://museo.example/eventos/danza", "Danza contemporánea"),
+        ]
+        mock_parse.return_value = [_parsed("Concierto de jazz"), _parsed("Danza contemporánea")]
+
+        summary = orchestrator._run_crawl("https://museo.example/agenda", "website", RunContext(LISTING["url"]))
+
+        mock_fetch.assert_called_once_with(LISTING["event_links"])
+        mock_parse.assert_called_once()
+        parsed_urls = [page["source_url"] for page in mock_parse.call_args.args[0]]
+        assert parsed_urls == LISTING["event_links"]
+        assert [c["event_data"]["title"] for c in summary["candidates"]] == [
+            "Concierto de jazz", "Danza contemporánea",
+        ]
+        assert summary["total_found"] == 2
+
+    @patch("agents.orchestrator.parse_tool.run_batch", return_value=[_parsed("Feria del libro")])
+    @patch("agents.orchestrator._fetch_pages")
+    @patch("agents.orchestrator.scrape_tool.run", return_value=LISTING)
+    def test_falls_back_to_listing_when_detail_pages_fail(self, mock_scrape, mock_fetch, mock_parse):
+        mock_fetch.return_value = [
+            {"content": "", "status_code": 404, "error": "HTTP 404", "event_links": [],
+             "url": "https://museo.example/eventos/jazz"},
+        ]
+
+        summary = orchestrator._run_crawl("https://museo.example/agenda", "website", RunContext(LISTING["url"]))
+
+        assert mock_parse.call_args.args[0][0]["content"] == "Agenda del mes"
+        assert summary["total_found"] == 1
+
+    @patch("agents.orchestrator.scrape_tool.run")
+    def test_returns_error_summary_when_listing_fails(self, mock_scrape):
+        mock_scrape.return_value = {"content": "", "status_code": 0, "error": "timeout", "event_links": []}
+
+        summary = orchestrator._run_crawl("https://museo.example/agenda", "website", RunContext(LISTING["url"]))
+
+        assert summary["candidates"] == []
+        assert summary["error"] == "timeout"
+
+
+    @patch("agents.orchestrator.parse_tool.run_batch", return_value=[_parsed("Danza contemporánea")])
+    @patch("agents.orchestrator._fetch_pages")
+    @patch("agents.orchestrator.scrape_tool.run", return_value=LISTING)
+    def test_skips_pages_with_unchanged_fingerprint(self, mock_scrape, mock_fetch, mock_parse):
+        jazz_url, danza_url = LISTING["event_links"]
+        mock_fetch.return_value = [
+            _page(jazz_url, "Concierto de jazz"),
+            _page(danza_url, "Danza contemporánea"),
+        ]
+        ctx = RunContext(
+            LISTING["url"],
+            previous_fingerprints={jazz_url: content_fingerprint("  CONCIERTO de\njazz ")},
+        )
+
+        summary = orchestrator._run_crawl(LISTING["url"], "website", ctx)
+
+        assert [page["source_url"] for page in mock_parse.call_args.args[0]] == [danza_url]
+        assert ctx.pages_skipped == 1
+        assert set(ctx.fingerprints) == {jazz_url, danza_url}
+        assert summary["total_found"] == 1
+
+    @patch("agents.orchestrator.parse_tool.run_batch", return_value=[{"events": [], "error": "rate limit"}])
+    @patch("agents.orchestrator._fetch_pages")
+    @patch("agents.orchestrator.scrape_tool.run", return_value=LISTING)
+    def test_does_not_remember_fingerprint_of_failed_parse(self, mock_scrape, mock_fetch, mock_parse):
+        mock_fetch.return_value = [_page(LISTING["event_links"][0], "Concierto de jazz")]
+        ctx = RunContext(LISTING["url"])
+
+        orchestrator._run_crawl(LISTING["url"], "website", ctx)
+
+        assert ctx.fingerprints == {}
+
+
+@pytest.mark.django_db
+class TestRunMetrics:
+    @patch.dict("os.environ", {"AZURE_OPENAI_API_KEY": "test-key"})
+    @patch("agents.orchestrator._fetch_pages", return_value=[])
+    @patch("agents.orchestrator.scrape_tool.run", return_value=LISTING)
+    def test_usage_and_steps_are_stored_on_the_run(self, mock_scrape, mock_fetch):
+        from guana_know.agents.models import AgentRun
+
+        def parse_batch(pages, source_type):
+            record_step("llm", "parse_tool_batch", prompt_tokens=1200, completion_tokens=300)
+            return [{"events": []} for _ in pages]
+
+        with patch("agents.orchestrator.parse_tool.run_batch", side_effect=parse_batch):
+            summary = orchestrator.run_for_source(LISTING["url"], "website")
+
+        run = AgentRun.objects.get(source_url=LISTING["url"])
+        assert run.llm_calls == 1
+        assert run.prompt_tokens == 1200
+        assert run.completion_tokens == 300
+        assert run.estimated_cost > 0
+        assert [(step.kind, step.name) for step in run.steps.all()] == [
+            ("tool", "parse_tool"),
+            ("llm", "parse_tool_batch"),
+        ]
+        assert summary["usage"]["prompt_tokens"] == 1200
+
+    def test_steps_outside_a_run_are_ignored(self):
+        record_step("llm", "orphan", prompt_tokens=10)
+
+
+class TestContentHandles:
+    @patch("agents.orchestrator.scrape_tool.run")
+    def test_scrape_result_is_stored_and_only_a_preview_is_returned(self, mock_scrape):
+        mock_scrape.return_value = {**_page("https://museo.example/eventos/jazz", "x" * 5000),
+                                    "image_url": "https://museo.example/jazz.jpg"}
+        ctx = RunContext(LISTING["url"])
+
+        result = json.loads(orchestrator._dispatch_tool(
+            "scrape_tool", {"url": "https://museo.example/eventos/jazz"}, ctx,
+        ))
+
+        assert "content" not in result
+        assert result["content_handle"] == "page-1"
+        assert result["content_chars"] == 5000
+        assert len(result["preview"]) == orchestrator._PREVIEW_CHARS
+        assert ctx.page("page-1")["content"] == "x" * 5000
+
+    @patch("agents.orchestrator.parse_tool.run", return_value={"events": []})
+    def test_parse_tool_resolves_handle_server_side(self, mock_parse):
+        ctx = RunContext(LISTING["url"])
+        handle = ctx.store_page({**_page("https://museo.example/eventos/jazz", "Concierto de jazz"),
+                                 "image_url": "https://museo.example/jazz.jpg"})
+
+        orchestrator._dispatch_tool("parse_tool", {"content_handle": handle, "source_type": "website"}, ctx)
+
+        mock_parse.assert_called_once_with(
+            content="Concierto de jazz",
+            source_type="website",
+            source_url="https://museo.example/eventos/jazz",
+            image_url="https://museo.example/jazz.jpg",
+        )
+
+    def test_unknown_handle_returns_error(self):
+        result = json.loads(orchestrator._dispatch_tool(
+            "parse_tool", {"content_handle": "page-9", "source_type": "website"}, RunContext(LISTING["url"]),
+        ))
+
+        assert result["error"] == "Unknown content_handle: page-9"
+
+
+class TestScrapeAsync:
+    def test_gathered_pages_keep_url_order(self):
+        def handler(request):
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/html"},
+                text=f"<html><body><p>{request.url.path}</p></body></html>",
+            )
+
+        async def run(urls):
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await asyncio.gather(*(scrape_tool.scrape_async(client, u) for u in urls))
+
+        urls = [f"https://museo.example/eventos/{i}" for i in range(5)]
+        pages = asyncio.run(run(urls))
+
+        assert [p["url"] for p in pages] == urls
+        assert [p["content"] for p in pages] == [f"/eventos/{i}" for i in range(5)]
+
+
+    def test_crawl_respects_the_per_host_cap(self, monkeypatch):
+        monkeypatch.setenv("AGENT_HTTP_MAX_PER_HOST", "2")
+        monkeypatch.setattr(orchestrator, "_CRAWL_CONCURRENCY", 10)
+        running = {}
+        peak = {}
+
+        async def fake_scrape(client, url):
+            host = url.split("/")[2]
+            running[host] = running.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), running[host])
+            await asyncio.sleep(0.01)
+            running[host] -= 1
+            return {"url": url}
+
+        urls = [f"https://museo.example/eventos/{i}" for i in range(6)] + ["https://teatro.example/obra"]
+        with patch("agents.orchestrator.scrape_tool.scrape_async", side_effect=fake_scrape):
+            pages = orchestrator._fetch_pages(urls)
+
+        assert [page["url"] for page in pages] == urls
+        assert peak == {"museo.example": 2, "teatro.example": 1}
+
+    def test_crawl_shares_host_slots_with_the_sync_client(self, monkeypatch):
+        monkeypatch.setenv("AGENT_HTTP_MAX_PER_HOST", "1")
+        held = threading.Event()
+        released = threading.Event()
+        fetched = {}
+
+        def hold_slot():
+            with http_client.host_slot("https://museo.example/agenda"):
+                held.set()
+                time.sleep(0.2)
+                released.set()
+
+        async def fake_scrape(client, url):
+            fetched[url] = released.is_set()
+            return {"url": url}
+
+        holder = threading.Thread(target=hold_slot)
+        holder.start()
+        held.wait(5)
+        with patch("agents.orchestrator.scrape_tool.scrape_async", side_effect=fake_scrape):
+            orchestrator._fetch_pages(["https://museo.example/eventos/1", "https://teatro.example/obra"])
+        holder.join()
+
+        # museo.example waited for the sync request's slot; teatro.example did not.
+        assert fetched == {"https://museo.example/eventos/1": True, "https://teatro.example/obra": False}
+
+
+def _tool_call(call_id: str, name: str, arguments: dict) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=call_id,
+        function=SimpleNamespace(name=name, arguments=json.dumps(arguments)),
+    )
+
+
+class TestParallelToolCalls:
+    def test_runs_calls_concurrently_and_keeps_order(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def dispatch(name, tool_input, ctx=None):
+            barrier.wait()  # only passes if both calls are in flight together
+            return json.dumps({"url": tool_input["url"]})
+
+        calls = [
+            _tool_call("call_1", "scrape_tool", {"url": "https://museo.example/a"}),
+            _tool_call("call_2", "scrape_tool", {"url": "https://museo.example/b"}),
+        ]
+
+        with patch("agents.orchestrator._dispatch_tool", side_effect=dispatch), \
+                ThreadPoolExecutor(max_workers=2) as executor:
+            messages = orchestrator._run_tool_calls(calls, RunContext(LISTING["url"]), executor)
+
+        assert [m["tool_call_id"] for m in messages] == ["call_1", "call_2"]
+        assert [json.loads(m["content"])["url"] for m in messages] == [
+            "https://museo.example/a", "https://museo.example/b",
+        ]
+
+    def test_invalid_arguments_return_error_result(self):
+        call = SimpleNamespace(id="call_1", function=SimpleNamespace(name="scrape_tool", arguments="{oops"))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            messages = orchestrator._run_tool_calls([call], RunContext(LISTING["url"]), executor)
+
+        assert "error" in json.loads(messages[0]["content"])
+
+
+def _completion(finish_reason: str, content: str | None = None, tool_calls: list | None = None):
+    tool_calls = [
+        SimpleNamespace(**vars(tc), model_dump=lambda tc=tc: {"id": tc.id}) for tc in (tool_calls or [])
+    ]
+    message = SimpleNamespace(content=content, tool_calls=tool_calls or None)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason=finish_reason)])
+
+
+@pytest.mark.django_db
+class TestCandidateLedger:
+    @patch("agents.orchestrator.parse_tool.run", return_value=_parsed("Concierto de jazz"))
+    @patch("agents.orchestrator.scrape_tool.run", return_value=_page(LISTING["url"], "Concierto de jazz"))
+    def test_summary_is_built_from_parsed_events_not_the_final_message(self, mock_scrape, mock_parse):
+        responses = [
+            _completion("tool_calls", tool_calls=[_tool_call("c1", "scrape_tool", {"url": LISTING["url"]})]),
+            _completion("tool_calls", tool_calls=[
+                _tool_call("c2", "parse_tool", {"content_handle": "page-1", "source_type": "website"}),
+            ]),
+            _completion("stop", content='{"done": true}'),
+        ]
+        ctx = RunContext(LISTING["url"])
+
+        with patch("agents.orchestrator.llm.complete", side_effect=responses) as mock_complete:
+            summary = orchestrator._run_agent_loop(LISTING["url"], "website", ctx)
+
+        assert [c["event_data"]["title"] for c in summary["candidates"]] == ["Concierto de jazz"]
+        assert summary["total_found"] == 1
+        assert summary["scrape_status"] == 200
+        tool_message = mock_complete.call_args.kwargs["messages"][-1]
+        assert json.loads(tool_message["content"]) == {
+            "events_found": 1, "duplicates": 0, "titles": ["Concierto de jazz"],
+        }
+
+    def test_model_reported_error_is_kept_when_nothing_was_found(self):
+        ctx = RunContext(LISTING["url"])
+
+        with patch("agents.orchestrator.llm.complete",
+                   return_value=_completion("stop", content='{"done": true, "error": "login wall"}')):
+            summary = orchestrator._run_agent_loop(LISTING["url"], "website", ctx)
+
+        assert summary["candidates"] == []
+        assert summary["error"] == "login wall"
+
+
+@pytest.mark.django_db
+class TestPersistCandidates:
+    def _candidate(self, title: str, confidence: float = 0.9) -> dict:
+        return {
+            "event_data": {
+                "title": title,
+                "start_datetime": (timezone.now() + timedelta(days=7)).isoformat(),
+                "venue_name": "Teatro Juárez",
+            },
+            "confidence": confidence,
+            "issues": [],
+            "is_duplicate": False,
+        }
+
+    def test_writes_events_and_drafts_in_bulk(self):
+        from guana_know.agents.models import EventDraft
+        from guana_know.agents.tests.factories import EventSourceFactory
+        from guana_know.events.models import Event
+
+        EventSourceFactory(url=LISTING["url"])
+        summary = {"candidates": [
+            self._candidate("Concierto de jazz"),
+            self._candidate("Concierto de jazz"),
+            self._candidate("Lectura", confidence=0.4),
+            {**self._candidate("Danza"), "is_duplicate": True},
+        ]}
+
+        summary = orchestrator._persist_candidates(summary, LISTING["url"])
+
+        events = Event.objects.filter(id__in=summary["created_event_ids"])
+        assert summary["written_events"] == 2
+        assert sorted(events.values_list("slug", flat=True)) == ["concierto-de-jazz", "concierto-de-jazz-1"]
+        assert {event.title_normalized for event in events} == {"concierto de jazz"}
+        assert {event.venue.name for event in events} == {"Teatro Juárez"}
+        assert summary["written_drafts"] == 1
+        assert EventDraft.objects.get(id=summary["created_draft_ids"][0]).parsed_data["title"] == "Lectura"
+
+    def test_nothing_is_written_when_the_batch_fails(self):
+        from guana_know.events.models import Event
+        from guana_know.venues.models import Venue, VenueAlias
+
+        with patch("guana_know.agents.models.EventDraft.objects.bulk_create", side_effect=RuntimeError):
+            with pytest.raises(RuntimeError):
+                orchestrator._persist_candidates({"candidates": [self._candidate("Concierto")]}, LISTING["url"])
+
+        assert not Event.objects.exists()
+        assert not Venue.objects.exists()
+        assert not VenueAlias.objects.exists()
+
+    def test_shared_image_is_downloaded_and_stored_once(self, settings, tmp_path):
+        from guana_know.common.models import StoredMedia
+        from guana_know.events.models import Event
+
+        settings.MEDIA_ROOT = str(tmp_path)
+        image_url = "https://museo.example/poster.jpg"
+        candidates = [self._candidate("Concierto de jazz"), self._candidate("Danza")]
+        for candidate in candidates:
+            candidate["event_data"]["image_url"] = image_url
+        requested = []
+
+        def fake_request(method, url, **kwargs):
+            requested.append(url)
+            return httpx.Response(200, headers={"content-type": "image/jpeg"}, content=b"jpeg")
+
+        with patch("agents.orchestrator.http_client.request", side_effect=fake_request):
+            summary = orchestrator._persist_candidates({"candidates": candidates}, LISTING["url"])
+
+        assert requested == [image_url]
+        assert summary["images_stored"] == 1
+        events = Event.objects.filter(id__in=summary["created_event_ids"])
+        assert len({event.image.name for event in events}) == 1
+        assert StoredMedia.objects.get().ref_count == 2
+
+
+class TestJsonLdMapping:
+    def test_maps_schema_org_event(self):
+        event_data = orchestrator._map_json_ld_event({
+            "@type": "TheaterEvent",
+            "name": "Obra &quot;Los justos&quot;",
+            "description": "<p>Teatro en el patio.</p>",
+            "startDate": "2026-10-24T19:00:00-06:00",
+            "endDate": "2026-10-24",
+            "location": {"@type": "Place", "name": "Teatro Juárez"},
+            "image": [{"@type": "ImageObject", "url": "https://museo.example/obra.jpg"}],
+            "offers": [{"price": "150.00", "url": "https://boletos.example/obra"}, {"price": "200"}],
+            "url": "https://museo.example/eventos/obra",
+        })
+
+        assert event_data["title"] == 'Obra "Los justos"'
+        assert event_data["description"] == "Teatro en el patio."
+        assert event_data["start_datetime"] == "2026-10-24T19:00:00-06:00"
+        assert event_data["end_datetime"] == "2026-10-24T00:00:00"
+        assert event_data["venue_name"] == "Teatro Juárez"
+        assert event_data["category"] == "theater"
+        assert event_data["price"] == 150
+        assert event_data["is_free"] is False
+        assert event_data["registration_url"] == "https://boletos.example/obra"
+        assert event_data["image_url"] == "https://museo.example/obra.jpg"
+
+    def test_free_online_event(self):
+        event_data = orchestrator._map_json_ld_event({
+            "@type": "Event",
+            "name": "Charla",
+            "location": {"@type": "VirtualLocation", "url": "https://meet.example/x"},
+            "isAccessibleForFree": True,
+            "image": "https://museo.example/charla.jpg",
+        })
+
+        assert event_data["venue_name"] == "En línea"
+        assert event_data["is_free"] is True
+        assert event_data["image_url"] == "https://museo.example/charla.jpg"
+
+    def test_cancelled_events_are_skipped(self):
+        assert orchestrator._map_json_ld_event({
+            "@type": "Event", "name": "Concierto", "eventStatus": "https://schema.org/EventCancelled",
+        }) is None
+
+    @pytest.mark.django_db
+    def test_json_ld_sources_make_no_llm_calls(self):
+        scrape_result = {
+            "content": "",
+            "status_code": 200,
+            "strategy": "json_ld",
+            "event_links": [],
+            "structured_events": [
+                {"@type": "MusicEvent", "name": "Concierto de jazz",
+                 "startDate": (timezone.now() + timedelta(days=7)).isoformat()},
+                {"@type": "Event", "name": "", "startDate": "2026-10-24"},
+            ],
+        }
+
+        with patch("agents.orchestrator.scrape_tool.run", return_value=scrape_result) as mock_scrape, \
+                patch("agents.orchestrator.parse_tool.run_batch") as mock_parse, \
+                patch("agents.orchestrator.llm.get_client") as mock_llm:
+            summary = orchestrator.run_for_source(LISTING["url"], "website", strategy="json_ld", dry_run=True)
+
+        mock_scrape.assert_called_once_with(url=LISTING["url"], strategy="json_ld")
+        mock_parse.assert_not_called()
+        mock_llm.assert_not_called()
+        assert [c["event_data"]["title"] for c in summary["candidates"]] == ["Concierto de jazz"]
+        assert summary["candidates"][0]["event_data"]["category"] == "music"
+        assert summary["usage"]["llm_calls"] == 0
+
+    @pytest.mark.django_db
+    def test_follows_event_links_when_the_listing_has_no_events(self):
+        from guana_know.agents.tests.factories import EventSourceFactory
+
+        source = EventSourceFactory(url=LISTING["url"], scrape_strategy="json_ld")
+        start = (timezone.now() + timedelta(days=7)).isoformat()
+        pages = {
+            LISTING["url"]: {"structured_events": [], "event_links": LISTING["event_links"], "status_code": 200},
+            "https://museo.example/eventos/jazz": {"structured_events": [
+                {"@type": "MusicEvent", "name": "Concierto de jazz", "startDate": start},
+                {"@type": "DanceEvent", "name": "Danza", "startDate": start},
+            ]},
+            "https://museo.example/eventos/danza": {"structured_events": [
+                {"@type": "DanceEvent", "name": "Danza", "startDate": start},
+            ]},
+        }
+
+        with patch("agents.orchestrator.scrape_tool.run", side_effect=lambda url, strategy: pages[url]):
+            summary = orchestrator.run_for_source(LISTING["url"], "website", strategy="json_ld")
+
+        assert summary["written_events"] == 2
+        assert "warning" not in summary
+        source.refresh_from_db()
+        assert source.link_patterns == {"/eventos/*": 2}
+
+    @pytest.mark.django_db
+    def test_sources_without_json_ld_are_flagged_on_the_run(self):
+        from guana_know.agents.models import AgentRun
+
+        pages = {
+            LISTING["url"]: {"structured_events": [], "event_links": ["https://museo.example/eventos/jazz"],
+                             "status_code": 200},
+            "https://museo.example/eventos/jazz": {"structured_events": []},
+        }
+
+        with patch("agents.orchestrator.scrape_tool.run", side_effect=lambda url, strategy: pages[url]):
+            summary = orchestrator.run_for_source(LISTING["url"], "website", strategy="json_ld")
+
+        run = AgentRun.objects.get(source_url=LISTING["url"])
+        assert run.status == "completed"
+        assert run.pages_skipped == 0
+        assert run.errors == [summary["warning"]]
+        assert "generic strategy" in summary["warning"]
@@ -72,7 +72,7 @@ MISSING_DATE_PAYLOAD = {
 
 class TestParseTool:
     @patch.dict("os.environ", {"AZURE_OPENAI_API_KEY": "test-key", "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/"})
-    @patch("agents.tools.parse_tool.AzureOpenAI")
+    @patch("agents.llm.AzureOpenAI")
     def test_returns_events_on_valid_response(self, MockAzureOpenAI):
         client = MockAzureOpenAI.return_value
         client.chat.completions.create.return_value = _make_openai_response(VALID_EVENTS_PAYLOAD)
@@ -91,7 +91,7 @@ class TestParseTool:
         assert event["issues"] == []
 
     @patch.dict("os.environ", {"AZURE_OPENAI_API_KEY": "test-key", "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/"})
-    @patch("agents.tools.parse_tool.AzureOpenAI")
+    @patch("agents.llm.AzureOpenAI")
     def test_returns_events_with_missing_date_issues(self, MockAzureOpenAI):
         client = MockAzureOpenAI.return_value
         client.chat.completions.create.return_value = _make_openai_response(MISSING_DATE_PAYLOAD)
@@ -108,7 +108,7 @@ class TestParseTool:
         assert event["start_datetime"] is None
 
     @patch.dict("os.environ", {"AZURE_OPENAI_API_KEY": "test-key", "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/"})
-    @patch("agents.tools.parse_tool.AzureOpenAI")
+    @patch("agents.llm.AzureOpenAI")
     def test_returns_error_on_invalid_json_response(self, MockAzureOpenAI):
         message = MagicMock()
         message.content = "This is not JSON at all."
@@ -140,7 +140,7 @@ class TestParseTool:
         assert result["events"] == []
 
     @patch.dict("os.environ", {"AZURE_OPENAI_API_KEY": "test-key", "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/"})
-    @patch("agents.tools.parse_tool.AzureOpenAI")
+    @patch("agents.llm.AzureOpenAI")
     def test_returns_empty_events_list_on_api_error(self, MockAzureOpenAI):
         client = MockAzureOpenAI.return_value
         client.chat.completions.create.side_effect = Exception("rate limit exceeded")
@@ -155,7 +155,7 @@ class TestParseTool:
         assert result["events"] == []
 
     @patch.dict("os.environ", {"AZURE_OPENAI_API_KEY": "test-key", "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/"})
-    @patch("agents.tools.parse_tool.AzureOpenAI")
+    @patch("agents.llm.AzureOpenAI")
     def test_passes_source_url_and_type_in_message(self, MockAzureOpenAI):
         client = MockAzureOpenAI.return_value
         client.chat.completions.create.return_value = _make_openai_response({"events": []})
@@ -172,3 +172,154 @@ class TestParseTool:
         assert "https://target.com/eventos" in user_message
         assert "instagram" in user_message
 
+
+
+class TestParseCache:
+    @patch.dict("os.environ", {"AZURE_OPENAI_API_KEY": "test-key", "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/"})
+    @patch("agents.llm.AzureOpenAI")
+    def test_same_content_is_served_from_cache(self, MockAzureOpenAI):
+        client = MockAzureOpenAI.return_value
+        client.chat.completions.create.return_value = _make_openai_response(VALID_EVENTS_PAYLOAD)
+        hits_before = parse_tool.cache_stats()["hits"]
+
+        first = parse_tool.run(content="Exposición el 1 de mayo", source_url="https://a.example", source_type="website")
+        second = parse_tool.run(content="Exposición el 1 de mayo", source_url="https://b.example", source_type="website")
+
+        assert client.chat.completions.create.call_count == 1
+        assert second == first
+        assert parse_tool.cache_stats()["hits"] == hits_before + 1
+
+    @patch.dict("os.environ", {"AZURE_OPENAI_API_KEY": "test-key", "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/"})
+    @patch("agents.llm.AzureOpenAI")
+    def test_prompt_change_invalidates_cache(self, MockAzureOpenAI):
+        client = MockAzureOpenAI.return_value
+        client.chat.completions.create.return_value = _make_openai_response(VALID_EVENTS_PAYLOAD)
+
+        parse_tool.run(content="Exposición el 1 de mayo", source_url="https://a.example", source_type="website")
+        with patch.object(parse_tool, "_SYSTEM_PROMPT", parse_tool._SYSTEM_PROMPT + "\nNew rule."):
+            parse_tool.run(content="Exposición el 1 de mayo", source_url="https://a.example", source_type="website")
+
+        assert client.chat.completions.create.call_count == 2
+
+    def test_batch_instructions_are_part_of_the_key(self):
+        from datetime import date
+
+        key = parse_tool._cache_key("Exposición", "website", None, date(2026, 4, 10))
+        with patch.object(parse_tool, "_BATCH_INSTRUCTIONS", parse_tool._BATCH_INSTRUCTIONS + "\nNew rule."):
+            assert parse_tool._cache_key("Exposición", "website", None, date(2026, 4, 10)) != key
+
+    @patch.dict("os.environ", {"AZURE_OPENAI_API_KEY": "test-key", "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/"})
+    @patch("agents.llm.AzureOpenAI")
+    def test_errors_are_not_cached(self, MockAzureOpenAI):
+        client = MockAzureOpenAI.return_value
+        client.chat.completions.create.side_effect = [
+            Exception("rate limit exceeded"),
+            _make_openai_response(VALID_EVENTS_PAYLOAD),
+        ]
+
+        first = parse_tool.run(content="Exposición", source_url="https://a.example", source_type="website")
+        second = parse_tool.run(content="Exposición", source_url="https://a.example", source_type="website")
+
+        assert "error" in first
+        assert len(second["events"]) == 1
+
+    def test_relative_dates_are_scoped_to_the_day(self):
+        from datetime import date
+
+        today = date(2026, 4, 10)
+        assert parse_tool._date_scope("Este sábado: concierto", today) == "2026-04-10"
+        assert parse_tool._date_scope("Hoy a las 20:00", today) == "2026-04-10"
+        assert parse_tool._date_scope("Viernes 24 a las 10 de la mañana", today) == "2026-04-10"
+
+    def test_dates_with_a_month_or_year_are_scoped_to_the_month(self):
+        from datetime import date
+
+        today = date(2026, 4, 10)
+        assert parse_tool._date_scope("Viernes 24 de abril a las 10 de la mañana", today) == "2026-04"
+        assert parse_tool._date_scope("Función: 24/04, 20:00 h", today) == "2026-04"
+        assert parse_tool._date_scope("Temporada 2026", today) == "2026-04"
+        assert parse_tool._date_scope("Este sábado 25 de abril", today) == "2026-04-10"
+
+
+class TestSharedLLMClient:
+    @patch.dict("os.environ", {"AZURE_OPENAI_API_KEY": "test-key", "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/"})
+    @patch("agents.llm.AzureOpenAI")
+    def test_client_is_built_once_across_calls(self, MockAzureOpenAI):
+        client = MockAzureOpenAI.return_value
+        client.chat.completions.create.return_value = _make_openai_response({"events": []})
+
+        parse_tool.run(content="página uno", source_url="https://a.example", source_type="website")
+        parse_tool.run(content="página dos", source_url="https://b.example", source_type="website")
+
+        assert MockAzureOpenAI.call_count == 1
+        assert client.chat.completions.create.call_count == 2
+
+
+BATCH_PAGES = [
+    {"content": "Concierto de jazz el viernes 24", "source_url": "https://museo.example/jazz"},
+    {"content": "Exposición de pintura en mayo", "source_url": "https://museo.example/pintura"},
+    {"content": "Taller de grabado", "source_url": "https://museo.example/grabado"},
+]
+
+
+def _event(title: str) -> dict:
+    return {**VALID_EVENTS_PAYLOAD["events"][0], "title": title}
+
+
+class TestRunBatch:
+    @patch.dict("os.environ", {"AZURE_OPENAI_API_KEY": "test-key", "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/"})
+    @patch("agents.llm.AzureOpenAI")
+    def test_packs_pages_into_one_request(self, MockAzureOpenAI):
+        client = MockAzureOpenAI.return_value
+        client.chat.completions.create.return_value = _make_openai_response({
+            "pages": [
+                {"page": 1, "source_url": "https://museo.example/jazz", "events": [_event("Jazz")]},
+                {"page": 2, "source_url": "https://museo.example/pintura", "events": [_event("Pintura")]},
+                {"page": 3, "source_url": "https://museo.example/grabado", "events": []},
+            ]
+        })
+
+        results = parse_tool.run_batch(BATCH_PAGES, "website")
+
+        assert client.chat.completions.create.call_count == 1
+        assert [[e["title"] for e in r["events"]] for r in results] == [["Jazz"], ["Pintura"], []]
+        user_message = client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+        assert "=== PAGE 3 ===" in user_message
+
+    @patch.dict("os.environ", {"AZURE_OPENAI_API_KEY": "test-key", "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/"})
+    @patch("agents.llm.AzureOpenAI")
+    def test_falls_back_to_single_calls_when_batch_fails(self, MockAzureOpenAI):
+        client = MockAzureOpenAI.return_value
+        client.chat.completions.create.side_effect = [
+            Exception("context length exceeded"),
+            _make_openai_response({"events": [_event("Jazz")]}),
+            _make_openai_response({"events": [_event("Pintura")]}),
+            _make_openai_response({"events": [_event("Grabado")]}),
+        ]
+
+        results = parse_tool.run_batch(BATCH_PAGES, "website")
+
+        assert client.chat.completions.create.call_count == 4
+        assert [r["events"][0]["title"] for r in results] == ["Jazz", "Pintura", "Grabado"]
+
+    @patch.dict("os.environ", {"AZURE_OPENAI_API_KEY": "test-key", "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/"})
+    @patch("agents.llm.AzureOpenAI")
+    def test_retries_pages_missing_from_batch_response(self, MockAzureOpenAI):
+        client = MockAzureOpenAI.return_value
+        client.chat.completions.create.side_effect = [
+            _make_openai_response({"pages": [
+                {"page": 1, "source_url": "https://museo.example/jazz", "events": [_event("Jazz")]},
+                {"page": 2, "source_url": "https://museo.example/pintura", "events": [_event("Pintura")]},
+            ]}),
+            _make_openai_response({"events": [_event("Grabado")]}),
+        ]
+
+        results = parse_tool.run_batch(BATCH_PAGES, "website")
+
+        assert client.chat.completions.create.call_count == 2
+        assert results[2]["events"][0]["title"] == "Grabado"
+
+    def test_respects_token_budget(self):
+        pages = [{"content": "x" * 40_000, "source_url": f"https://museo.example/{i}"} for i in range(3)]
+
+        assert parse_tool._pack_batches([0, 1, 2], pages) == [[0], [1], [2]]
@@ -0,0 +1,68 @@
+"""
+Tests for the run_discovery_agent management command.
+
+run_for_source is patched; no LLM or network access is needed.
+"""
+
+import io
+import threading
+import time
+from collections import defaultdict
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+
+from guana_know.agents.tests.factories import EventSourceFactory
+
+
+def _result(llm_calls: int = 1) -> dict:
+    return {
+        "candidates": [],
+        "total_found": 0,
+        "total_duplicates": 0,
+        "usage": {"llm_calls": llm_calls, "prompt_tokens": 100, "completion_tokens": 10,
+                  "estimated_cost": 0.001, "bytes_fetched": 2048},
+    }
+
+
+@pytest.mark.django_db
+class TestConcurrentRuns:
+    def test_per_domain_limit_does_not_hold_up_other_domains(self):
+        facebook = EventSourceFactory.create_batch(6, facebook=True)
+        websites = EventSourceFactory.create_batch(2)
+        broken = facebook[3].url
+
+        lock = threading.Lock()
+        running = defaultdict(int)
+        peak = defaultdict(int)
+        finished = []
+
+        def fake_run(url, source_type, **kwargs):
+            domain = "facebook" if "facebook" in url else "other"
+            with lock:
+                running[domain] += 1
+                running["all"] += 1
+                peak[domain] = max(peak[domain], running[domain])
+                peak["all"] = max(peak["all"], running["all"])
+            time.sleep(0.05)
+            with lock:
+                running[domain] -= 1
+                running["all"] -= 1
+                finished.append(url)
+            if url == broken:
+                raise RuntimeError("page gone")
+            return _result()
+
+        out = io.StringIO()
+        with patch("agents.orchestrator.run_for_source", side_effect=fake_run):
+            call_command("run_discovery_agent", "--dry-run", "--workers", "3", "--per-domain", "1", stdout=out)
+
+        assert peak["facebook"] == 1
+        assert peak["all"] >= 2
+        # The two other domains did not wait for the facebook queue to drain.
+        assert finished.index(websites[1].url) < len(finished) - 3
+        output = out.getvalue()
+        assert "Sources: 7 succeeded, 1 failed" in output
+        assert "LLM calls: 7  |  Tokens: 770" in output
+        assert f"{broken} — page gone" in output
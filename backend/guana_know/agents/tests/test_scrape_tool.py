@@ -0,0 +1,244 @@
+"""
+Tests for agents/tools/scrape_tool.py
+
+HTTP is served by httpx.MockTransport — no network access required.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+
+from agents.tools import scrape_tool
+
+
+PAGE_HTML = """
+<html>
+  <head><meta property="og:image" content="https://museo.example/poster.jpg"></head>
+  <body>
+    <main>
+      <h1>Concierto de jazz</h1>
+      <a href="/eventos/jazz">Ver evento</a>
+    </main>
+  </body>
+</html>
+"""
+
+
+def _scrape(handler, url="https://museo.example/agenda") -> dict:
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await scrape_tool.scrape_async(client, url)
+
+    return asyncio.run(run())
+
+
+class TestConditionalGet:
+    def test_revalidates_with_etag_and_reuses_cached_extraction(self):
+        seen_headers = []
+
+        def handler(request):
+            seen_headers.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/html", "etag": '"v1"'},
+                text=PAGE_HTML,
+            )
+
+        first = _scrape(handler)
+        second = _scrape(handler)
+
+        assert seen_headers == [None, '"v1"']
+        assert second["from_cache"] is True
+        assert second["content"] == first["content"]
+        assert second["image_url"] == "https://museo.example/poster.jpg"
+        assert second["event_links"] == ["https://museo.example/eventos/jazz"]
+
+    def test_sends_if_modified_since_from_last_modified(self):
+        seen = []
+        last_modified = "Wed, 01 Apr 2026 10:00:00 GMT"
+
+        def handler(request):
+            seen.append(request.headers.get("if-modified-since"))
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/html", "last-modified": last_modified},
+                text=PAGE_HTML,
+            )
+
+        _scrape(handler)
+        _scrape(handler)
+
+        assert seen == [None, last_modified]
+
+    def test_does_not_cache_responses_without_validators(self):
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers.get("if-none-match"))
+            return httpx.Response(200, headers={"content-type": "text/html"}, text=PAGE_HTML)
+
+        _scrape(handler)
+        result = _scrape(handler)
+
+        assert seen == [None, None]
+        assert "from_cache" not in result
+
+    def test_expired_entries_are_fetched_in_full(self, monkeypatch):
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers.get("if-none-match"))
+            return httpx.Response(200, headers={"content-type": "text/html", "etag": '"v1"'}, text=PAGE_HTML)
+
+        _scrape(handler)
+        monkeypatch.setattr(scrape_tool._http_cache, "ttl_seconds", -1)
+        _scrape(handler)
+
+        assert seen == [None, None]
+        assert scrape_tool._http_cache.max_entries == scrape_tool._CACHE_MAX_ENTRIES
+
+    def test_does_not_cache_error_responses(self):
+        def handler(request):
+            return httpx.Response(500, headers={"etag": '"v1"'})
+
+        result = _scrape(handler)
+
+        assert result["error"] == "HTTP 500"
+        assert scrape_tool._http_cache.get("https://museo.example/agenda") is None
+
+
+class TestSharedClient:
+    def test_generic_scrape_uses_shared_client(self):
+        requested = []
+
+        def handler(request):
+            requested.append(str(request.url))
+            return httpx.Response(200, headers={"content-type": "text/html"}, text=PAGE_HTML)
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        with patch("agents.http_client.get_client", return_value=client):
+            result = scrape_tool.run(url="https://museo.example/agenda")
+
+        assert requested == ["https://museo.example/agenda"]
+        assert "Concierto de jazz" in result["content"]
+
+
+class TestStreamingFetch:
+    def _run(self, handler) -> dict:
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        with patch("agents.http_client.get_client", return_value=client):
+            return scrape_tool.run(url="https://museo.example/agenda")
+
+    def test_stops_reading_at_the_byte_cap(self, monkeypatch):
+        monkeypatch.setattr(scrape_tool, "_MAX_BYTES", 1000)
+        chunks_read = []
+
+        def body():
+            for _ in range(100):
+                chunks_read.append(1)
+                yield b"x" * 100
+
+        result = self._run(lambda request: httpx.Response(
+            200, headers={"content-type": "text/plain"}, content=body(),
+        ))
+
+        assert result["bytes_read"] == 1000
+        assert result["bytes_truncated"] is True
+        assert result["truncated"] is True
+        assert result["content"] == "x" * 1000
+        # The chunk after the cap shows there was more; nothing beyond it is read.
+        assert len(chunks_read) == 11
+
+    def test_body_of_exactly_the_cap_is_not_truncated(self, monkeypatch):
+        monkeypatch.setattr(scrape_tool, "_MAX_BYTES", 1000)
+
+        result = self._run(lambda request: httpx.Response(
+            200, headers={"content-type": "text/plain"}, content=iter([b"x" * 600, b"x" * 400]),
+        ))
+
+        assert result["bytes_read"] == 1000
+        assert result["bytes_truncated"] is False
+
+    def test_request_errors_name_the_url(self):
+        def handler(request):
+            raise httpx.ConnectError("connection refused", request=request)
+
+        result = self._run(handler)
+
+        assert result["error"] == "connection refused"
+        assert result["url"] == "https://museo.example/agenda"
+
+    def test_decodes_multibyte_characters_split_across_chunks(self):
+        encoded = "Función de teatro".encode("utf-8")
+        split = encoded.index("ó".encode("utf-8")) + 1
+
+        result = self._run(lambda request: httpx.Response(
+            200, headers={"content-type": "text/plain; charset=utf-8"},
+            content=iter([encoded[:split], encoded[split:]]),
+        ))
+
+        assert result["content"] == "Función de teatro"
+        assert result["bytes_truncated"] is False
+
+    def test_abandons_non_text_responses_without_reading_them(self):
+        def body():
+            raise AssertionError("body should not be read")
+            yield b""
+
+        result = self._run(lambda request: httpx.Response(
+            200, headers={"content-type": "application/pdf"}, content=body(),
+        ))
+
+        assert result["error"] == "Unsupported content type: application/pdf"
+        assert result["content"] == ""
+
+
+JSON_LD_PAGE = """
+<html>
+  <head>
+    <script type="application/ld+json">
+      {"@context": "https://schema.org", "@graph": [
+        {"@type": "WebSite", "name": "Museo"},
+        {"@type": "MusicEvent", "name": "Concierto de jazz", "startDate": "2026-10-24T19:00:00-06:00"}
+      ]}
+    </script>
+    <script type="application/ld+json">{"@type": "Event", "name": "Lectura", }</script>
+  </head>
+  <body><p>Agenda</p></body>
+</html>
+"""
+
+
+class TestJsonLdStrategy:
+    def test_returns_event_objects_as_structured_events(self):
+        client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(
+            200, headers={"content-type": "text/html; charset=utf-8"}, text=JSON_LD_PAGE,
+        )))
+        with patch("agents.http_client.get_client", return_value=client):
+            result = scrape_tool.run(url="https://museo.example/agenda", strategy="json_ld")
+
+        assert result["strategy"] == "json_ld"
+        assert result["content"] == ""
+        # The second block is malformed and skipped.
+        assert [event["name"] for event in result["structured_events"]] == ["Concierto de jazz"]
+
+    def test_listing_without_events_returns_ranked_event_links(self):
+        client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(
+            200, headers={"content-type": "text/html"}, text=PAGE_HTML,
+        )))
+        with patch("agents.http_client.get_client", return_value=client):
+            result = scrape_tool.run(url="https://museo.example/agenda", strategy="json_ld")
+
+        assert result["structured_events"] == []
+        assert result["event_links"] == ["https://museo.example/eventos/jazz"]
+
+    def test_http_errors_are_reported(self):
+        client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(404)))
+        with patch("agents.http_client.get_client", return_value=client):
+            result = scrape_tool.run(url="https://museo.example/agenda", strategy="json_ld")
+
+        assert result["error"] == "HTTP 404"
+        assert result["strategy"] == "json_ld"
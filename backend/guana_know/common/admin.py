@@ -0,0 +1,42 @@
+"""
+Admin helpers shared by the events and venues apps.
+"""
+
+from django.db import transaction
+
+from . import image_jobs, images, media
+
+
+class QueuedImageAdminMixin:
+    """
+    Routes changes to a model's image made in the admin through the media
+    store: uploads are queued as ImageJobs like upload-image requests, and
+    clearing the field releases the stored image and its variants.
+    """
+
+    def save_model(self, request, obj, form, change):
+        if 'image' not in form.changed_data:
+            return super().save_model(request, obj, form, change)
+
+        upload = form.cleaned_data.get('image')
+        previous = (
+            type(obj).objects.filter(pk=obj.pk).values_list('image', flat=True).first()
+            if change else ''
+        ) or ''
+        # The form already put the upload on the instance; keep the stored
+        # name until the job has processed it.
+        obj.image = previous
+
+        if upload is False:
+            previous_variants = obj.image_variants
+            obj.image = ''
+            obj.image_variants = {}
+            obj.image_status = 'ready'
+            super().save_model(request, obj, form, change)
+            transaction.on_commit(lambda: media.release(previous))
+            transaction.on_commit(lambda: images.release_variants(previous_variants))
+            return
+
+        super().save_model(request, obj, form, change)
+        if upload:
+            image_jobs.enqueue(obj, upload)
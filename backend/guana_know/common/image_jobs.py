@@ -0,0 +1,160 @@
+"""
+Background processing of uploaded images.
+
+upload-image requests only write the file to local staging
+(settings.IMAGE_STAGING_ROOT), mark the target image_status='pending' and
+queue an ImageJob, so the response does not wait for Azure Blob or for
+resizing. The process_image_jobs command claims queued jobs, moves the
+image into the content-addressed media store, renders its variants and
+sets image_status back to 'ready' (or 'failed' after MAX_ATTEMPTS).
+
+The queue is a plain table: no broker is needed, and locally the worker
+runs against the same database as the web process.
+"""
+
+import logging
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import images, media
+from .models import ImageJob
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+
+# Jobs left in 'processing' longer than this (worker killed mid-job) are
+# picked up again.
+STALE_AFTER = timedelta(minutes=10)
+
+
+def staging_storage() -> FileSystemStorage:
+    return FileSystemStorage(location=settings.IMAGE_STAGING_ROOT)
+
+
+def enqueue(instance, upload, field: str = 'image') -> ImageJob:
+    """
+    Stages upload for instance.<field> and queues it for processing.
+    Sets and saves instance.image_status = 'pending'.
+    """
+    extension = os.path.splitext(upload.name or '')[1].lower()
+    staged_name = staging_storage().save(f'{uuid.uuid4().hex}{extension}', upload)
+
+    with transaction.atomic():
+        job = ImageJob.objects.create(
+            target_type=ContentType.objects.get_for_model(instance),
+            target_id=instance.pk,
+            field=field,
+            staged_name=staged_name,
+            original_name=(upload.name or '')[:255],
+        )
+        instance.image_status = 'pending'
+        instance.save(update_fields=['image_status', 'updated_at'])
+    return job
+
+
+def claim_next() -> ImageJob | None:
+    """Marks the oldest runnable job as processing and returns it."""
+    stale = timezone.now() - STALE_AFTER
+    with transaction.atomic():
+        job = (
+            ImageJob.objects.select_for_update(skip_locked=True)
+            .filter(Q(status='pending') | Q(status='processing', started_at__lt=stale))
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = 'processing'
+        job.attempts += 1
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'attempts', 'started_at', 'updated_at'])
+    return job
+
+
+def process(job: ImageJob) -> bool:
+    """
+    Stores the staged image on the job's target and renders its variants.
+    Returns True on success; failures are retried until MAX_ATTEMPTS.
+    """
+    staging = staging_storage()
+    target = job.target
+    if target is None:
+        _finish(job, 'failed', 'Target no longer exists.')
+        staging.delete(job.staged_name)
+        return False
+
+    # A later upload for the same field supersedes this one.
+    newer = ImageJob.objects.filter(
+        target_type=job.target_type, target_id=job.target_id, field=job.field,
+        created_at__gt=job.created_at,
+    ).exists()
+    if newer:
+        _finish(job, 'done', 'Superseded by a newer upload.')
+        staging.delete(job.staged_name)
+        return True
+
+    # The new image and its variants are stored (each write commits its own
+    # reference) before the target is switched over in one transaction. The
+    # previous ones are released only once that commits; if anything fails,
+    # the references this attempt added are dropped again instead.
+    name = None
+    variants = {}
+    try:
+        with staging.open(job.staged_name, 'rb') as staged:
+            staged.name = job.staged_name
+            name = media.store(staged)
+        variants = images.build_variants(name)
+
+        previous_name = getattr(target, job.field).name
+        previous_variants = target.image_variants
+        with transaction.atomic():
+            setattr(target, job.field, name)
+            target.image_variants = variants
+            target.image_status = 'ready'
+            target.save(update_fields=[job.field, 'image_variants', 'image_status', 'updated_at'])
+            transaction.on_commit(lambda: media.release(previous_name))
+            transaction.on_commit(lambda: images.release_variants(previous_variants))
+    except Exception as exc:
+        logger.exception('image_jobs: job %s failed (attempt %d)', job.pk, job.attempts)
+        media.release(name)
+        images.release_variants(variants)
+        if job.attempts >= MAX_ATTEMPTS:
+            _finish(job, 'failed', str(exc))
+            type(target).objects.filter(pk=target.pk).update(image_status='failed')
+        else:
+            job.status = 'pending'
+            job.error = str(exc)
+            job.save(update_fields=['status', 'error', 'updated_at'])
+        return False
+
+    _finish(job, 'done')
+    staging.delete(job.staged_name)
+    return True
+
+
+def process_pending(limit: int | None = None) -> int:
+    """Processes queued jobs until the queue is empty (or limit jobs ran). Returns the count."""
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_next()
+        if job is None:
+            break
+        process(job)
+        processed += 1
+    return processed
+
+
+def _finish(job: ImageJob, status: str, error: str = '') -> None:
+    job.status = status
+    job.error = error
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'finished_at', 'updated_at'])
@@ -0,0 +1,111 @@
+"""
+Resized renditions of event and venue images.
+
+Every stored original gets a set of variants (card, detail, og), each in
+WebP and JPEG, so list cards download a few dozen KB instead of the
+multi-MB original. EXIF metadata (camera data, GPS) is dropped; the EXIF
+orientation is applied to the pixels first so photos stay upright.
+
+render_variants() only works on bytes and is safe to run in a worker
+process; store_variants() writes its output to the content-addressed
+media store (guana_know.common.media), so identical originals share
+their variants too. The result, stored in the model's image_variants field,
+looks like {'card': {'webp': name, 'jpeg': name}, ...}.
+"""
+
+import io
+import logging
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from . import media
+
+logger = logging.getLogger(__name__)
+
+# name → (width, height, crop). Without crop the image is scaled down to fit
+# the box; with crop it is scaled and center-cropped to exactly that size.
+VARIANTS = {
+    'card': (480, 360, False),
+    'detail': (1200, 1200, False),
+    'og': (1200, 630, True),
+}
+
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def render_variants(data: bytes) -> dict[str, dict[str, bytes]]:
+    """Returns {variant: {format: bytes}} for an encoded image."""
+    with Image.open(io.BytesIO(data)) as original:
+        original.load()
+        image = ImageOps.exif_transpose(original)
+
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+    if image.mode == 'RGBA':
+        # JPEG has no alpha channel; flatten onto white for both formats.
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+
+    rendered = {}
+    for variant, (width, height, crop) in VARIANTS.items():
+        if crop:
+            resized = ImageOps.fit(image, (width, height), Image.LANCZOS)
+        else:
+            resized = image.copy()
+            resized.thumbnail((width, height), Image.LANCZOS)
+        rendered[variant] = {}
+        for fmt, (pil_format, options) in FORMATS.items():
+            buffer = io.BytesIO()
+            # No exif= argument: the renditions carry no metadata.
+            resized.save(buffer, pil_format, **options)
+            rendered[variant][fmt] = buffer.getvalue()
+    return rendered
+
+
+def store_variants(rendered: dict[str, dict[str, bytes]], references: int = 1) -> dict:
+    """Writes render_variants() output to the media store and returns the names."""
+    return {
+        variant: {
+            fmt: media.store(ContentFile(data, name=f'{variant}.{"jpg" if fmt == "jpeg" else fmt}'),
+                             references=references)
+            for fmt, data in formats.items()
+        }
+        for variant, formats in rendered.items()
+    }
+
+
+def release_variants(variants: dict | None, references: int = 1) -> None:
+    for formats in (variants or {}).values():
+        for name in formats.values():
+            media.release(name, references=references)
+
+
+def build_variants(name: str, references: int = 1) -> dict:
+    """
+    Renders and stores the variants of the stored image name.
+    Returns {} if the file is missing or is not a readable image.
+    """
+    try:
+        with default_storage.open(name, 'rb') as original:
+            data = original.read()
+        return store_variants(render_variants(data), references=references)
+    except Exception as exc:
+        logger.warning('build_variants: could not render %s — %s', name, exc)
+        return {}
+
+
+def variant_urls(variants: dict | None, request=None) -> dict:
+    """Maps stored variant names to URLs (absolute when a request is given)."""
+    urls = {}
+    for variant, formats in (variants or {}).items():
+        urls[variant] = {}
+        for fmt, name in formats.items():
+            url = default_storage.url(name)
+            urls[variant][fmt] = request.build_absolute_uri(url) if request is not None else url
+    return urls
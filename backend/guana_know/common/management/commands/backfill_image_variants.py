@@ -0,0 +1,87 @@
+"""
+Renders image variants for events and venues that don't have them yet.
+
+Decoding and resizing is CPU-bound, so it runs in a process pool; the
+parent process reads originals and writes the results to the media store.
+
+Usage:
+    python manage.py backfill_image_variants
+    python manage.py backfill_image_variants --model event --workers 8
+    python manage.py backfill_image_variants --force   # re-render everything
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from guana_know.common import images
+from guana_know.events.models import Event
+from guana_know.venues.models import Venue
+
+MODELS = {'event': Event, 'venue': Venue}
+
+
+class Command(BaseCommand):
+    help = 'Generate resized WebP/JPEG variants for existing event and venue images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', choices=sorted(MODELS), help='Only backfill this model.')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Worker processes (default: CPU count).')
+        parser.add_argument('--force', action='store_true',
+                            help='Re-render instances that already have variants.')
+
+    def handle(self, *args, **options):
+        models = [MODELS[options['model']]] if options['model'] else list(MODELS.values())
+        workers = max(1, options['workers'])
+        done = failed = 0
+        # Renders in flight; bounded so originals are not all held in memory.
+        pending = deque()
+
+        def apply_oldest():
+            nonlocal done, failed
+            instance, future = pending.popleft()
+            if self._apply(instance, future):
+                done += 1
+            else:
+                failed += 1
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for model in models:
+                queryset = model.objects.exclude(image='').exclude(image__isnull=True)
+                if not options['force']:
+                    queryset = queryset.filter(image_variants={})
+
+                for instance in queryset.iterator(chunk_size=100):
+                    name = instance.image.name
+                    try:
+                        with default_storage.open(name, 'rb') as original:
+                            data = original.read()
+                    except Exception as exc:
+                        self.stderr.write(f'  ✗ {model.__name__} {instance.pk}: cannot read {name} ({exc})')
+                        failed += 1
+                        continue
+                    pending.append((instance, pool.submit(images.render_variants, data)))
+                    if len(pending) >= workers * 2:
+                        apply_oldest()
+
+            while pending:
+                apply_oldest()
+
+        self.stdout.write(self.style.SUCCESS(f'Variants generated: {done}, failed: {failed}'))
+
+    def _apply(self, instance, future) -> bool:
+        try:
+            rendered = future.result()
+        except Exception as exc:
+            self.stderr.write(f'  ✗ {type(instance).__name__} {instance.pk}: {exc}')
+            return False
+        previous = instance.image_variants
+        instance.image_variants = images.store_variants(rendered)
+        instance.save(update_fields=['image_variants', 'updated_at'])
+        images.release_variants(previous)
+        self.stdout.write(f'  ✓ {type(instance).__name__} {instance.pk}')
+        return True
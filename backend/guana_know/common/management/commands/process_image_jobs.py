@@ -0,0 +1,40 @@
+"""
+Works off the ImageJob queue filled by the upload-image endpoints.
+
+Usage:
+    python manage.py process_image_jobs            # run until interrupted
+    python manage.py process_image_jobs --once     # drain the queue and exit
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from guana_know.common import image_jobs
+
+
+class Command(BaseCommand):
+    help = 'Process uploaded images waiting in staging (store, resize, publish).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Process the jobs queued right now, then exit.')
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help='Seconds to wait when the queue is empty (default: 2).')
+
+    def handle(self, *args, **options):
+        if options['once']:
+            processed = image_jobs.process_pending()
+            self.stdout.write(self.style.SUCCESS(f'Processed {processed} image job(s).'))
+            return
+
+        self.stdout.write('Waiting for image jobs (Ctrl+C to stop)...')
+        try:
+            while True:
+                processed = image_jobs.process_pending()
+                if processed:
+                    self.stdout.write(f'Processed {processed} image job(s).')
+                else:
+                    time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Stopped.')
@@ -0,0 +1,98 @@
+"""
+Content-addressed media storage on top of Django's default storage.
+
+Images are stored under the SHA-256 of their bytes ("media/ab/abcd….jpg"),
+so identical uploads (venue logos, a poster reused by every event of a
+series) occupy one blob and one CDN cache entry. Each blob has a
+StoredMedia row counting the fields that reference it; release() drops a
+reference and deletes the blob once nothing points at it. Works with any
+storage backend (local disk, Azure Blob).
+"""
+
+import hashlib
+import logging
+import os
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F
+
+from .models import StoredMedia
+
+logger = logging.getLogger(__name__)
+
+MEDIA_PREFIX = 'media'
+
+
+def content_hash(content) -> str:
+    """SHA-256 hex digest of a File's bytes."""
+    digest = hashlib.sha256()
+    content.seek(0)
+    for chunk in content.chunks():
+        digest.update(chunk)
+    content.seek(0)
+    return digest.hexdigest()
+
+
+def store(content, references: int = 1) -> str:
+    """
+    Stores content (a django File) once per distinct byte sequence and
+    returns its storage name. The blob is written only if it is new;
+    either way its reference count grows by references.
+    """
+    digest = content_hash(content)
+    extension = os.path.splitext(content.name or '')[1].lower() or '.jpg'
+
+    with transaction.atomic():
+        media, created = StoredMedia.objects.select_for_update().get_or_create(
+            sha256=digest,
+            defaults={
+                'name': f'{MEDIA_PREFIX}/{digest[:2]}/{digest}{extension}',
+                'size': content.size or 0,
+            },
+        )
+        if created or not default_storage.exists(media.name):
+            saved_name = default_storage.save(media.name, content)
+            if saved_name != media.name:
+                media.name = saved_name
+                media.save(update_fields=['name', 'updated_at'])
+        StoredMedia.objects.filter(pk=media.pk).update(ref_count=F('ref_count') + references)
+
+    if not created:
+        logger.debug('media.store: reusing %s', media.name)
+    return media.name
+
+
+def release(name: str | None, references: int = 1) -> None:
+    """
+    Drops references to the blob stored as name, deleting it when none are
+    left. Names not managed by the media store (files saved before it
+    existed) are left alone.
+    """
+    if not name:
+        return
+    with transaction.atomic():
+        media = StoredMedia.objects.select_for_update().filter(name=name).first()
+        if media is None:
+            return
+        media.ref_count = max(0, media.ref_count - references)
+        if media.ref_count:
+            media.save(update_fields=['ref_count', 'updated_at'])
+            return
+        media.delete()
+        transaction.on_commit(lambda: default_storage.delete(name))
+
+
+def replace(instance, field: str, content) -> str:
+    """
+    Points instance.<field> at the stored copy of content and releases the
+    file it referenced before. Does not save instance.
+
+    Inside a transaction the previous file is released only once it
+    commits, so a failure before instance is saved leaves it referenced.
+    """
+    previous = getattr(instance, field).name
+    name = store(content)
+    setattr(instance, field, name)
+    transaction.on_commit(lambda: release(previous))
+    return name
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.10 on 2026-10-18 06:55
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="StoredMedia",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("sha256", models.CharField(max_length=64, unique=True)),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Name in the default storage.",
+                        max_length=255,
+                        unique=True,
+                    ),
+                ),
+                ("size", models.PositiveIntegerField(default=0)),
+                ("ref_count", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Stored Media",
+                "verbose_name_plural": "Stored Media",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
@@ -3,6 +3,8 @@ Common base models for all Guana Know apps.
 """
 
 import uuid
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
 
 
@@ -20,3 +22,64 @@ class BaseModel(models.Model):
     class Meta:
         abstract = True
         ordering = ['-created_at']
+
+
+class StoredMedia(BaseModel):
+    """
+    One stored blob, addressed by the SHA-256 of its bytes.
+
+    ref_count is the number of model fields pointing at name; the blob is
+    deleted when it drops to zero. See guana_know.common.media.
+    """
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=255, unique=True, help_text='Name in the default storage.')
+    size = models.PositiveIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Stored Media'
+        verbose_name_plural = 'Stored Media'
+
+    def __str__(self):
+        return f'{self.name} ({self.ref_count} refs)'
+
+
+class ImageJob(BaseModel):
+    """
+    An uploaded image waiting in local staging to be processed.
+
+    Created by guana_know.common.image_jobs.enqueue() and worked off by the
+    process_image_jobs command, which stores the image and its variants
+    on the target's image field.
+    """
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    target_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    target_id = models.UUIDField()
+    target = GenericForeignKey('target_type', 'target_id')
+    field = models.CharField(max_length=50, default='image')
+    staged_name = models.CharField(max_length=255, help_text='File name in the image staging storage.')
+    original_name = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['target_type', 'target_id']),
+        ]
+
+    def __str__(self):
+        return f'{self.target_type.model} {self.target_id} ({self.status})'
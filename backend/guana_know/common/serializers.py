@@ -0,0 +1,17 @@
+"""
+Serializer fields shared by Guana Know apps.
+"""
+
+from rest_framework import serializers
+
+from .images import variant_urls
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """
+    Read-only URLs for a model's image_variants JSON, e.g.
+    {'card': {'webp': url, 'jpeg': url}, ...}. Declare it as image_variants.
+    """
+
+    def to_representation(self, value):
+        return variant_urls(value, self.context.get('request'))
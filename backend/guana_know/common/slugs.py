@@ -0,0 +1,107 @@
+"""
+Unique slug allocation shared by events, venues and the discovery agent.
+
+next_free_slug finds the first free "<base>", "<base>-1", "<base>-2", ...
+with one prefix query instead of probing each candidate. Two workers can
+still pick the same slug between that query and their INSERT, so
+create_with_unique_slug retries the insert on an IntegrityError for the slug.
+bulk_create_with_unique_slugs does the same for a whole batch of instances.
+"""
+
+import logging
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+logger = logging.getLogger(__name__)
+
+# Room kept at the end of the slug column for a "-<n>" suffix.
+_SUFFIX_RESERVE = 5
+
+
+def slug_base(value: str, model, field: str = 'slug', fallback: str = 'item') -> str:
+    """Slugifies value, truncated so a numeric suffix still fits the column."""
+    max_length = model._meta.get_field(field).max_length
+    base = slugify(value or '')[:max_length - _SUFFIX_RESERVE].strip('-')
+    return base or fallback
+
+
+def next_free_slug(model, base: str, field: str = 'slug') -> str:
+    """Returns base, or base-<n> with the smallest n not yet used, in one query."""
+    taken = set(
+        model._default_manager
+        .filter(**{f'{field}__startswith': base})
+        .values_list(field, flat=True)
+    )
+    return _first_free(base, taken)
+
+
+def allocate_slugs(model, bases: list[str], field: str = 'slug') -> list[str]:
+    """
+    Returns one free slug per base, distinct from each other, with a single
+    query for all bases.
+    """
+    query = Q()
+    for base in set(bases):
+        query |= Q(**{f'{field}__startswith': base})
+    taken = set(model._default_manager.filter(query).values_list(field, flat=True)) if bases else set()
+
+    slugs = []
+    for base in bases:
+        slug = _first_free(base, taken)
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def _first_free(base: str, taken: set) -> str:
+    if base not in taken:
+        return base
+    counter = 1
+    while f'{base}-{counter}' in taken:
+        counter += 1
+    return f'{base}-{counter}'
+
+
+def create_with_unique_slug(model, base: str, field: str = 'slug', attempts: int = 5, **fields):
+    """
+    Creates a model instance with the first free slug derived from base.
+
+    If a concurrent writer claims the same slug first, the insert fails with
+    an IntegrityError; the slug is then re-allocated and the insert retried.
+    """
+    for attempt in range(1, attempts + 1):
+        slug = next_free_slug(model, base, field)
+        try:
+            with transaction.atomic():
+                return model._default_manager.create(**{field: slug}, **fields)
+        except IntegrityError:
+            slug_taken = model._default_manager.filter(**{field: slug}).exists()
+            if not slug_taken or attempt == attempts:
+                raise
+            logger.info('create_with_unique_slug: %s "%s" was taken concurrently, retrying',
+                        model.__name__, slug)
+
+
+def bulk_create_with_unique_slugs(model, instances: list, bases: list[str], field: str = 'slug',
+                                  attempts: int = 5, batch_size: int = 500) -> list:
+    """
+    bulk_create()s instances after giving each a free slug derived from the
+    matching entry in bases. Retries with fresh slugs if a concurrent writer
+    claimed one of them in the meantime.
+    """
+    if not instances:
+        return []
+    for attempt in range(1, attempts + 1):
+        slugs = allocate_slugs(model, bases, field)
+        for instance, slug in zip(instances, slugs):
+            setattr(instance, field, slug)
+        try:
+            with transaction.atomic():
+                return model._default_manager.bulk_create(instances, batch_size=batch_size)
+        except IntegrityError:
+            slug_taken = model._default_manager.filter(**{f'{field}__in': slugs}).exists()
+            if not slug_taken or attempt == attempts:
+                raise
+            logger.info('bulk_create_with_unique_slugs: %s slug collision, retrying', model.__name__)
@@ -0,0 +1,210 @@
+"""
+Tests for guana_know/common/image_jobs.py and the upload-image endpoints.
+"""
+
+import io
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from django.contrib.admin.sites import site
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from guana_know.common import image_jobs, images, media
+from guana_know.common.models import ImageJob, StoredMedia
+from guana_know.events.tests.factories import EventFactory
+from guana_know.venues.models import Venue
+from guana_know.venues.tests.factories import VenueFactory
+
+
+def _upload(name="logo.jpg") -> SimpleUploadedFile:
+    buffer = io.BytesIO()
+    Image.new("RGB", (800, 600), (30, 30, 200)).save(buffer, "JPEG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/jpeg")
+
+
+@pytest.fixture(autouse=True)
+def storage_roots(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    settings.IMAGE_STAGING_ROOT = str(tmp_path / "staging")
+
+
+def _client_for(user) -> APIClient:
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+    return client
+
+
+@pytest.mark.django_db
+class TestUploadEndpoints:
+    def test_upload_is_staged_and_processed_by_the_worker(self):
+        venue = VenueFactory(status="published")
+        client = _client_for(venue.owner)
+
+        resp = client.post(f"/api/venues/{venue.id}/upload-image/", {"image": _upload()}, format="multipart")
+
+        assert resp.status_code == 202
+        assert resp.json()["image_status"] == "pending"
+        assert resp.json()["image"] is None
+        assert ImageJob.objects.get().status == "pending"
+
+        call_command("process_image_jobs", "--once")
+
+        venue.refresh_from_db()
+        assert venue.image_status == "ready"
+        assert venue.image.name.startswith("media/")
+        assert set(venue.image_variants) == {"card", "detail", "og"}
+        assert ImageJob.objects.get().status == "done"
+        assert not image_jobs.staging_storage().listdir("")[1]
+
+    def test_event_serializers_expose_status_and_variant_urls(self):
+        event = EventFactory(status="published")
+        client = _client_for(event.owner)
+        client.post(f"/api/events/{event.id}/upload-image/", {"image": _upload()}, format="multipart")
+        image_jobs.process_pending()
+
+        results = client.get("/api/events/").json()
+        results = results["results"] if isinstance(results, dict) else results
+        listed = next(item for item in results if item["id"] == str(event.id))
+
+        assert listed["image_status"] == "ready"
+        assert listed["image_variants"]["card"]["webp"].startswith("http://testserver/media/media/")
+
+
+    def test_image_cannot_be_written_through_the_serializer(self):
+        venue = VenueFactory(status="published")
+        client = _client_for(venue.owner)
+
+        resp = client.patch(f"/api/venues/{venue.id}/", {"image": _upload()}, format="multipart")
+
+        assert resp.status_code == 200
+        venue.refresh_from_db()
+        assert not venue.image
+        assert not StoredMedia.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAdminImages:
+    def _save(self, venue, image):
+        form = SimpleNamespace(changed_data=["image"], cleaned_data={"image": image})
+        site._registry[Venue].save_model(None, venue, form, change=True)
+
+    def test_admin_upload_is_queued(self):
+        venue = VenueFactory()
+        venue.image = _upload()
+
+        self._save(venue, venue.image)
+
+        venue.refresh_from_db()
+        assert not venue.image
+        assert venue.image_status == "pending"
+        assert ImageJob.objects.get().target == venue
+
+    def test_clearing_in_the_admin_releases_the_stored_image(self):
+        venue = VenueFactory()
+        image_jobs.enqueue(venue, _upload())
+        image_jobs.process_pending()
+        venue.refresh_from_db()
+        name = venue.image.name
+
+        venue.image = None
+        self._save(venue, False)
+
+        venue.refresh_from_db()
+        assert not venue.image
+        assert venue.image_variants == {}
+        assert not StoredMedia.objects.exists()
+        assert not media.default_storage.exists(name)
+
+
+@pytest.mark.django_db
+class TestProcess:
+    def test_newer_upload_supersedes_older_job(self):
+        venue = VenueFactory()
+        image_jobs.enqueue(venue, _upload("first.jpg"))
+        image_jobs.enqueue(venue, _upload("second.jpg"))
+
+        assert image_jobs.process_pending() == 2
+
+        jobs = list(ImageJob.objects.order_by("created_at"))
+        assert jobs[0].error == "Superseded by a newer upload."
+        assert jobs[1].status == "done"
+
+    def test_failed_job_is_retried_then_marks_target_failed(self):
+        venue = VenueFactory()
+        job = image_jobs.enqueue(venue, _upload())
+
+        with patch("guana_know.common.image_jobs.media.store", side_effect=OSError("storage down")):
+            image_jobs.process_pending()
+
+        job.refresh_from_db()
+        venue.refresh_from_db()
+        assert job.status == "failed"
+        assert job.attempts == image_jobs.MAX_ATTEMPTS
+        assert venue.image_status == "failed"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_failed_attempt_keeps_the_previous_image_referenced():
+    venue = VenueFactory()
+    image_jobs.enqueue(venue, _upload("old.jpg"))
+    image_jobs.process_pending()
+    venue.refresh_from_db()
+    old_name = venue.image.name
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (640, 480), (200, 30, 30)).save(buffer, "JPEG")
+    image_jobs.enqueue(venue, SimpleUploadedFile("new.jpg", buffer.getvalue(), content_type="image/jpeg"))
+    real_build = images.build_variants
+    calls = []
+
+    def flaky_build(name, references=1):
+        calls.append(name)
+        if len(calls) == 1:
+            raise OSError("resize failed")
+        return real_build(name, references)
+
+    stored_before = set(StoredMedia.objects.values_list("name", flat=True))
+    with patch("guana_know.common.image_jobs.images.build_variants", side_effect=flaky_build):
+        assert image_jobs.process(image_jobs.claim_next()) is False
+        venue.refresh_from_db()
+        assert venue.image.name == old_name
+        assert StoredMedia.objects.get(name=old_name).ref_count == 1
+        # The blob written by the failed attempt was dropped with its reference.
+        assert set(StoredMedia.objects.values_list("name", flat=True)) == stored_before
+        assert set(_stored_files()) == stored_before
+
+        assert image_jobs.process(image_jobs.claim_next()) is True
+
+    venue.refresh_from_db()
+    assert venue.image.name != old_name
+    assert not StoredMedia.objects.filter(name=old_name).exists()
+    assert StoredMedia.objects.get(name=venue.image.name).ref_count == 1
+    assert media.content_hash(venue.image) == StoredMedia.objects.get(name=venue.image.name).sha256
+    # No suffixed second copies: every file on disk is a tracked blob.
+    assert set(_stored_files()) == set(StoredMedia.objects.values_list("name", flat=True))
+
+
+@pytest.mark.django_db(transaction=True)
+def test_failed_save_drops_the_new_image_and_variants():
+    venue = VenueFactory()
+    image_jobs.enqueue(venue, _upload())
+
+    with patch.object(Venue, "save", side_effect=OSError("database down")):
+        assert image_jobs.process(image_jobs.claim_next()) is False
+
+    assert not StoredMedia.objects.exists()
+    assert _stored_files() == []
+
+
+def _stored_files() -> list[str]:
+    from pathlib import Path
+
+    from django.conf import settings
+
+    root = Path(settings.MEDIA_ROOT)
+    return sorted(str(path.relative_to(root)) for path in root.rglob("*") if path.is_file())
@@ -0,0 +1,68 @@
+"""
+Tests for guana_know/common/images.py and the backfill_image_variants command.
+"""
+
+import io
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from PIL import Image
+
+from guana_know.common import images, media
+from guana_know.venues.tests.factories import VenueFactory
+
+
+def _jpeg(size=(2000, 1500), exif: bool = False) -> bytes:
+    image = Image.new("RGB", size, (200, 30, 30))
+    buffer = io.BytesIO()
+    if exif:
+        metadata = Image.Exif()
+        metadata[0x010F] = "Camera Maker"
+        image.save(buffer, "JPEG", exif=metadata)
+    else:
+        image.save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+
+
+class TestRenderVariants:
+    def test_sizes_and_formats(self):
+        rendered = images.render_variants(_jpeg())
+
+        assert set(rendered) == set(images.VARIANTS)
+        card = Image.open(io.BytesIO(rendered["card"]["webp"]))
+        assert card.format == "WEBP"
+        assert card.size == (480, 360)
+        assert Image.open(io.BytesIO(rendered["og"]["jpeg"])).size == (1200, 630)
+        assert Image.open(io.BytesIO(rendered["detail"]["jpeg"])).size == (1200, 900)
+
+    def test_strips_exif(self):
+        rendered = images.render_variants(_jpeg(exif=True))
+
+        assert not Image.open(io.BytesIO(rendered["detail"]["jpeg"])).getexif()
+
+    def test_flattens_transparent_png(self):
+        buffer = io.BytesIO()
+        Image.new("RGBA", (100, 100), (0, 0, 0, 0)).save(buffer, "PNG")
+
+        rendered = images.render_variants(buffer.getvalue())
+
+        assert Image.open(io.BytesIO(rendered["card"]["jpeg"])).getpixel((0, 0)) == (255, 255, 255)
+
+
+@pytest.mark.django_db
+class TestBackfill:
+    def test_backfill_command_renders_missing_variants(self):
+        venue = VenueFactory()
+        venue.image = media.store(ContentFile(_jpeg(), name="logo.jpg"))
+        venue.save()
+
+        call_command("backfill_image_variants", "--model", "venue", "--workers", "1")
+
+        venue.refresh_from_db()
+        assert set(venue.image_variants) == {"card", "detail", "og"}
@@ -0,0 +1,63 @@
+"""
+Tests for guana_know/common/media.py
+"""
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from guana_know.common import media
+from guana_know.common.models import StoredMedia
+from guana_know.events.tests.factories import EventFactory
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+
+
+@pytest.mark.django_db
+class TestStore:
+    def test_identical_bytes_are_stored_once(self):
+        first = media.store(ContentFile(b"poster", name="concierto.jpg"))
+        second = media.store(ContentFile(b"poster", name="danza.jpg"))
+
+        assert first == second
+        assert first.startswith("media/") and first.endswith(".jpg")
+        stored = StoredMedia.objects.get()
+        assert stored.ref_count == 2
+        assert stored.size == 6
+
+    def test_different_bytes_get_different_names(self):
+        assert media.store(ContentFile(b"a", name="a.png")) != media.store(ContentFile(b"b", name="b.png"))
+
+
+@pytest.mark.django_db(transaction=True)
+class TestRelease:
+    def test_blob_is_deleted_with_its_last_reference(self):
+        name = media.store(ContentFile(b"logo", name="logo.png"), references=2)
+
+        media.release(name)
+        assert default_storage.exists(name)
+
+        media.release(name)
+        assert not default_storage.exists(name)
+        assert not StoredMedia.objects.exists()
+
+    def test_unmanaged_names_are_ignored(self):
+        media.release("events/legacy.jpg")
+
+    def test_replacing_and_deleting_an_event_image_releases_it(self):
+        event = EventFactory()
+        media.replace(event, "image", ContentFile(b"old", name="old.jpg"))
+        event.save()
+        old_name = event.image.name
+
+        media.replace(event, "image", ContentFile(b"new", name="new.jpg"))
+        event.save()
+
+        assert not default_storage.exists(old_name)
+        new_name = event.image.name
+        event.delete()
+        assert not default_storage.exists(new_name)
+        assert not StoredMedia.objects.exists()
@@ -0,0 +1,89 @@
+"""
+Tests for guana_know/common/slugs.py
+"""
+
+from unittest.mock import patch
+
+import pytest
+from django.db import IntegrityError
+
+from guana_know.common.slugs import (
+    allocate_slugs,
+    bulk_create_with_unique_slugs,
+    create_with_unique_slug,
+    next_free_slug,
+    slug_base,
+)
+from guana_know.events.models import Event
+from guana_know.events.tests.factories import EventFactory
+from guana_know.users.tests.factories import UserFactory
+from guana_know.venues.models import Venue
+from guana_know.venues.tests.factories import VenueFactory
+
+
+class TestSlugBase:
+    def test_leaves_room_for_a_suffix(self):
+        assert len(slug_base("concierto " * 20, Event)) <= Event._meta.get_field("slug").max_length - 5
+
+    def test_uses_fallback_when_nothing_is_left(self):
+        assert slug_base("¡¡¡!!!", Event, fallback="evento") == "evento"
+
+
+@pytest.mark.django_db
+class TestNextFreeSlug:
+    def test_returns_base_when_free(self):
+        assert next_free_slug(Event, "concierto") == "concierto"
+
+    def test_finds_first_gap_with_one_query(self, django_assert_num_queries):
+        for slug in ("concierto", "concierto-1", "concierto-2", "concierto-4", "concierto-de-jazz"):
+            EventFactory(slug=slug)
+
+        with django_assert_num_queries(1):
+            assert next_free_slug(Event, "concierto") == "concierto-3"
+
+
+@pytest.mark.django_db
+class TestCreateWithUniqueSlug:
+    def test_retries_when_slug_is_taken_concurrently(self):
+        VenueFactory(slug="teatro")
+        real_next_free_slug = next_free_slug
+        calls = []
+
+        def stale_then_fresh(model, base, field="slug"):
+            # First allocation races with another worker and returns a taken slug.
+            calls.append(base)
+            return "teatro" if len(calls) == 1 else real_next_free_slug(model, base, field)
+
+        with patch("guana_know.common.slugs.next_free_slug", side_effect=stale_then_fresh):
+            venue = create_with_unique_slug(
+                Venue, "teatro", owner=UserFactory(), name="Teatro", description="", category="theater", address="",
+            )
+
+        assert venue.slug == "teatro-1"
+        assert len(calls) == 2
+
+    def test_other_integrity_errors_are_raised(self):
+        with pytest.raises(IntegrityError):
+            create_with_unique_slug(Venue, "teatro", name="Teatro", owner_id=None)
+
+
+@pytest.mark.django_db
+class TestBulkSlugs:
+    def test_allocates_distinct_slugs_in_one_query(self, django_assert_num_queries):
+        EventFactory(slug="concierto")
+
+        with django_assert_num_queries(1):
+            slugs = allocate_slugs(Event, ["concierto", "danza", "concierto"])
+
+        assert slugs == ["concierto-1", "danza", "concierto-2"]
+
+    def test_bulk_create_assigns_slugs(self):
+        VenueFactory(slug="teatro")
+        owner = UserFactory()
+        venues = [Venue(owner=owner, name="Teatro", address="", city="Guanajuato") for _ in range(2)]
+
+        bulk_create_with_unique_slugs(Venue, venues, ["teatro", "teatro"])
+
+        assert sorted(Venue.objects.filter(name="Teatro").values_list("slug", flat=True)) == [
+            "teatro-1", "teatro-2",
+        ]
@@ -0,0 +1,20 @@
+"""
+Text normalization helpers shared by Guana Know apps.
+"""
+
+import re
+import unicodedata
+
+_NON_WORD_RE = re.compile(r'[\W_]+')
+
+
+def normalize_name(value: str | None) -> str:
+    """
+    Lowercases, strips accents and collapses punctuation and whitespace.
+
+    Used for matching names that differ only cosmetically, e.g.
+    "Teatro Juárez" and "TEATRO  JUAREZ." both become "teatro juarez".
+    """
+    decomposed = unicodedata.normalize('NFKD', value or '')
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_WORD_RE.sub(' ', stripped.lower()).strip()
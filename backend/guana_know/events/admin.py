@@ -4,6 +4,8 @@ Admin configuration for events app.
 
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
+
+from guana_know.common.admin import QueuedImageAdminMixin
 from .models import Event
 
 
@@ -22,7 +24,7 @@ unpublish_events.short_description = 'Move selected events to draft'
 
 
 @admin.register(Event)
-class EventAdmin(admin.ModelAdmin):
+class EventAdmin(QueuedImageAdminMixin, admin.ModelAdmin):
     list_display = ['title', 'owner', 'venue', 'start_datetime', 'status', 'is_featured', 'created_at']
     list_filter = ['status', 'category', 'is_featured', 'is_free', 'start_datetime']
     search_fields = ['title', 'description', 'owner__username', 'venue__name']
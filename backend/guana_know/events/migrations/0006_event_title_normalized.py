@@ -0,0 +1,55 @@
+# Generated by Django 4.2.10 on 2026-10-18 06:45
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+from guana_know.common.text import normalize_name
+
+
+def backfill_title_normalized(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    batch = []
+    for event in Event.objects.only("id", "title").iterator(chunk_size=1000):
+        event.title_normalized = normalize_name(event.title)
+        batch.append(event)
+        if len(batch) >= 1000:
+            Event.objects.bulk_update(batch, ["title_normalized"])
+            batch = []
+    if batch:
+        Event.objects.bulk_update(batch, ["title_normalized"])
+
+
+class Migration(migrations.Migration):
+    """
+    Add Event.title_normalized with a pg_trgm GIN index so dedup_tool can
+    find near-identical titles with an index scan instead of ILIKE.
+    """
+
+    dependencies = [
+        ("events", "0005_event_image_source_url_textfield"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="event",
+            name="title_normalized",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Unaccented, lowercased title used for fuzzy duplicate detection.",
+                max_length=255,
+            ),
+        ),
+        migrations.RunPython(backfill_title_normalized, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="event",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["title_normalized"],
+                name="event_title_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
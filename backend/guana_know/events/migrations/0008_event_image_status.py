@@ -0,0 +1,27 @@
+# Generated by Django 4.2.10 on 2026-10-18 06:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0007_event_image_variants"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="image_status",
+            field=models.CharField(
+                choices=[
+                    ("ready", "Ready"),
+                    ("pending", "Pending"),
+                    ("failed", "Failed"),
+                ],
+                default="ready",
+                help_text="pending while an uploaded image is being processed in the background.",
+                max_length=10,
+            ),
+        ),
+    ]
@@ -2,10 +2,15 @@
 Event models for Guana Know.
 """
 
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from guana_know.common import images, media
 from guana_know.common.models import BaseModel
+from guana_know.common.text import normalize_name
 from guana_know.venues.models import Venue
 
 User = get_user_model()
@@ -49,6 +54,13 @@ class Event(BaseModel):
     )
     
     title = models.CharField(max_length=255, db_index=True)
+    title_normalized = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        editable=False,
+        help_text='Unaccented, lowercased title used for fuzzy duplicate detection.',
+    )
     slug = models.SlugField(unique=True, db_index=True)
     description = models.TextField()
     category = models.CharField(
@@ -58,6 +70,23 @@ class Event(BaseModel):
     )
     
     image = models.ImageField(upload_to='events/', null=True, blank=True)
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text='Resized WebP/JPEG renditions of image (see guana_know.common.images).',
+    )
+    IMAGE_STATUS_CHOICES = [
+        ('ready', 'Ready'),
+        ('pending', 'Pending'),
+        ('failed', 'Failed'),
+    ]
+    image_status = models.CharField(
+        max_length=10,
+        choices=IMAGE_STATUS_CHOICES,
+        default='ready',
+        help_text='pending while an uploaded image is being processed in the background.',
+    )
     
     start_datetime = models.DateTimeField(db_index=True)
     end_datetime = models.DateTimeField()
@@ -113,10 +142,22 @@ class Event(BaseModel):
             models.Index(fields=['status', 'start_datetime']),
             models.Index(fields=['category', 'status']),
             models.Index(fields=['is_featured', 'start_datetime']),
+            GinIndex(
+                fields=['title_normalized'],
+                name='event_title_trgm',
+                opclasses=['gin_trgm_ops'],
+            ),
         ]
     
     def __str__(self):
         return self.title
+
+    def save(self, *args, **kwargs):
+        self.title_normalized = normalize_name(self.title)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'title' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'title_normalized'}
+        super().save(*args, **kwargs)
     
     def is_upcoming(self):
         return self.start_datetime > timezone.now()
@@ -127,3 +168,10 @@ class Event(BaseModel):
     
     def is_past(self):
         return self.end_datetime < timezone.now()
+
+
+@receiver(post_delete, sender=Event)
+def release_event_image(sender, instance, **kwargs):
+    """Drops the deleted event's references to its stored image and variants."""
+    media.release(instance.image.name)
+    images.release_variants(instance.image_variants)
@@ -3,12 +3,16 @@ Serializers for events app.
 """
 
 from rest_framework import serializers
+
+from guana_know.common.serializers import ImageVariantsField
+from guana_know.common.slugs import create_with_unique_slug, slug_base
 from .models import Event
 
 
 class EventSerializer(serializers.ModelSerializer):
     """Serializer for event details."""
     
+    image_variants = ImageVariantsField()
     owner_name = serializers.CharField(
         source='owner.get_full_name',
         read_only=True
@@ -39,6 +43,8 @@ class EventSerializer(serializers.ModelSerializer):
             'description',
             'category',
             'image',
+            'image_variants',
+            'image_status',
             'start_datetime',
             'end_datetime',
             'capacity',
@@ -54,7 +60,20 @@ class EventSerializer(serializers.ModelSerializer):
             'created_at',
             'updated_at',
         ]
-        read_only_fields = ['id', 'owner', 'registered_count', 'created_at', 'updated_at']
+        # image is set through upload-image, which keeps the media store's references.
+        read_only_fields = ['id', 'owner', 'registered_count', 'image', 'image_status', 'created_at', 'updated_at']
+        extra_kwargs = {
+            'slug': {'required': False, 'allow_blank': True},
+        }
+    
+    def create(self, validated_data):
+        # Without an explicit slug, derive a free one from the title.
+        if validated_data.get('slug'):
+            return super().create(validated_data)
+        validated_data.pop('slug', None)
+        return create_with_unique_slug(
+            Event, slug_base(validated_data.get('title', ''), Event, fallback='evento'), **validated_data
+        )
     
     def get_is_upcoming(self, obj):
         return obj.is_upcoming()
@@ -66,6 +85,9 @@ class EventSerializer(serializers.ModelSerializer):
         return obj.is_past()
     
     def validate_slug(self, value):
+        if not value:
+            # Blank keeps the current slug on update; create() allocates one.
+            return self.instance.slug if self.instance else value
         event_id = self.instance.id if self.instance else None
         queryset = Event.objects.filter(slug=value)
         if event_id:
@@ -90,6 +112,7 @@ class EventSerializer(serializers.ModelSerializer):
 class EventListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for event listings."""
     
+    image_variants = ImageVariantsField()
     venue_name = serializers.CharField(
         source='venue.name',
         read_only=True
@@ -112,6 +135,8 @@ class EventListSerializer(serializers.ModelSerializer):
             'category',
             'status',
             'image',
+            'image_variants',
+            'image_status',
             'start_datetime',
             'venue_name',
             'venue_slug',
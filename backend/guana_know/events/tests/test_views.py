@@ -83,6 +83,21 @@ class TestEventViews:
         assert str(data['owner']) == str(user.id)
         assert str(data['venue']) == str(venue.id)
 
+    def test_post_without_slug_allocates_one_from_title(self, auth_client, user):
+        venue = VenueFactory(owner=user)
+        EventFactory(slug='festival-cervantino')
+        payload = {
+            'title': 'Festival Cervantino',
+            'description': 'desc',
+            'category': 'festival',
+            'venue': venue.id,
+            'start_datetime': '2030-01-01T10:00:00Z',
+            'end_datetime': '2030-01-01T12:00:00Z',
+        }
+        resp = auth_client.post('/api/events/', payload, format='json')
+        assert resp.status_code == 201
+        assert resp.json()['slug'] == 'festival-cervantino-1'
+
     def test_put_owner_can_update(self, auth_client, user):
         ev = EventFactory(owner=user)
         resp = auth_client.put(
@@ -10,6 +10,7 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db import models
 from django.utils import timezone
+from guana_know.common import image_jobs
 from .models import Event
 from .serializers import EventSerializer, EventListSerializer
 from .permissions import IsOwnerOrReadOnly
@@ -72,7 +73,8 @@ class EventViewSet(viewsets.ModelViewSet):
         """
         POST /api/events/{id}/upload-image/
         Accepts: multipart/form-data with field 'image'
-        Returns: updated event with new image URL
+        Returns: 202 with the event; image_status stays 'pending' until the
+        image has been processed in the background (process_image_jobs).
         """
         event = self.get_object()
         if 'image' not in request.FILES:
@@ -92,10 +94,10 @@ class EventViewSet(viewsets.ModelViewSet):
                 {'detail': 'La imagen no puede pesar más de 5MB.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        event.image = file
-        event.save()
+        # Stored and resized by process_image_jobs; image_status is 'pending' until then.
+        image_jobs.enqueue(event, file)
         serializer = self.get_serializer(event)
-        return Response(serializer.data)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
     
     def perform_update(self, serializer):
         serializer.save()
@@ -3,16 +3,49 @@ Admin configuration for venues app.
 """
 
 from django.contrib import admin
-from .models import Venue
+from django.db.models import Count
+
+from guana_know.common.admin import QueuedImageAdminMixin
+
+from .models import Venue, VenueAlias
+from .services import merge_venues
+
+
+class VenueAliasInline(admin.TabularInline):
+    model = VenueAlias
+    extra = 0
+    fields = ('name', 'normalized_name', 'created_at')
+    readonly_fields = ('normalized_name', 'created_at')
+
+
+@admin.action(description='Merge selected venues into one')
+def merge_selected_venues(modeladmin, request, queryset):
+    """
+    Keeps the published venue with the most events (oldest on ties) and
+    folds the others into it; their names become aliases of the kept venue.
+    """
+    venues = list(queryset.annotate(event_count=Count('events')))
+    if len(venues) < 2:
+        modeladmin.message_user(request, 'Select at least two venues to merge.', level='warning')
+        return
+
+    target = sorted(
+        venues,
+        key=lambda venue: (venue.status != 'published', -venue.event_count, venue.created_at),
+    )[0]
+    merged = merge_venues(target, venues)
+    modeladmin.message_user(request, f'Merged {merged} venue(s) into "{target.name}".')
 
 
 @admin.register(Venue)
-class VenueAdmin(admin.ModelAdmin):
+class VenueAdmin(QueuedImageAdminMixin, admin.ModelAdmin):
     list_display = ['name', 'owner', 'category', 'city', 'status', 'is_featured', 'created_at']
     list_filter = ['status', 'category', 'city', 'is_featured', 'created_at']
     search_fields = ['name', 'description', 'owner__username']
     prepopulated_fields = {'slug': ('name',)}
     ordering = ['-created_at']
+    actions = [merge_selected_venues]
+    inlines = [VenueAliasInline]
     
     fieldsets = (
         ('Basic Information', {
@@ -31,3 +64,11 @@ class VenueAdmin(admin.ModelAdmin):
             'fields': ('status', 'is_featured')
         }),
     )
+
+
+@admin.register(VenueAlias)
+class VenueAliasAdmin(admin.ModelAdmin):
+    list_display = ['name', 'normalized_name', 'venue', 'created_at']
+    search_fields = ['name', 'normalized_name', 'venue__name']
+    raw_id_fields = ['venue']
+    readonly_fields = ['normalized_name']
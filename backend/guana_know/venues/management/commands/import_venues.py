@@ -10,7 +10,8 @@ Usage:
 import sys
 from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth import get_user_model
-from django.utils.text import slugify
+
+from guana_know.common.slugs import create_with_unique_slug, slug_base
 
 User = get_user_model()
 
@@ -106,7 +107,7 @@ class Command(BaseCommand):
                 errors += 1
                 continue
 
-            slug = self._clean(row_data.get("slug")) or slugify(name)
+            slug = self._clean(row_data.get("slug")) or slug_base(name, Venue, fallback="venue")
 
             try:
                 venue_data = self._build_venue_data(row_data, slug, owner)
@@ -131,7 +132,11 @@ class Command(BaseCommand):
                     skipped += 1
             else:
                 if not dry_run:
-                    Venue.objects.create(**venue_data)
+                    # A concurrent import or agent run may have claimed the slug
+                    # since the lookup above; fall back to the next free suffix.
+                    base = venue_data.pop("slug")
+                    venue = create_with_unique_slug(Venue, base, **venue_data)
+                    slug = venue.slug
                 self.stdout.write(f"  Created: {name} ({slug})")
                 created += 1
 
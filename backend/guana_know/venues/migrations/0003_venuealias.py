@@ -0,0 +1,69 @@
+# Generated by Django 4.2.10 on 2026-10-18 06:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+from guana_know.common.text import normalize_name
+
+
+def backfill_aliases(apps, schema_editor):
+    """One alias per existing venue name; the oldest venue wins on collisions."""
+    Venue = apps.get_model("venues", "Venue")
+    VenueAlias = apps.get_model("venues", "VenueAlias")
+
+    aliases = {}
+    for venue_id, name in Venue.objects.order_by("created_at").values_list("id", "name"):
+        normalized = normalize_name(name)
+        if normalized and normalized not in aliases:
+            aliases[normalized] = VenueAlias(
+                venue_id=venue_id, name=name, normalized_name=normalized
+            )
+    VenueAlias.objects.bulk_create(aliases.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("venues", "0002_increase_venue_slug_max_length"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VenueAlias",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="The name as it was first seen.", max_length=255
+                    ),
+                ),
+                ("normalized_name", models.CharField(max_length=255, unique=True)),
+                (
+                    "venue",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="aliases",
+                        to="venues.venue",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Venue Alias",
+                "verbose_name_plural": "Venue Aliases",
+                "ordering": ["normalized_name"],
+            },
+        ),
+        migrations.RunPython(backfill_aliases, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.10 on 2026-10-18 06:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("venues", "0003_venuealias"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="venue",
+            name="image_variants",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Resized WebP/JPEG renditions of image (see guana_know.common.images).",
+            ),
+        ),
+    ]
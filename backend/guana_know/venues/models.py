@@ -2,9 +2,17 @@
 Venue models for Guana Know.
 """
 
+import logging
+
 from django.db import models
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.contrib.auth import get_user_model
+from guana_know.common import images, media
 from guana_know.common.models import BaseModel
+from guana_know.common.text import normalize_name
+
+logger = logging.getLogger(__name__)
 
 User = get_user_model()
 
@@ -59,6 +67,23 @@ class Venue(BaseModel):
     website = models.URLField(blank=True)
     
     image = models.ImageField(upload_to='venues/', null=True, blank=True)
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text='Resized WebP/JPEG renditions of image (see guana_know.common.images).',
+    )
+    IMAGE_STATUS_CHOICES = [
+        ('ready', 'Ready'),
+        ('pending', 'Pending'),
+        ('failed', 'Failed'),
+    ]
+    image_status = models.CharField(
+        max_length=10,
+        choices=IMAGE_STATUS_CHOICES,
+        default='ready',
+        help_text='pending while an uploaded image is being processed in the background.',
+    )
     
     status = models.CharField(
         max_length=20,
@@ -79,3 +104,54 @@ class Venue(BaseModel):
     
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Every venue is reachable by its own normalized name. An existing
+        # alias wins, so two venues with the same name do not steal each other's.
+        normalized = normalize_name(self.name)
+        if normalized:
+            alias, _ = VenueAlias.objects.get_or_create(
+                normalized_name=normalized,
+                defaults={'venue': self, 'name': self.name},
+            )
+            if alias.venue_id != self.pk:
+                # This venue is then only found by its exact name; merging
+                # the two with merge_venues resolves it.
+                logger.warning(
+                    'Venue "%s" (%s) has the same normalized name as venue %s; '
+                    'merge them with merge_venues.',
+                    self.name, self.pk, alias.venue_id,
+                )
+
+
+@receiver(post_delete, sender=Venue)
+def release_venue_image(sender, instance, **kwargs):
+    """Drops the deleted venue's references to its stored image and variants."""
+    media.release(instance.image.name)
+    images.release_variants(instance.image_variants)
+
+
+class VenueAlias(BaseModel):
+    """
+    A normalized name (unaccented, lowercased, punctuation-stripped) that
+    resolves to a Venue. Used by the discovery agent to match name variants
+    such as "Teatro Juárez" and "teatro juarez". Aliases are learned when
+    venues are merged in the admin.
+    """
+
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='aliases')
+    name = models.CharField(max_length=255, help_text='The name as it was first seen.')
+    normalized_name = models.CharField(max_length=255, unique=True)
+
+    class Meta:
+        ordering = ['normalized_name']
+        verbose_name = 'Venue Alias'
+        verbose_name_plural = 'Venue Aliases'
+
+    def __str__(self):
+        return f'{self.name} → {self.venue}'
+
+    def save(self, *args, **kwargs):
+        self.normalized_name = normalize_name(self.name)
+        super().save(*args, **kwargs)
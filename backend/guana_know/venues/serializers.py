@@ -3,12 +3,16 @@ Serializers for venues app.
 """
 
 from rest_framework import serializers
+
+from guana_know.common.serializers import ImageVariantsField
+from guana_know.common.slugs import create_with_unique_slug, slug_base
 from .models import Venue
 
 
 class VenueSerializer(serializers.ModelSerializer):
     """Serializer for venue details."""
     
+    image_variants = ImageVariantsField()
     owner_name = serializers.CharField(
         source='owner.get_full_name',
         read_only=True
@@ -34,12 +38,21 @@ class VenueSerializer(serializers.ModelSerializer):
             'email',
             'website',
             'image',
+            'image_variants',
+            'image_status',
             'status',
             'is_featured',
             'created_at',
             'updated_at',
         ]
-        read_only_fields = ['id', 'owner', 'slug', 'created_at', 'updated_at']
+        # image is set through upload-image, which keeps the media store's references.
+        read_only_fields = ['id', 'owner', 'slug', 'image', 'image_status', 'created_at', 'updated_at']
+    
+    def create(self, validated_data):
+        # slug is read-only: allocate a free one from the name.
+        return create_with_unique_slug(
+            Venue, slug_base(validated_data.get('name', ''), Venue, fallback='venue'), **validated_data
+        )
     
     def validate_slug(self, value):
         venue_id = self.instance.id if self.instance else None
@@ -54,6 +67,7 @@ class VenueSerializer(serializers.ModelSerializer):
 class VenueListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for venue listings."""
     
+    image_variants = ImageVariantsField()
     owner_name = serializers.CharField(
         source='owner.get_full_name',
         read_only=True
@@ -69,6 +83,8 @@ class VenueListSerializer(serializers.ModelSerializer):
             'city',
             'status',
             'image',
+            'image_variants',
+            'image_status',
             'is_featured',
             'owner',
             'owner_name',
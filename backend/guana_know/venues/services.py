@@ -0,0 +1,162 @@
+"""
+Service functions for the venues app.
+
+VenueResolver: resolves venue names to Venues through the VenueAlias table.
+merge_venues: folds duplicate venues into one and learns their names as aliases.
+"""
+
+import logging
+import threading
+
+from django.db import transaction
+
+from guana_know.common.slugs import bulk_create_with_unique_slugs, create_with_unique_slug, slug_base
+from guana_know.common.text import normalize_name
+
+from .models import Venue, VenueAlias
+
+logger = logging.getLogger(__name__)
+
+
+class VenueResolver:
+    """
+    Resolves venue names for one discovery run.
+
+    The whole alias map (normalized name → venue id) is loaded with a single
+    query on first use; after that, lookups only hit the database once per
+    distinct venue to fetch the instance. Venues created through the resolver
+    are added to the map, so later candidates of the same run reuse them.
+    Safe to share between worker threads.
+
+    get_or_build() defers the INSERT of unknown venues: they are returned
+    unsaved and written together by save_pending(), so a batch can create
+    its venues in the same transaction as the rows that point at them.
+    """
+
+    def __init__(self):
+        self._aliases: dict[str, object] | None = None
+        self._venues: dict[object, Venue] = {}
+        # Unsaved venues from get_or_build(), by normalized name.
+        self._pending: dict[str, Venue] = {}
+        self._lock = threading.RLock()
+
+    def _alias_map(self) -> dict:
+        if self._aliases is None:
+            self._aliases = dict(VenueAlias.objects.values_list('normalized_name', 'venue_id'))
+        return self._aliases
+
+    def resolve(self, name: str | None) -> Venue | None:
+        """Returns the Venue known under name (or a variant of it), if any."""
+        normalized = normalize_name(name)
+        if not normalized:
+            return None
+        with self._lock:
+            venue_id = self._alias_map().get(normalized)
+            if venue_id is None:
+                return None
+            if venue_id not in self._venues:
+                self._venues[venue_id] = Venue.objects.get(id=venue_id)
+            return self._venues[venue_id]
+
+    def get_or_create(self, name: str, owner) -> Venue:
+        """
+        Returns the Venue for name, creating a draft Venue (and its alias)
+        when no alias matches, so it appears in the admin for review.
+        """
+        with self._lock:
+            venue = self.resolve(name)
+            if venue:
+                return venue
+
+            venue = create_with_unique_slug(
+                Venue, slug_base(name, Venue, fallback='venue'), **_draft_venue_fields(name, owner),
+            )
+            # Venue.save() registered the alias; mirror it in the loaded map.
+            self._alias_map()[normalize_name(name)] = venue.id
+            self._venues[venue.id] = venue
+            return venue
+
+    def get_or_build(self, name: str, owner) -> Venue:
+        """
+        Like get_or_create(), but an unknown venue is returned unsaved and
+        only written by save_pending(). Repeated names share one instance.
+        """
+        with self._lock:
+            venue = self.resolve(name)
+            if venue:
+                return venue
+            normalized = normalize_name(name)
+            if normalized not in self._pending:
+                self._pending[normalized] = Venue(**_draft_venue_fields(name, owner))
+            return self._pending[normalized]
+
+    def save_pending(self) -> list[Venue]:
+        """
+        Bulk-inserts the venues built by get_or_build() and their aliases.
+        Call it inside the transaction that saves the rows referencing them.
+        """
+        with self._lock:
+            pending = self._pending
+            if not pending:
+                return []
+            venues = list(pending.values())
+            bulk_create_with_unique_slugs(
+                Venue, venues, [slug_base(venue.name, Venue, fallback='venue') for venue in venues],
+            )
+            # bulk_create skips Venue.save(), which normally registers the alias.
+            VenueAlias.objects.bulk_create(
+                [VenueAlias(venue=venue, name=venue.name, normalized_name=normalized)
+                 for normalized, venue in pending.items() if normalized],
+                ignore_conflicts=True,
+            )
+            for normalized, venue in pending.items():
+                if normalized:
+                    self._alias_map()[normalized] = venue.id
+                self._venues[venue.id] = venue
+            self._pending = {}
+            return venues
+
+
+def _draft_venue_fields(name: str, owner) -> dict:
+    """Fields of a venue the discovery agent creates for review in the admin."""
+    return {
+        'owner': owner,
+        'name': name,
+        'description': '',
+        'category': 'other',
+        'address': '',
+        'city': 'Guanajuato',
+        'state': 'Guanajuato',
+        'status': 'draft',
+    }
+
+
+@transaction.atomic
+def merge_venues(target: Venue, duplicates) -> int:
+    """
+    Moves events and aliases of duplicates onto target, records each
+    duplicate's name as an alias of target, and deletes the duplicates.
+
+    Returns the number of venues merged.
+    """
+    from guana_know.events.models import Event
+
+    duplicates = [venue for venue in duplicates if venue.pk != target.pk]
+    if not duplicates:
+        return 0
+    duplicate_ids = [venue.pk for venue in duplicates]
+
+    Event.objects.filter(venue_id__in=duplicate_ids).update(venue=target)
+    VenueAlias.objects.filter(venue_id__in=duplicate_ids).update(venue=target)
+
+    for venue in duplicates:
+        normalized = normalize_name(venue.name)
+        if normalized:
+            VenueAlias.objects.update_or_create(
+                normalized_name=normalized,
+                defaults={'venue': target, 'name': venue.name},
+            )
+
+    Venue.objects.filter(id__in=duplicate_ids).delete()
+    logger.info('merge_venues: merged %d venue(s) into %s (%s)', len(duplicates), target.name, target.pk)
+    return len(duplicates)
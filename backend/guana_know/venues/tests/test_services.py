@@ -0,0 +1,93 @@
+"""
+Tests for guana_know/venues/services.py
+"""
+
+import pytest
+
+from guana_know.events.tests.factories import EventFactory
+from guana_know.users.tests.factories import UserFactory
+from guana_know.venues.models import Venue, VenueAlias
+from guana_know.venues.services import VenueResolver, merge_venues
+from guana_know.venues.tests.factories import VenueFactory
+
+
+@pytest.mark.django_db
+class TestVenueResolver:
+    def test_resolves_name_variants_to_the_same_venue(self):
+        venue = VenueFactory(name="Teatro Juárez")
+        resolver = VenueResolver()
+
+        assert resolver.resolve("teatro juarez") == venue
+        assert resolver.resolve("TEATRO JUÁREZ.") == venue
+        assert resolver.resolve("Museo Iconográfico") is None
+
+    def test_loads_aliases_once_per_run(self, django_assert_num_queries):
+        VenueFactory(name="Teatro Juárez")
+        VenueFactory(name="Museo Iconográfico")
+        resolver = VenueResolver()
+
+        with django_assert_num_queries(2):
+            resolver.resolve("Teatro Juárez")  # alias map + venue
+        with django_assert_num_queries(1):
+            resolver.resolve("museo iconografico")  # venue only
+        with django_assert_num_queries(0):
+            for _ in range(5):
+                resolver.resolve("teatro juarez")
+
+    def test_get_or_create_reuses_venues_created_in_the_run(self):
+        owner = UserFactory()
+        resolver = VenueResolver()
+
+        first = resolver.get_or_create("Casa de la Cultura", owner)
+        second = resolver.get_or_create("casa de la cultura", owner)
+
+        assert first == second
+        assert first.status == "draft"
+        assert Venue.objects.filter(name__iexact="casa de la cultura").count() == 1
+
+    def test_built_venues_are_written_by_save_pending(self):
+        owner = UserFactory()
+        VenueFactory(name="Casa de la Cultura")
+        resolver = VenueResolver()
+
+        first = resolver.get_or_build("Teatro del Pueblo", owner)
+        second = resolver.get_or_build("teatro del pueblo", owner)
+        third = resolver.get_or_build("Casa de la Cultura", owner)
+
+        assert first is second
+        assert not third._state.adding  # already in the database
+        assert not Venue.objects.filter(name="Teatro del Pueblo").exists()
+
+        assert resolver.save_pending() == [first]
+        assert Venue.objects.get(name="Teatro del Pueblo").slug == "teatro-del-pueblo"
+        assert VenueAlias.objects.get(normalized_name="teatro del pueblo").venue == first
+        assert resolver.resolve("Teatro del Pueblo") == first
+        assert resolver.save_pending() == []
+
+
+@pytest.mark.django_db
+class TestMergeVenues:
+    def test_moves_events_and_learns_aliases(self):
+        target = VenueFactory(name="Teatro Juárez", status="published")
+        duplicate = VenueFactory(name="Teatro Juarez (Centro)")
+        event = EventFactory(venue=duplicate)
+
+        merged = merge_venues(target, [target, duplicate])
+
+        assert merged == 1
+        event.refresh_from_db()
+        assert event.venue == target
+        assert not Venue.objects.filter(pk=duplicate.pk).exists()
+        assert VenueAlias.objects.get(normalized_name="teatro juarez centro").venue == target
+        assert VenueResolver().resolve("Teatro Juárez (Centro)") == target
+
+
+@pytest.mark.django_db
+def test_venue_sharing_a_normalized_name_is_logged(caplog):
+    first = VenueFactory(name="Teatro Juárez")
+
+    with caplog.at_level("WARNING", logger="guana_know.venues.models"):
+        second = VenueFactory(name="Teatro Juarez")
+
+    assert VenueAlias.objects.get(normalized_name="teatro juarez").venue == first
+    assert str(second.pk) in caplog.text
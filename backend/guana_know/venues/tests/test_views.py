@@ -88,6 +88,19 @@ class TestVenueViews:
         data = resp.json()
         assert str(data['owner']) == str(user.id)
 
+    def test_post_allocates_free_slug_from_name(self, auth_client):
+        VenueFactory(slug='teatro-juarez')
+        payload = {
+            'name': 'Teatro Juárez',
+            'description': 'desc',
+            'category': 'theater',
+            'address': 'addr',
+            'city': 'Gto',
+        }
+        resp = auth_client.post('/api/venues/', payload, format='json')
+        assert resp.status_code == 201
+        assert resp.json()['slug'] == 'teatro-juarez-1'
+
     def test_put_owner_can_update(self, auth_client, user):
         v = VenueFactory(owner=user)
         resp = auth_client.put(
@@ -9,6 +9,7 @@ from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db import models
+from guana_know.common import image_jobs
 from .models import Venue
 from .serializers import VenueSerializer, VenueListSerializer
 from .permissions import IsOwnerOrReadOnly
@@ -70,7 +71,8 @@ class VenueViewSet(viewsets.ModelViewSet):
         """
         POST /api/venues/{id}/upload-image/
         Accepts: multipart/form-data with field 'image'
-        Returns: updated venue with new image URL
+        Returns: 202 with the venue; image_status stays 'pending' until the
+        image has been processed in the background (process_image_jobs).
         """
         venue = self.get_object()
         if 'image' not in request.FILES:
@@ -96,7 +98,7 @@ class VenueViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        venue.image = file
-        venue.save()
+        # Stored and resized by process_image_jobs; image_status is 'pending' until then.
+        image_jobs.enqueue(venue, file)
         serializer = self.get_serializer(venue)
-        return Response(serializer.data)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
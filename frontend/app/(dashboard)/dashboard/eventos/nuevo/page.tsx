@@ -34,6 +34,8 @@ export default function NuevoEventoPage() {
   const [loading, setLoading] = useState(false)
   const [venuesLoading, setVenuesLoading] = useState(true)
   const [pendingImage, setPendingImage] = useState<File | null>(null)
+  const [processingImage, setProcessingImage] = useState(false)
+  const [created, setCreated] = useState(false)
 
   // Fetch user's venues
   useEffect(() => {
@@ -86,7 +88,15 @@ export default function NuevoEventoPage() {
 
       // Upload image if one was selected
       if (pendingImage && newEvent.id) {
+        setCreated(true)
+        setProcessingImage(true)
+        // 202: the image is resized in the background, wait for the job
         await uploads.eventImage(token, newEvent.id, pendingImage)
+        const updated = await uploads.waitForImage(() => events.get(newEvent.id, token))
+        if (updated.image_status === 'failed') {
+          setError('El evento se guardó, pero no pudimos procesar la imagen.')
+          return
+        }
       }
 
       router.push('/dashboard/eventos')
@@ -96,6 +106,7 @@ export default function NuevoEventoPage() {
       setError(String(msg))
     } finally {
       setLoading(false)
+      setProcessingImage(false)
     }
   }
 
@@ -350,16 +361,16 @@ export default function NuevoEventoPage() {
         <div className="flex gap-4 pt-4 border-t border-slate-200">
           <button
             type="submit"
-            disabled={loading || userVenues.length === 0}
+            disabled={loading || created || userVenues.length === 0}
             className="flex-1 bg-brand-blue text-white font-medium py-3 rounded-sm hover:bg-brand-blue-light transition-colors disabled:opacity-50"
           >
-            {loading ? 'Publicando...' : 'Publicar evento'}
+            {processingImage ? 'Procesando imagen...' : loading ? 'Publicando...' : 'Publicar evento'}
           </button>
           <Link
             href="/dashboard/eventos"
             className="px-6 py-3 border border-slate-200 text-gray-900 rounded-sm hover:bg-slate-50 transition-colors font-medium"
           >
-            Cancelar
+            {created ? 'Ir a mis eventos' : 'Cancelar'}
           </Link>
         </div>
       </form>
@@ -115,8 +115,16 @@ export default function PerfilPage() {
     if (!venue || !token) return
     setUploading(true)
     try {
-      const updated = await uploads.venueImage(token, venue.id, file)
+      // 202: the old image stays in place while the new one is processed
+      setVenue(await uploads.venueImage(token, venue.id, file))
+      const updated = await uploads.waitForImage(() => venues.get(venue.id, token))
       setVenue(updated)
+      if (updated.image_status === 'failed') {
+        setError('No pudimos procesar la imagen. Intenta con otro archivo.')
+      } else if (updated.image_status === 'pending') {
+        setSuccess('Tu imagen se sigue procesando; aparecerá en unos minutos.')
+        setTimeout(() => setSuccess(null), 4000)
+      }
     } catch (err: any) {
       setError(err.detail || 'Error al subir la imagen. Intenta de nuevo.')
     } finally {
@@ -167,6 +175,9 @@ export default function PerfilPage() {
           label="Foto principal de tu lugar"
           hint="JPG, PNG o WebP · Máx 5MB · Esta imagen aparece en el directorio y en tu perfil"
         />
+        {uploading && venue.image_status === 'pending' && (
+          <p className="text-xs text-slate-500 -mt-3">Procesando imagen...</p>
+        )}
 
         {/* Name */}
         <div>
@@ -8,7 +8,7 @@ import type {
   User, TokenPair,
   Event, EventListItem, EventFilters,
   Venue, VenueListItem, VenueFilters,
-  Plan, Subscription,
+  Plan, Subscription, ImageStatus,
   PaginatedResponse, ApiError,
 } from '@/types'
 
@@ -109,9 +109,9 @@ export const events = {
       `/events/?is_featured=true&ordering=-is_featured,start_datetime`
     ),
 
-  /** GET /events/{id}/ */
-  get: (id: string) =>
-    apiFetch<Event>(`/events/${id}/`),
+  /** GET /events/{id}/ — pass the token to see the owner's drafts */
+  get: (id: string, token?: string | null) =>
+    apiFetch<Event>(`/events/${id}/`, { token }),
 
   /** GET /events/?search=slug (slug lookup — adjust if backend adds slug endpoint) */
   getBySlug: (slug: string) =>
@@ -159,9 +159,9 @@ export const venues = {
       { token }
     ),
 
-  /** GET /venues/{id}/ */
-  get: (id: string) =>
-    apiFetch<Venue>(`/venues/${id}/`),
+  /** GET /venues/{id}/ — pass the token to see the owner's drafts */
+  get: (id: string, token?: string | null) =>
+    apiFetch<Venue>(`/venues/${id}/`, { token }),
 
   /** GET /venues/me/ — authenticated user's venues (array) */
   me: (token: string) =>
@@ -221,6 +221,7 @@ export const uploads = {
   /**
    * POST /venues/{id}/upload-image/
    * Uploads a single image file for a venue.
+   * Answers 202 with image_status 'pending' — see waitForImage.
    */
   venueImage: async (token: string, venueId: string, file: File) => {
     const formData = new FormData()
@@ -245,6 +246,7 @@ export const uploads = {
   /**
    * POST /events/{id}/upload-image/
    * Uploads a single image file for an event.
+   * Answers 202 with image_status 'pending' — see waitForImage.
    */
   eventImage: async (token: string, eventId: string, file: File) => {
     const formData = new FormData()
@@ -264,4 +266,22 @@ export const uploads = {
     }
     return res.json() as Promise<Event>
   },
+
+  /**
+   * The upload is resized in the background, so `image` keeps the old file
+   * until the job finishes. Re-fetches the venue or event until image_status
+   * leaves 'pending' (or the timeout passes) and returns the last copy.
+   */
+  waitForImage: async <T extends { image_status: ImageStatus }>(
+    fetchResource: () => Promise<T>,
+    { intervalMs = 3000, timeoutMs = 120000 } = {},
+  ): Promise<T> => {
+    const deadline = Date.now() + timeoutMs
+    let resource = await fetchResource()
+    while (resource.image_status === 'pending' && Date.now() < deadline) {
+      await new Promise((resolve) => setTimeout(resolve, intervalMs))
+      resource = await fetchResource()
+    }
+    return resource
+  },
 }
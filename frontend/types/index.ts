@@ -68,6 +68,15 @@ export interface Subscription {
   updated_at: string
 }
 
+// ── Images ────────────────────────────────────
+
+// 'pending' while an upload is processed in the background.
+export type ImageStatus = 'ready' | 'pending' | 'failed'
+
+// Resized renditions of `image`; empty until they have been generated.
+export type ImageVariantName = 'card' | 'detail' | 'og'
+export type ImageVariants = Partial<Record<ImageVariantName, { webp: string; jpeg: string }>>
+
 // ── Venues ────────────────────────────────────
 
 export type VenueStatus   = 'draft' | 'published' | 'archived'
@@ -94,6 +103,8 @@ export interface Venue {
   email: string
   website: string
   image: string | null
+  image_variants: ImageVariants
+  image_status: ImageStatus
   status: VenueStatus
   is_featured: boolean
   created_at: string
@@ -107,6 +118,8 @@ export interface VenueListItem {
   category: VenueCategory
   city: string
   image: string | null
+  image_variants: ImageVariants
+  image_status: ImageStatus
   is_featured: boolean
   owner_name: string
 }
@@ -131,6 +144,8 @@ export interface Event {
   description: string
   category: EventCategory
   image: string | null
+  image_variants: ImageVariants
+  image_status: ImageStatus
   start_datetime: string    // ISO datetime (Mexico City TZ)
   end_datetime: string
   capacity: number | null
@@ -153,6 +168,8 @@ export interface EventListItem {
   slug: string
   category: EventCategory
   image: string | null
+  image_variants: ImageVariants
+  image_status: ImageStatus
   start_datetime: string
   venue_name: string
   venue_slug: string